@@ -1,179 +1,18 @@
+import argparse
 import json
-import requests
-from urllib.parse import urlparse
-import re
 
-def fetch_tournament_rankings(website_url, tournament_id):
-    """Fetch tournament rankings."""
-    try:
-        parsed = urlparse(website_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}/rest/results_api/call"
-        
-        query = f"Tournament({{id:{tournament_id}}}){{lotCategories:[{{stages:[{{rankings:[{{... on Stage$StageRankingPlace_ConferencePlace:{{conference:{{matches:[{{}}]}}}},... on Stage$StageRankingPlace_MatchStatus:{{match:{{arena:{{}},away:{{team:{{club:{{nation:{{}}}}}}}},home:{{team:{{club:{{nation:{{}}}}}}}},roundName:{{}}}}}},team:{{club:{{nation:{{}}}}}}}}]}}]}}]}}"
-        
-        params = {
-            'call': query,
-            'lang': 'en',
-            'tournamentId': tournament_id
-        }
-        
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Error: {e}")
-        return None
-
-def fetch_tournament_finals(website_url, tournament_id):
-    """Fetch tournament finals with match scores."""
-    try:
-        parsed = urlparse(website_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}/rest/results_api/call"
-        
-        query = f"Tournament({{id:{tournament_id}}}){{finals:[{{... on Match:{{arena:{{}},away:{{team:{{club:{{nation:{{}}}}}}}},division:{{category:{{}},stage:{{}}}},home:{{team:{{club:{{nation:{{}}}}}}}},protests:[{{}}],result:{{}},roundName:{{}},stage:{{}},video:{{}}}}}}]}}"
-        
-        params = {
-            'call': query,
-            'lang': 'en',
-            'tournamentId': tournament_id
-        }
-        
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        return None
-
-def parse_match_scores(finals_data):
-    """Parse match scores from finals data."""
-    match_scores = {}
-    
-    if 'responses' not in finals_data:
-        return match_scores
-    
-    responses = finals_data['responses']
-    
-    # Collect MatchResult entities
-    match_results = {}
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'MatchResult':
-            match_id = str(entity.get('id'))
-            match_results[match_id] = {
-                'homeGoals': entity.get('homeGoals', 0),
-                'awayGoals': entity.get('awayGoals', 0),
-                'winner': entity.get('winner', ''),
-                'penalties': entity.get('penalties', False)
-            }
-    
-    # Collect Match entities
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'Match':
-            match_id = str(entity.get('id'))
-            match_info = {
-                'matchId': match_id,
-                'homeHref': entity.get('home', {}).get('href', ''),
-                'awayHref': entity.get('away', {}).get('href', ''),
-                'roundNameHref': entity.get('roundName', {}).get('href', '')
-            }
-            
-            if match_id in match_results:
-                match_info.update(match_results[match_id])
-            
-            match_scores[match_id] = match_info
-    
-    # Resolve team names
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'MatchActor':
-            team_name = entity.get('name', {}).get('en', '')
-            team_href = entity.get('team', {}).get('href', '')
-            team_id_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-            actual_team_id = team_id_match.group(1) if team_id_match else None
-            
-            for match_id, match_info in match_scores.items():
-                if key == match_info.get('homeHref'):
-                    match_info['homeTeam'] = team_name
-                    match_info['homeTeamId'] = actual_team_id
-                elif key == match_info.get('awayHref'):
-                    match_info['awayTeam'] = team_name
-                    match_info['awayTeamId'] = actual_team_id
-    
-    # Resolve round names
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'Match$RoundName':
-            round_name = entity.get('name', {}).get('en', '')
-            for match_id, match_info in match_scores.items():
-                if key == match_info.get('roundNameHref'):
-                    match_info['roundName'] = round_name
-    
-    return match_scores
-
-def link_scores_to_teams(match_scores):
-    """Build team matches mapping."""
-    team_matches_map = {}
-    
-    for match_id, match_info in match_scores.items():
-        if 'homeTeamId' not in match_info or 'awayTeamId' not in match_info:
-            continue
-        
-        home_id = match_info['homeTeamId']
-        away_id = match_info['awayTeamId']
-        
-        if home_id:
-            if home_id not in team_matches_map:
-                team_matches_map[home_id] = []
-            team_matches_map[home_id].append({
-                'opponent': match_info.get('awayTeam', ''),
-                'opponentId': away_id,
-                'homeGoals': match_info.get('homeGoals', 0),
-                'awayGoals': match_info.get('awayGoals', 0),
-                'isHome': True,
-                'result': 'won' if match_info.get('winner') == 'home' else 'lost',
-                'roundName': match_info.get('roundName', ''),
-                'penalties': match_info.get('penalties', False)
-            })
-        
-        if away_id:
-            if away_id not in team_matches_map:
-                team_matches_map[away_id] = []
-            team_matches_map[away_id].append({
-                'opponent': match_info.get('homeTeam', ''),
-                'opponentId': home_id,
-                'homeGoals': match_info.get('homeGoals', 0),
-                'awayGoals': match_info.get('awayGoals', 0),
-                'isHome': False,
-                'result': 'won' if match_info.get('winner') == 'away' else 'lost',
-                'roundName': match_info.get('roundName', ''),
-                'penalties': match_info.get('penalties', False)
-            })
-    
-    return team_matches_map
-
-def parse_tournament_data(rankings_data, team_matches_map, tournament_name, tournament_id):
-    """Parse tournament rankings and add match scores."""
+from cupmanager import hrefs
+from cupmanager.clubs import add_club_arguments, clubs_from_args
+from cupmanager.dataset import IncrementalDataset, source_hash
+from cupmanager.index import ResponseIndex
+from cupmanager.parsers import (
+    parse_match_scores, link_scores_to_teams, build_result_entry,
+    category_names, team_names, stage_rankings_by_category, stage_types_by_category
+)
+from cupmanager.queries import fetch_rankings, fetch_finals
+
+def parse_tournament_data(rankings_data, team_matches_map, tournament_name, tournament_id, clubs=None):
+    """Parse tournament rankings and add match scores. See `team_names` for `clubs`."""
     tournament_data = {
         "tournamentId": tournament_id,
         "tournamentName": tournament_name,
@@ -181,61 +20,11 @@ def parse_tournament_data(rankings_data, team_matches_map, tournament_name, tour
         "results": []
     }
     
-    responses = rankings_data.get('responses', {})
-    
-    # Find categories
-    categories = {}
-    for key, value in responses.items():
-        if 'Category({categoryId:' in key and 'entity' in value:
-            entity = value['entity']
-            if isinstance(entity, dict) and entity.get('__typename') == 'Category':
-                category_id = entity.get('id')
-                name_field = entity.get('name', 'Unknown')
-                category_name = name_field if isinstance(name_field, str) else name_field.get('en', 'Unknown')
-                categories[str(category_id)] = category_name
-    
-    # Find stages with rankings
-    stages_with_rankings = {}
-    for key, value in responses.items():
-        if 'Stage({categoryId:' in key and '$rankings' in key:
-            match = re.search(r'categoryId:(\d+)', key)
-            if match:
-                category_id = match.group(1)
-                rankings = value.get('entity', [])
-                if rankings:
-                    stages_with_rankings[category_id] = rankings
-    
-    # Get stage types
-    stage_types = {}
-    for key, value in responses.items():
-        if 'Stage({categoryId:' in key and '$rankings' not in key and 'entity' in value:
-            entity = value['entity']
-            if entity.get('__typename') == 'Stage':
-                match = re.search(r'categoryId:(\d+)', key)
-                if match:
-                    category_id = match.group(1)
-                    stage_name = entity.get('name', '')
-                    if 'Cup' in stage_name or 'Playoff' in stage_name:
-                        stage_types[category_id] = 'CUP_FINAL'
-                    elif 'Plate' in stage_name:
-                        stage_types[category_id] = 'PLATE_FINAL'
-                    else:
-                        stage_types[category_id] = 'CUP_FINAL'
-    
-    # Get team information
-    teams = {}
-    for key, value in responses.items():
-        if 'Team({id:' in key and 'entity' in value:
-            entity = value['entity']
-            if entity.get('__typename') == 'Team':
-                team_id = entity.get('id')
-                name_obj = entity.get('name', {})
-                team_name = name_obj.get('fullName', name_obj.get('en', 'Unknown'))
-                club_name = name_obj.get('clubName', 'Unknown Club')
-                teams[str(team_id)] = {
-                    'teamName': team_name,
-                    'clubName': club_name
-                }
+    index = ResponseIndex.of(rankings_data)
+    categories = category_names(index)
+    stages_with_rankings = stage_rankings_by_category(index)
+    stage_types = stage_types_by_category(index, cup_markers=('Cup', 'Playoff'))
+    teams = team_names(index, clubs)
     
     # Process rankings - handle MatchStatus type
     for category_id, rankings in stages_with_rankings.items():
@@ -247,97 +36,56 @@ def parse_tournament_data(rankings_data, team_matches_map, tournament_name, tour
                 continue
                 
             rank = ranking.get('rank')
+            team_id = None
             
             # Handle MatchStatus type (has match reference)
             if 'MatchStatus' in ranking['__typename']:
-                match_href = ranking.get('match', {}).get('href', '')
-                match_id_search = re.search(r'Match\(\{id:(\d+)\}\)', match_href)
+                match_entity = index.get(ranking.get('match', {}).get('href', ''))
+                if not match_entity:
+                    continue
                 
-                if match_id_search:
-                    match_id = match_id_search.group(1)
-                    # Find the match to get team info
-                    match_key = f"Match({{id:{match_id}}})"
-                    if match_key in responses:
-                        match_entity = responses[match_key]['entity']
-                        
-                        # Determine which team based on status
-                        status = ranking.get('status', '')
-                        if status == 'win':
-                            team_href = match_entity.get('home', {}).get('href', '')
-                        else:
-                            team_href = match_entity.get('away', {}).get('href', '')
-                        
-                        team_match = re.search(r'MatchActor\(\{actor:"(\w+)",id:(\d+)\}\)', team_href)
-                        if team_match:
-                            actor_type = team_match.group(1)
-                            actor_match_id = team_match.group(2)
-                            
-                            # Get team from MatchActor
-                            actor_key = f'MatchActor({{actor:"{actor_type}",id:{actor_match_id}}})'
-                            if actor_key in responses:
-                                actor_entity = responses[actor_key]['entity']
-                                team_id = str(actor_entity.get('id'))
-                                
-                                team_info = teams.get(team_id, {
-                                    'teamName': f'Team {team_id}',
-                                    'clubName': 'Unknown Club'
-                                })
-                                
-                                result_entry = {
-                                    "categoryId": category_id,
-                                    "categoryName": category_name,
-                                    "stageType": stage_type,
-                                    "rank": rank,
-                                    "team": {
-                                        "teamId": team_id,
-                                        "teamName": team_info['teamName'],
-                                        "clubId": team_info['clubName'].replace(' ', '_').lower(),
-                                        "clubName": team_info['clubName']
-                                    }
-                                }
-                                
-                                # Add match scores if available
-                                if team_id in team_matches_map:
-                                    result_entry['matches'] = team_matches_map[team_id]
-                                
-                                tournament_data['results'].append(result_entry)
+                # Determine which team based on status
+                side = 'home' if ranking.get('status', '') == 'win' else 'away'
+                team_href = match_entity.get(side, {}).get('href', '')
+
+                # Get team from the MatchActor({actor:"home"|"away",id:<match>}) on that side
+                actor = hrefs.parse_href(team_href)
+                if actor is not None and actor.kind == 'MatchActor' and actor.params.get('actor') == side:
+                    actor_entity = index.of_type('MatchActor').get(team_href)
+                    if actor_entity:
+                        team_id = str(actor_entity.get('id'))
             
             # Handle regular team reference
             elif 'team' in ranking:
                 team_href = ranking.get('team', {}).get('href', '')
-                team_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-                if team_match:
-                    team_id = team_match.group(1)
-                    team_info = teams.get(team_id, {
-                        'teamName': f'Team {team_id}',
-                        'clubName': 'Unknown Club'
-                    })
-                    
-                    result_entry = {
-                        "categoryId": category_id,
-                        "categoryName": category_name,
-                        "stageType": stage_type,
-                        "rank": rank,
-                        "team": {
-                            "teamId": team_id,
-                            "teamName": team_info['teamName'],
-                            "clubId": team_info['clubName'].replace(' ', '_').lower(),
-                            "clubName": team_info['clubName']
-                        }
-                    }
-                    
-                    # Add match scores if available
-                    if team_id in team_matches_map:
-                        result_entry['matches'] = team_matches_map[team_id]
-                    
-                    tournament_data['results'].append(result_entry)
+                team_id = hrefs.team_id(team_href)
+            
+            if team_id is None:
+                continue
+            
+            team_info = teams.get(team_id, {
+                'teamName': f'Team {team_id}',
+                'clubName': 'Unknown Club'
+            })
+            
+            tournament_data['results'].append(build_result_entry(
+                category_id, category_name, stage_type, rank,
+                team_id, team_info, team_matches_map
+            ))
     
     return tournament_data
 
+parser = argparse.ArgumentParser(description='Add the TSS Football Tournament to realData.json.')
+args = add_club_arguments(parser).parse_args()
+clubs = clubs_from_args(args)
+
 # Load existing tournaments
 with open('all-real-tournaments.json', 'r', encoding='utf-8') as f:
     existing_tournaments = json.load(f)
 
+dataset = IncrementalDataset()
+dataset.adopt(existing_tournaments)
+
 print("\n" + "="*80)
 print("ADDING TSS FOOTBALL TOURNAMENT")
 print("="*80 + "\n")
@@ -349,7 +97,7 @@ website_url = "https://tssfootballtournament.cupmanager.net"
 print(f"Fetching {tournament_name}...")
 
 # Fetch rankings
-rankings_data = fetch_tournament_rankings(website_url, tournament_id)
+rankings_data = fetch_rankings(website_url, tournament_id)
 
 if not rankings_data:
     print("✗ Failed to fetch rankings")
@@ -358,7 +106,13 @@ if not rankings_data:
 print("✓ Rankings fetched")
 
 # Fetch finals
-finals_data = fetch_tournament_finals(website_url, tournament_id)
+finals_data = fetch_finals(website_url, tournament_id)
+payload_hash = source_hash(rankings_data, finals_data or {})
+
+if dataset.unchanged(tournament_id, payload_hash):
+    print("✓ Unchanged since last build")
+    dataset.save()
+    exit(0)
 
 if finals_data:
     match_scores = parse_match_scores(finals_data)
@@ -369,10 +123,10 @@ else:
     print("⚠ No match scores")
 
 # Parse tournament data
-tournament_data = parse_tournament_data(rankings_data, team_matches_map, tournament_name, tournament_id)
+tournament_data = parse_tournament_data(rankings_data, team_matches_map, tournament_name, tournament_id, clubs)
 
 if tournament_data['results']:
-    existing_tournaments.append(tournament_data)
+    dataset.merge(tournament_data, payload_hash)
     results_with_matches = sum(1 for r in tournament_data['results'] if 'matches' in r)
     print(f"✓ {len(tournament_data['results'])} results ({results_with_matches} with match scores)")
 else:
@@ -380,14 +134,15 @@ else:
     exit(1)
 
 # Save all tournaments
-output_file = 'tournament-rankings-poc/web/src/data/realData.json'
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(existing_tournaments, f, indent=2, ensure_ascii=False)
+output_file = dataset.output_file
+dataset.save()
+if clubs:
+    clubs.save()
 
 print(f"\n✓ Saved to: {output_file}")
 
 print(f"\nAll Tournaments:")
-for t in existing_tournaments:
+for t in dataset.tournaments:
     results_with_matches = sum(1 for r in t['results'] if 'matches' in r)
     score_text = f"{results_with_matches} with scores" if results_with_matches > 0 else "no scores"
     print(f"  - {t['tournamentName']}: {len(t['results'])} results ({score_text})")
@@ -0,0 +1,76 @@
+import re
+import time
+
+from cupmanager import hrefs
+from cupmanager.bench import load_fixture
+from cupmanager.index import ResponseIndex
+
+# Replay the href / key parsing one parse of the Shepparton payload does
+# (a Team id per MatchActor and ranking row, a categoryId per Stage and
+# $rankings key) with the `re.search` literals the parsers used before
+# cupmanager.hrefs, then with cupmanager.hrefs on an empty memo ("cold",
+# the first parse of a tournament) and a filled one ("warm", hrefs seen
+# before, e.g. teams ranked in several stages).
+
+FIXTURE = 'debug-shepparton-cup.json'
+SCALES = [1, 10, 100]
+REPEAT = 7
+
+
+def time_call(func, number):
+    """Best-of-REPEAT wall time per call of func(), in seconds."""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def parsed_strings(index):
+    """(team hrefs, stage keys) in the order the parsers read them."""
+    team_hrefs = [entity.get('team', {}).get('href', '') for entity in index.of_type('MatchActor').values()]
+    for rankings in index.stage_rankings.values():
+        team_hrefs.extend(ranking.get('team', {}).get('href', '') for ranking in rankings if isinstance(ranking, dict))
+    keys = list(index.stage_rankings) + [key for key in index.of_type('Stage') if key.startswith('Stage({categoryId:')]
+    return team_hrefs, keys
+
+
+print("\n" + "="*80)
+print(f"HREF PARSING ({FIXTURE})")
+print("="*80 + "\n")
+
+print(f"{'scale':>6} {'hrefs':>8} {'keys':>7} {'re.search ms':>13} {'cold ms':>9} {'warm ms':>9} {'cold':>6} {'warm':>6}")
+
+for factor in SCALES:
+    team_hrefs, keys = parsed_strings(ResponseIndex(load_fixture(FIXTURE, scale=factor)))
+
+    def with_regex():
+        for href in team_hrefs:
+            match = re.search(r'Team\(\{id:(\d+)\}\)', href)
+            match.group(1) if match else None
+        for key in keys:
+            match = re.search(r'categoryId:(\d+)', key)
+            match.group(1) if match else None
+
+    def with_hrefs():
+        for href in team_hrefs:
+            hrefs.team_id(href)
+        for key in keys:
+            hrefs.category_id(key)
+
+    def with_hrefs_cold():
+        hrefs.parse_href.cache_clear()
+        with_hrefs()
+
+    number = max(1, 200 // factor)
+    regex_time = time_call(with_regex, number)
+    cold_time = time_call(with_hrefs_cold, number)
+    warm_time = time_call(with_hrefs, number)
+
+    print(f"{factor:>6} {len(team_hrefs):>8} {len(keys):>7} {regex_time * 1000:>13.2f} {cold_time * 1000:>9.2f} "
+          f"{warm_time * 1000:>9.2f} {regex_time / cold_time:>5.1f}x {regex_time / warm_time:>5.1f}x")
+
+print("\n" + "="*80)
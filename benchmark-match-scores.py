@@ -0,0 +1,59 @@
+import timeit
+
+from cupmanager.bench import load_fixture
+from cupmanager.index import ResponseIndex
+from cupmanager.parsers import parse_match_scores, link_scores_to_teams
+
+# Scale the captured finals payload by cloning it with shifted entity ids, then
+# time parse_match_scores at each size, on an index built beforehand (the
+# index build is timed on its own). Timing is timeit-style: best of REPEAT
+# runs with the garbage collector disabled.
+#
+# The number of lookups per match is constant, but the wall time per match
+# still grows with the payload: at 32x the entities no longer fit in the CPU
+# caches. The "scale x 1x" column parses `scale` separately cloned 1x
+# payloads (the same amount of data, in small indexes), so "ratio" near 1
+# means the growth is memory, not the algorithm; a quadratic path would
+# make it grow with the scale.
+
+FIXTURE = 'tournament-with-scores.json'
+SCALES = [1, 2, 4, 8, 16, 32]
+REPEAT = 7
+
+
+def time_call(func, *args, number=1):
+    """Best-of-REPEAT wall time per call of func(*args), in seconds, GC disabled."""
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=REPEAT)) / number
+
+
+def parse_each(indexes):
+    for index in indexes:
+        parse_match_scores(index)
+
+
+print("\n" + "="*80)
+print(f"parse_match_scores SCALING ({FIXTURE})")
+print("="*80 + "\n")
+
+print(f"{'scale':>6} {'entries':>9} {'matches':>8} {'index ms':>9} {'parse ms':>9} {'link ms':>8} "
+      f"{'us/match':>9} {'scale x 1x':>11} {'ratio':>6}")
+
+copies = [ResponseIndex(load_fixture(FIXTURE, 'finalsData')) for _ in range(max(SCALES))]
+
+for factor in SCALES:
+    payload = load_fixture(FIXTURE, 'finalsData', factor)
+    index = ResponseIndex(payload)
+    number = max(1, 32 // factor)
+
+    match_scores = parse_match_scores(index)
+    index_time = time_call(ResponseIndex, payload, number=number)
+    parse_time = time_call(parse_match_scores, index, number=number)
+    link_time = time_call(link_scores_to_teams, match_scores, number=number)
+    copies_time = time_call(parse_each, copies[:factor], number=number)
+
+    per_match = parse_time / max(len(match_scores), 1) * 1e6
+    print(f"{factor:>6} {len(payload['responses']):>9} {len(match_scores):>8} {index_time * 1000:>9.2f} "
+          f"{parse_time * 1000:>9.2f} {link_time * 1000:>8.2f} {per_match:>9.2f} "
+          f"{copies_time * 1000:>9.2f}ms {parse_time / copies_time:>5.2f}x")
+
+print("\n" + "="*80)
@@ -0,0 +1,132 @@
+import argparse
+import sys
+
+from cupmanager.bench import (
+    DEFAULT_THRESHOLD, NOISE_FLOOR, PARSER_FIXTURES, PARSER_FUNCTIONS, PARSER_SCALES,
+    allocations_comparable, case_name, compare, load_baseline, machine, measure_allocations, measure_rss,
+    save_baseline, setup_parser_case, summarize, time_rounds, timings_comparable
+)
+
+# Time the parser hot paths on the captured fixtures and id-shifted 10x /
+# 100x copies of them. For each case: median / min wall time over repeated
+# rounds, tracemalloc peak and allocated blocks for one call, and the peak
+# RSS of a fresh interpreter running that one case. The median round and
+# the allocation peak are compared against the saved baseline; anything
+# more than --threshold worse (and, for time, more than --noise-floor ms)
+# is a regression and makes the script exit non-zero, if it is still
+# slow when re-timed (--confirm).
+#
+# Tolerance: --threshold defaults to 20% and --noise-floor to 0.5 ms. On
+# the reference machine, unchanged code moves sub-millisecond cases by
+# more than 20% between runs, hence the floor.
+#
+# Machine policy: the baseline holds absolute timings from the machine
+# that saved it, recorded under "machine" (OS, architecture, CPU model
+# and count, Python version). On any other machine the timings are
+# shown for information and never fail the run. Allocation peaks still
+# gate wherever the Python minor version matches. Re-save the baseline
+# (--save-baseline) only on the machine recorded in it, and only in the
+# commit that changes the measured code (cupmanager/parsers.py, hrefs.py,
+# index.py or the measurement in bench.py). Never re-save it in other
+# commits: a re-run of unchanged code only records noise.
+
+BASELINE_FILE = 'benchmark-parsers-baseline.json'
+
+parser = argparse.ArgumentParser(description='Benchmark the results_api parsers.')
+parser.add_argument('-k', '--filter', default='', help='only cases whose name contains this text')
+parser.add_argument('--scales', default=','.join(str(scale) for scale in PARSER_SCALES),
+                    help='comma-separated fixture scale factors')
+parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline file to compare against / save to')
+parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                    help='relative slowdown (or allocation growth) that counts as a regression')
+parser.add_argument('--noise-floor', type=float, default=NOISE_FLOOR * 1000, metavar='MS',
+                    help='smallest absolute slowdown of the median that counts as a regression')
+parser.add_argument('--confirm', type=int, default=2, metavar='N',
+                    help='re-time a case that looks like a regression up to N times before reporting it')
+parser.add_argument('--no-rss', action='store_true', help='skip the per-case peak RSS subprocess')
+args = parser.parse_args()
+
+scales = [int(scale) for scale in args.scales.split(',')]
+cases = [
+    (function, file_name, section, scale)
+    for function in PARSER_FUNCTIONS
+    for file_name, section in PARSER_FIXTURES
+    for scale in scales
+    if args.filter in case_name(function, file_name, section, scale)
+]
+
+baseline = None if args.save_baseline else load_baseline(args.baseline)
+baseline_cases = (baseline or {}).get('cases', {})
+gate_timings = bool(baseline) and timings_comparable(baseline)
+gate_allocations = bool(baseline) and allocations_comparable(baseline)
+
+print("\n" + "="*80)
+print("PARSER BENCHMARKS")
+print("="*80 + "\n")
+if baseline:
+    print(f"Baseline: {args.baseline} (saved {baseline.get('savedAt')}, Python {baseline.get('python')})")
+    if not gate_timings:
+        saved_on = baseline.get('machine') or {}
+        print(f"⚠ Saved on another machine ({saved_on.get('cpu', 'unknown')}, {saved_on.get('cpus', '?')} CPUs, "
+              f"Python {baseline.get('python')}); this is {machine()['cpu']}, {machine()['cpus']} CPUs: "
+              f"timings are not gated")
+    if not gate_allocations:
+        print(f"⚠ Saved with another Python version: allocations are not gated")
+    print()
+else:
+    print(f"No baseline compared ({args.baseline})\n")
+
+print(f"{'case':<72} {'median ms':>10} {'min ms':>9} {'rounds':>6} {'peak KB':>9} {'blocks':>8} {'rss MB':>7} {'vs base':>9}")
+
+results = {}
+regressions = []
+for case in cases:
+    name = case_name(*case)
+    func, call_args = setup_parser_case(*case)
+
+    stats = summarize(time_rounds(func, call_args))
+    stats['peakBytes'], stats['blocks'] = measure_allocations(func, call_args)
+    if not args.no_rss:
+        stats['peakRssKb'] = measure_rss(case)
+    results[name] = stats
+
+    change, regressed = compare(stats, baseline_cases.get(name), args.threshold, args.noise_floor / 1000,
+                                 gate_timings, gate_allocations)
+    # Load from other processes comes and goes, a real slowdown stays: re-time
+    # a slow case and keep its best run before calling it a regression
+    for _ in range(args.confirm):
+        if not regressed:
+            break
+        retry = summarize(time_rounds(func, call_args))
+        if retry['median'] < stats['median']:
+            stats.update(retry)
+        change, regressed = compare(stats, baseline_cases.get(name), args.threshold, args.noise_floor / 1000,
+                                     gate_timings, gate_allocations)
+    if change is None:
+        versus = '-'
+    else:
+        versus = f"{change:+.0%}" + (' ✗' if regressed else '')
+    if regressed:
+        regressions.append(name)
+
+    rss = f"{stats['peakRssKb'] / 1024:.0f}" if stats.get('peakRssKb') else '-'
+    print(f"{name:<72} {stats['median'] * 1000:>10.2f} {stats['min'] * 1000:>9.2f} {stats['rounds']:>6} "
+          f"{stats['peakBytes'] / 1024:>9,.0f} {stats['blocks']:>8,} {rss:>7} {versus:>9}")
+
+print("\n" + "="*80)
+if args.save_baseline:
+    if args.filter or scales != list(PARSER_SCALES):
+        # keep the cases this run didn't cover
+        saved = (load_baseline(args.baseline) or {}).get('cases', {})
+        saved.update(results)
+        results = saved
+    save_baseline(args.baseline, results)
+    print(f"✓ Saved baseline for {len(results)} cases to {args.baseline}")
+elif regressions:
+    print(f"✗ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+    for name in regressions:
+        print(f"   - {name}")
+    sys.exit(1)
+elif baseline:
+    print(f"✓ No regressions over {args.threshold:.0%} ({len(results)} cases)")
@@ -1,5 +1,6 @@
 import json
-import requests
+
+from cupmanager import client
 
 # TSS Football Tournament
 tournament_id = "54663955"
@@ -14,7 +15,7 @@ params = {
 }
 
 print("Fetching TSS Football Tournament data...")
-response = requests.get(url, params=params, timeout=30)
+response = client.get(url, params=params, timeout=30)
 data = response.json()
 
 # Save full response
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+
+from cupmanager.clubs import ClubRegistry
+from cupmanager.index import ResponseIndex
+from cupmanager.parsers import finals_match_hrefs, parse_match_scores, link_scores_to_teams, parse_tournament_data
+from cupmanager.queries import (
+    FULL_RANKINGS_PATHS, FULL_FINALS_PATHS, MINIMAL_RANKINGS_PATHS, MINIMAL_FINALS_PATHS,
+    project, selection_tree
+)
+
+# Simulate what results_api would return for the trimmed selections by
+# walking each captured payload from its Tournament entity along the
+# selection tree, keeping only the response entries that are reached
+# (`queries.project`, which the stand-in serves as well). Prints the wire
+# size (compact JSON) for the full and minimal projections and checks the
+# parsers give identical output on the trimmed payload, with and without
+# a club registry.
+
+FIXTURES = [
+    ('tournament-with-scores.json', 'rankingsData'),
+    ('tournament-with-scores.json', 'finalsData'),
+    ('finals-endpoint-response.json', None),
+    ('debug-shepparton-cup.json', None),
+    ('debug-tss-tournament.json', None),
+    ('sample-results-reponse.json', None),
+    ('test-result-Match.json', None),
+]
+
+
+def wire_size(payload):
+    return len(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def parse_all(payload):
+    """Parser output as the crawlers use it: match scores only come from finals."""
+    index = ResponseIndex(payload)
+    match_scores = parse_match_scores(index) if finals_match_hrefs(index) is not None else {}
+    team_matches_map = link_scores_to_teams(match_scores)
+    with tempfile.TemporaryDirectory() as directory:
+        clubs = ClubRegistry(os.path.join(directory, 'club-registry.json'))
+        with_clubs = parse_tournament_data(index, team_matches_map, 'X', '1', clubs)
+    return match_scores, parse_tournament_data(index, team_matches_map, 'X', '1'), with_clubs
+
+
+full_paths = FULL_RANKINGS_PATHS + FULL_FINALS_PATHS
+minimal_paths = MINIMAL_RANKINGS_PATHS + MINIMAL_FINALS_PATHS
+
+print("\n" + "="*80)
+print("results_api PROJECTION SIZES (compact JSON bytes)")
+print("="*80 + "\n")
+
+print(f"{'fixture':<42} {'captured':>10} {'full':>10} {'minimal':>10} {'saved':>7}  parsers")
+
+for file_name, section in FIXTURES:
+    with open(file_name, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    if section:
+        payload = payload[section]
+
+    full = project(payload, selection_tree(full_paths))
+    minimal = project(payload, selection_tree(minimal_paths))
+    same = parse_all(minimal) == parse_all(full)
+
+    label = f"{file_name}{':' + section if section else ''}"
+    saved = 1 - wire_size(minimal) / wire_size(full)
+    print(f"{label:<42} {wire_size(payload):>10,} {wire_size(full):>10,} {wire_size(minimal):>10,} {saved:>6.0%}  {'✓ same' if same else '✗ DIFFERENT'}")
+
+print("\n" + "="*80)
@@ -0,0 +1 @@
+"""Shared helpers for the cupmanager results_api fetch and parse scripts."""
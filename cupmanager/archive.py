@@ -0,0 +1,298 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from cupmanager import jsonio
+from cupmanager.cache import query_kind
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+DEFAULT_ARCHIVE_DIR = '.cache/archive'
+INDEX_FILE = 'index.jsonl'
+
+# zstd level 10 compresses a 700 KB payload to a few percent of its size
+# in well under a second; gzip is the stdlib fallback.
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 9
+
+_TOURNAMENT_KEY = re.compile(r'^Tournament\(\{id:(\d+)\}\)')
+
+# Per-fetch server timings: they differ on every download of the same data,
+# so they are not archived (see `canonical_encoding`)
+VOLATILE_KEYS = ('totalTime',)
+VOLATILE_ENTRY_KEYS = ('auditResolveTime',)
+
+
+def content_hash(encoded):
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def canonical_encoding(payload):
+    """
+    The bytes a payload is archived (and addressed) as: without the
+    VOLATILE_KEYS timings, encoded with the stdlib json, sorted keys and no
+    whitespace, so two fetches of unchanged data give the same object
+    whichever JSON backend is installed (like `dataset.source_hash`).
+    """
+    payload = {key: value for key, value in payload.items() if key not in VOLATILE_KEYS}
+    responses = payload.get('responses')
+    if isinstance(responses, dict):
+        payload['responses'] = {
+            key: {field: item for field, item in value.items() if field not in VOLATILE_ENTRY_KEYS}
+            if isinstance(value, dict) else value
+            for key, value in responses.items()
+        }
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def payload_tournament_id(payload):
+    """tournamentId a results_api payload is about, from its Tournament entries ('' if none)."""
+    for key in payload.get('responses', {}):
+        match = _TOURNAMENT_KEY.match(key)
+        if match:
+            return match.group(1)
+    return ''
+
+
+def payload_kind(payload):
+    """`query_kind` for a payload whose call string is unknown (e.g. a captured file)."""
+    keys = payload.get('responses', {})
+    finals = any(key.endswith('$finals') for key in keys)
+    rankings = any(key.endswith('$lotCategories') for key in keys)
+    if finals and rankings:
+        return 'combined'
+    if finals:
+        return 'finals'
+    if rankings:
+        return 'rankings'
+    if any(key.startswith('Me(') for key in keys):
+        return 'Me'
+    return 'other'
+
+
+def _compress(encoded):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(encoded), '.zst'
+    return gzip.compress(encoded, compresslevel=GZIP_LEVEL, mtime=0), '.gz'
+
+
+def _decompress(data, suffix):
+    if suffix == '.zst':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst archive objects (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PayloadArchive:
+    """
+    Content-addressed, compressed store of raw results_api payloads.
+
+    Each payload is encoded canonically (see `canonical_encoding`; the
+    per-fetch timings are dropped), hashed, and written once to
+    `objects/<hh>/<sha256>.json.zst` (or `.json.gz` without zstandard).
+    Every `put` appends a line to `index.jsonl` recording the hash, host,
+    tournamentId, query kind and fetch time, so the same payload fetched
+    nine times costs one object and nine index lines.
+    Safe to share between threads.
+    """
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR):
+        self.directory = directory
+        self.index_file = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest, suffix):
+        return os.path.join(self.directory, 'objects', digest[:2], f"{digest}.json{suffix}")
+
+    def _find_object(self, digest):
+        for suffix in ('.zst', '.gz'):
+            path = self._object_path(digest, suffix)
+            if os.path.exists(path):
+                return path, suffix
+        return None, None
+
+    def put(self, payload, host='', tournament_id=None, call='', fetched_at=None, source=None):
+        """Archive `payload` and index it; returns the index record."""
+        encoded = canonical_encoding(payload)
+        digest = content_hash(encoded)
+        record = {
+            'hash': digest,
+            'host': host,
+            'tournamentId': str(tournament_id) if tournament_id is not None else payload_tournament_id(payload),
+            'kind': query_kind(call) if call else payload_kind(payload),
+            'call': call,
+            'fetchedAt': fetched_at if fetched_at is not None else time.time(),
+            'bytes': len(encoded),
+        }
+        if source:
+            record['source'] = source
+
+        with self._lock:
+            path, _ = self._find_object(digest)
+            if path is None:
+                compressed, suffix = _compress(encoded)
+                path = self._object_path(digest, suffix)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+            record['stored'] = os.path.getsize(path)
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(jsonio.dumps(record).decode('utf-8') + '\n')
+        return record
+
+    def get(self, digest):
+        """Payload stored under `digest` (a full hash or unique prefix), or None."""
+        digest = self.resolve_hash(digest)
+        path, suffix = self._find_object(digest) if digest else (None, None)
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            return jsonio.loads(_decompress(f.read(), suffix))
+
+    def resolve_hash(self, prefix):
+        if len(prefix) == 64:
+            return prefix
+        matches = {record['hash'] for record in self.records() if record['hash'].startswith(prefix)}
+        return matches.pop() if len(matches) == 1 else None
+
+    def records(self, tournament_id=None, kind=None, host=None):
+        """Index records, oldest first, optionally filtered."""
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = jsonio.loads(line)
+                except ValueError:
+                    # a torn last line from an interrupted run
+                    continue
+                if tournament_id is not None and record.get('tournamentId') != str(tournament_id):
+                    continue
+                if kind is not None and record.get('kind') != kind:
+                    continue
+                if host is not None and record.get('host') != host:
+                    continue
+                yield record
+
+    def latest(self, tournament_id, kind=None):
+        """Most recently fetched payload for a tournament (and query kind), or None."""
+        found = None
+        for record in self.records(tournament_id=tournament_id, kind=kind):
+            if found is None or record['fetchedAt'] >= found['fetchedAt']:
+                found = record
+        return self.get(found['hash']) if found else None
+
+    def stats(self):
+        """(index records, unique objects, raw bytes indexed, bytes on disk)."""
+        records = 0
+        raw_bytes = 0
+        objects = {}
+        for record in self.records():
+            records += 1
+            raw_bytes += record.get('bytes', 0)
+            objects[record['hash']] = record.get('stored', 0)
+        return records, len(objects), raw_bytes, sum(objects.values())
+
+
+def add_archive_arguments(parser):
+    """Add the --archive option shared by the fetch scripts."""
+    parser.add_argument('--archive', nargs='?', const=DEFAULT_ARCHIVE_DIR, default=None, metavar='DIR',
+                        help=f'archive every fetched results_api payload (default dir: {DEFAULT_ARCHIVE_DIR})')
+    return parser
+
+
+def archive_from_args(args):
+    return PayloadArchive(args.archive) if args.archive else None
+
+
+def _iter_captured(path):
+    """Yield (label, payload) for each results_api payload in a captured JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and isinstance(data.get('responses'), dict):
+        yield path, data
+        return
+    if isinstance(data, dict):
+        # e.g. tournament-with-scores.json: {"rankingsData": {...}, "finalsData": {...}}
+        for key, value in data.items():
+            if isinstance(value, dict) and isinstance(value.get('responses'), dict):
+                yield f"{path}:{key}", value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Archive and inspect raw results_api payloads.')
+    parser.add_argument('--archive-dir', default=DEFAULT_ARCHIVE_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_command = commands.add_parser('import', help='archive captured payload files')
+    import_command.add_argument('files', nargs='+')
+    import_command.add_argument('--host', default='', help='host the files were fetched from')
+
+    list_command = commands.add_parser('list', help='list index records')
+    list_command.add_argument('--tournament', help='only this tournamentId')
+    list_command.add_argument('--kind', help='only this query kind (Me / rankings / finals / combined)')
+    list_command.add_argument('--host', help='only this host')
+
+    show = commands.add_parser('show', help='write an archived payload to stdout or a file')
+    show.add_argument('hash', help='full hash or unique prefix')
+    show.add_argument('-o', '--output', help='write to this file instead of stdout')
+
+    commands.add_parser('stats', help='deduplication and compression summary')
+
+    args = parser.parse_args(argv)
+    archive = PayloadArchive(args.archive_dir)
+    os.makedirs(args.archive_dir, exist_ok=True)
+
+    if args.command == 'import':
+        for path in args.files:
+            try:
+                captured = list(_iter_captured(path))
+            except (OSError, ValueError) as e:
+                print(f"✗ {path}: {e}")
+                continue
+            if not captured:
+                print(f"⚠ {path}: no results_api payload")
+            for label, payload in captured:
+                record = archive.put(payload, host=args.host, fetched_at=os.path.getmtime(path), source=label)
+                print(f"✓ {label:<45} {record['hash'][:12]} {record['kind']:<9} {record['bytes']:>10,} -> {record['stored']:>8,}")
+
+    elif args.command == 'list':
+        print(f"{'hash':<12} {'host':<42} {'tournament':>10} {'kind':<9} {'bytes':>10} {'fetched':>17}")
+        for record in archive.records(tournament_id=args.tournament, kind=args.kind, host=args.host):
+            fetched = time.strftime('%Y-%m-%d %H:%M', time.localtime(record['fetchedAt']))
+            host = record.get('host') or record.get('source', '')
+            print(f"{record['hash'][:12]} {host:<42} {record['tournamentId'] or '-':>10} {record['kind']:<9} {record['bytes']:>10,} {fetched:>17}")
+
+    elif args.command == 'show':
+        payload = archive.get(args.hash)
+        if payload is None:
+            parser.error(f"no single archived payload matches {args.hash!r}")
+        if args.output:
+            jsonio.dump(payload, args.output, pretty=True)
+            print(f"✓ Wrote {args.output}")
+        else:
+            print(jsonio.dumps(payload, pretty=True).decode('utf-8'))
+
+    else:
+        records, objects, raw_bytes, stored_bytes = archive.stats()
+        print(f"Index records:  {records}")
+        print(f"Unique objects: {objects}")
+        print(f"Payload bytes:  {raw_bytes:,}")
+        print(f"Stored bytes:   {stored_bytes:,} ({'zstd' if zstandard is not None else 'gzip'})")
+        if raw_bytes:
+            print(f"Saved:          {1 - stored_bytes / raw_bytes:.1%}")
+
+
+if __name__ == '__main__':
+    main()
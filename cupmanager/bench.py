@@ -0,0 +1,273 @@
+import gc
+import importlib.util
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+from cupmanager import hrefs
+from cupmanager.parsers import link_scores_to_teams, parse_match_scores, parse_tournament_data
+
+# Each round is repeated until MIN_TIME seconds have been spent (at least
+# MIN_ROUNDS, at most MAX_ROUNDS rounds), like pytest-benchmark's defaults.
+MIN_ROUNDS = 3
+MAX_ROUNDS = 1000
+MIN_TIME = 0.5
+
+# A case is reported as a regression when its median round is this much
+# slower than the baseline's median and at least NOISE_FLOOR seconds
+# slower: a sub-millisecond case moves by more than 20% between two runs
+# of unchanged code, on the minimum even more than on the median.
+# Timings are only compared against a baseline saved on the same machine
+# (see `machine`), allocation peaks against one saved with the same
+# Python minor version.
+DEFAULT_THRESHOLD = 0.20
+NOISE_FLOOR = 0.0005
+
+ID_PATTERN = re.compile(r'\b(\d{7,9})\b')
+
+
+def scale_responses(responses, factor):
+    """Return a responses map containing `factor` id-shifted copies of `responses`."""
+    text = json.dumps(responses)
+    scaled = {}
+    for copy in range(factor):
+        offset = copy * 1_000_000_000
+        shifted = ID_PATTERN.sub(lambda m: str(int(m.group(1)) + offset), text) if copy else text
+        scaled.update(json.loads(shifted))
+    return scaled
+
+
+def load_fixture(file_name, section=None, scale=1):
+    """A captured payload (optionally one section of it) scaled `scale` times."""
+    with open(file_name, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    if section:
+        payload = payload[section]
+    if scale > 1:
+        payload = dict(payload, responses=scale_responses(payload['responses'], scale))
+    return payload
+
+
+def load_script_function(path, name):
+    """Import `name` from a hyphenated top-level script (its `__main__` block is not run)."""
+    spec = importlib.util.spec_from_file_location(path.replace('-', '_').rsplit('.', 1)[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, name)
+
+
+def time_rounds(func, args, min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS, min_time=MIN_TIME):
+    """Wall time in seconds of each call of `func(*args)`."""
+    times = []
+    spent = 0.0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(times) < min_rounds or (spent < min_time and len(times) < max_rounds):
+            start = time.perf_counter()
+            func(*args)
+            elapsed = time.perf_counter() - start
+            times.append(elapsed)
+            spent += elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return times
+
+
+def measure_allocations(func, args):
+    """
+    (peak bytes, allocated blocks) traced by tracemalloc during one call.
+
+    Blocks counts every allocation made by the call that is still alive
+    when it returns, i.e. the size of what it built.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    del result
+    return peak, blocks
+
+
+def peak_rss_kb():
+    """High-water resident set size of this process in KB (None where unsupported)."""
+    # ru_maxrss survives fork + exec on Linux, so a child started from a
+    # large parent would report the parent's peak; VmHWM is per process image
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure_rss(case, timeout=600):
+    """
+    Peak RSS in KB of a fresh interpreter that sets up and runs one parser
+    case, so earlier cases don't raise the high-water mark. None where
+    unsupported or if the child fails.
+    """
+    if resource is None:
+        return None
+    command = [sys.executable, '-m', 'cupmanager.bench', json.dumps(list(case))]
+    try:
+        output = subprocess.run(command, capture_output=True, text=True, timeout=timeout, check=True).stdout
+        return int(output.split()[-1])
+    except (subprocess.SubprocessError, ValueError, IndexError):
+        return None
+
+
+def summarize(times):
+    return {
+        'rounds': len(times),
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'stddev': statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cpu_model():
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def machine():
+    """What absolute timings depend on: OS, architecture, CPU model and count, Python version."""
+    return {
+        'system': platform.system(),
+        'arch': platform.machine(),
+        'cpu': _cpu_model(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+
+def timings_comparable(baseline):
+    """True if `baseline` was saved on this machine, so its timings can gate a run."""
+    return baseline.get('machine') == machine()
+
+
+def allocations_comparable(baseline):
+    """True if `baseline` was saved with this Python minor version (tracemalloc sizes change between them)."""
+    saved = str(baseline.get('python', '')).split('.')[:2]
+    return saved == platform.python_version().split('.')[:2]
+
+
+def save_baseline(path, results, python=None):
+    """Write `results` ({case name: stats}) as the new baseline, tagged with this `machine()`."""
+    baseline = {
+        'python': python or sys.version.split()[0],
+        'machine': machine(),
+        'savedAt': time.strftime('%Y-%m-%d %H:%M'),
+        'cases': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(stats, baseline_stats, threshold=DEFAULT_THRESHOLD, noise_floor=NOISE_FLOOR,
+            timings=True, allocations=True):
+    """
+    (relative change of the median round, regressed?) against a baseline
+    case, or (None, False) without one. With `timings`, the case regresses
+    when the median is more than `threshold` and `noise_floor` seconds
+    slower. With `allocations`, it also regresses when its tracemalloc
+    peak grew by more than `threshold`; allocations don't depend on load,
+    so that check is exact where the timing one is not.
+    """
+    if not baseline_stats or not baseline_stats.get('median'):
+        return None, False
+    change = stats['median'] / baseline_stats['median'] - 1
+    slower = timings and change > threshold and stats['median'] - baseline_stats['median'] > noise_floor
+    memory_change = stats.get('peakBytes', 0) / baseline_stats['peakBytes'] - 1 if baseline_stats.get('peakBytes') else 0
+    return change, slower or (allocations and memory_change > threshold)
+
+
+# Parser suite: (file, section) fixtures each run at every scale.
+PARSER_FIXTURES = (
+    ('debug-shepparton-cup.json', None),
+    ('debug-tss-tournament.json', None),
+    ('tournament-with-scores.json', 'rankingsData'),
+    ('tournament-with-scores.json', 'finalsData'),
+)
+PARSER_FUNCTIONS = (
+    'parse_match_scores',
+    'link_scores_to_teams',
+    'parse_tournament_data',
+    'parse_tournament_results',
+)
+PARSER_SCALES = (1, 10, 100)
+
+
+def setup_parser_case(function, file_name, section=None, scale=1):
+    """
+    (func, args) for timing `function` on one fixture at one scale.
+
+    The href memo is emptied first, so a case does not run faster or
+    slower depending on which cases ran before it.
+    """
+    hrefs.parse_href.cache_clear()
+    gc.collect()
+    payload = load_fixture(file_name, section, scale)
+    if function == 'parse_match_scores':
+        return parse_match_scores, (payload,)
+    if function == 'link_scores_to_teams':
+        return link_scores_to_teams, (parse_match_scores(payload),)
+    if function == 'parse_tournament_data':
+        return parse_tournament_data, (payload, link_scores_to_teams(parse_match_scores(payload)), 'X', '1')
+    if function == 'parse_tournament_results':
+        return load_script_function('parse-api-results.py', 'parse_tournament_results'), (payload, '1', 'X')
+    raise ValueError(f"Unknown parser benchmark {function!r}")
+
+
+def case_name(function, file_name, section=None, scale=1):
+    """e.g. `parse_match_scores[tournament-with-scores.json:finalsData x10]`."""
+    fixture = f"{file_name}:{section}" if section else file_name
+    return f"{function}[{fixture} x{scale}]"
+
+
+if __name__ == '__main__':
+    # Child process of `measure_rss`: run one case and print the peak RSS
+    func, call_args = setup_parser_case(*json.loads(sys.argv[1]))
+    func(*call_args)
+    print(peak_rss_kb())
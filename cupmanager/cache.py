@@ -0,0 +1,314 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+from cupmanager import jsonio
+from cupmanager.index import ResponseIndex
+
+DEFAULT_CACHE_DIR = '.cache/results_api'
+
+# Seconds. Payloads of a finished tournament never expire; anything still
+# being played is refetched after IN_PROGRESS_TTL. Payloads without matches
+# (Me lookups, empty tournaments) use DEFAULT_TTL.
+IN_PROGRESS_TTL = 15 * 60
+DEFAULT_TTL = 24 * 60 * 60
+
+# Results carry no tournament or stage state, so a tournament counts as
+# finished once all its matches are and the last one ended this long ago:
+# between two rounds every match that exists so far is finished, while the
+# next round's matches are not in the payload yet.
+SETTLED_AFTER = 2 * 24 * 60 * 60
+
+
+def cache_key(url, params):
+    """Identify a results_api call by host + call + lang + tournamentId."""
+    params = params or {}
+    return {
+        'host': urlparse(url).netloc,
+        'call': params.get('call', ''),
+        'lang': params.get('lang', ''),
+        'tournamentId': str(params.get('tournamentId', '')),
+    }
+
+
+def query_kind(call):
+    """Short label for a results_api `call` string: Me / rankings / finals / other."""
+    if call.startswith('Me('):
+        return 'Me'
+    if 'finals:' in call and 'lotCategories:' in call:
+        return 'combined'
+    if 'finals:' in call:
+        return 'finals'
+    if 'lotCategories:' in call:
+        return 'rankings'
+    return call.split('(', 1)[0] or 'other'
+
+
+def is_results_api(url):
+    return urlparse(url).path.rstrip('/').endswith('/rest/results_api/call')
+
+
+def is_cacheable(payload):
+    """Only cache well-formed responses without per-entry API errors."""
+    if not isinstance(payload, dict) or not isinstance(payload.get('responses'), dict):
+        return False
+    return not any(isinstance(value, dict) and 'error' in value for value in payload['responses'].values())
+
+
+def payload_is_finished(payload, now=None):
+    """
+    True if the payload contains matches, every one of them is finished and
+    the last one ended (or started, without an `end`) SETTLED_AFTER ago.
+    """
+    matches = ResponseIndex.of(payload).of_type('Match')
+    if not matches or not all(match.get('finished') for match in matches.values()):
+        return False
+    ends = [match.get('end') or match.get('start') for match in matches.values()]
+    if not all(isinstance(end, (int, float)) for end in ends):
+        return False
+    now = time.time() if now is None else now
+    return max(ends) / 1000 <= now - SETTLED_AFTER
+
+
+def collect_cachetags(payload):
+    """
+    Summarise the `cachetags` carried by every entry of a results_api payload.
+
+    Returns (cup_ids, tags) where `tags` maps each taint (e.g. "match",
+    "cachedmatch_result_id", "general") to the sorted entity ids it covers.
+    """
+    cup_ids = set()
+    tags = {}
+    responses = payload.get('responses', {}) if isinstance(payload, dict) else {}
+    for value in responses.values():
+        if not isinstance(value, dict):
+            continue
+        for tag in value.get('cachetags') or []:
+            if tag.get('cupId') is not None:
+                cup_ids.add(tag['cupId'])
+            ids = tag.get('ids') or []
+            for taint in tag.get('taint') or []:
+                tags.setdefault(taint, set()).update(ids)
+    return sorted(cup_ids), {taint: sorted(ids) for taint, ids in sorted(tags.items())}
+
+
+def tags_match(meta, ids=(), taints=None, cup_id=None):
+    """True if an entry's recorded cachetags are hit by the given invalidation."""
+    if not ids and taints is None and cup_id is None:
+        return False
+    if cup_id is not None and int(cup_id) not in meta.get('cupIds', []):
+        return False
+    tags = meta.get('tags', {})
+    selected = tags if taints is None else {taint: tags[taint] for taint in taints if taint in tags}
+    if not ids:
+        return taints is None or bool(selected)
+    wanted = {int(entity_id) for entity_id in ids}
+    return any(wanted.intersection(tag_ids) for tag_ids in selected.values())
+
+
+class ResponseCache:
+    """
+    Persistent cache of results_api payloads under `directory`.
+
+    Each entry is stored as `<host>/<digest>.json` (the payload) next to
+    `<host>/<digest>.meta.json` (key, fetch time, expiry and the payload's
+    cachetags), so listing, evicting and invalidating never has to load
+    the multi-MB payloads.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, in_progress_ttl=IN_PROGRESS_TTL, default_ttl=DEFAULT_TTL):
+        self.directory = directory
+        self.in_progress_ttl = in_progress_ttl
+        self.default_ttl = default_ttl
+
+    def _paths(self, key):
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+        base = os.path.join(self.directory, key['host'] or '_', digest)
+        return base + '.json', base + '.meta.json'
+
+    def ttl_for(self, payload):
+        index = ResponseIndex.of(payload)
+        if not index.of_type('Match'):
+            return self.default_ttl
+        return None if payload_is_finished(index) else self.in_progress_ttl
+
+    def get(self, key, expired=False):
+        """
+        Cached payload for `key`, or None if missing or expired. With
+        `expired=True` an expired entry still on disk is returned too (e.g.
+        to replay exactly the payload a crawl journal recorded).
+        """
+        payload_path, meta_path = self._paths(key)
+        meta = _read_json(meta_path)
+        if meta is None or (_is_expired(meta) and not expired):
+            return None
+        return _read_json(payload_path)
+
+    def put(self, key, payload):
+        payload_path, meta_path = self._paths(key)
+        ttl = self.ttl_for(ResponseIndex.of(payload))
+        cup_ids, tags = collect_cachetags(payload)
+        now = time.time()
+
+        os.makedirs(os.path.dirname(payload_path), exist_ok=True)
+        size = _write_json(payload_path, payload)
+        _write_json(meta_path, {
+            'key': key,
+            'fetchedAt': now,
+            'expiresAt': None if ttl is None else now + ttl,
+            'finished': ttl is None,
+            'bytes': size,
+            'cupIds': cup_ids,
+            'tags': tags,
+        })
+
+    def entries(self):
+        """Yield (meta_path, meta) for every cached entry."""
+        if not os.path.isdir(self.directory):
+            return
+        for host in sorted(os.listdir(self.directory)):
+            host_dir = os.path.join(self.directory, host)
+            if not os.path.isdir(host_dir):
+                continue
+            for name in sorted(os.listdir(host_dir)):
+                if name.endswith('.meta.json'):
+                    meta_path = os.path.join(host_dir, name)
+                    meta = _read_json(meta_path)
+                    if meta is not None:
+                        yield meta_path, meta
+
+    def evict(self, host=None, tournament_id=None, expired_only=False):
+        """Delete matching entries; returns how many were removed."""
+        removed = 0
+        for meta_path, meta in list(self.entries()):
+            key = meta.get('key', {})
+            if host and key.get('host') != host:
+                continue
+            if tournament_id and key.get('tournamentId') != str(tournament_id):
+                continue
+            if expired_only and not _is_expired(meta):
+                continue
+            payload_path = meta_path[:-len('.meta.json')] + '.json'
+            for path in (payload_path, meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed += 1
+        return removed
+
+    def invalidate(self, ids=(), taints=None, cup_id=None):
+        """
+        Expire every entry whose cachetags cover one of `ids`.
+
+        `taints` narrows the match to those taint names (e.g. ["match"]),
+        `cup_id` to payloads of one cup. With only `cup_id`, every entry
+        for that cup is expired. Returns the keys that were invalidated.
+        """
+        invalidated = []
+        now = time.time()
+        for meta_path, meta in list(self.entries()):
+            if not tags_match(meta, ids=ids, taints=taints, cup_id=cup_id):
+                continue
+            if not _is_expired(meta):
+                meta['expiresAt'] = now
+                _write_json(meta_path, meta)
+            invalidated.append(meta.get('key', {}))
+        return invalidated
+
+
+def _is_expired(meta):
+    expires_at = meta.get('expiresAt')
+    return expires_at is not None and expires_at <= time.time()
+
+
+def _read_json(path):
+    try:
+        return jsonio.load(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """Atomically write `data` as compact JSON; returns the byte size."""
+    return jsonio.dump(data, path)
+
+
+def add_cache_arguments(parser):
+    """Add the --cache-dir / --no-cache options shared by the fetch scripts."""
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='directory for cached results_api responses')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always hit the network and do not store responses')
+    return parser
+
+
+def cache_from_args(args):
+    return None if args.no_cache else ResponseCache(args.cache_dir)
+
+
+def _describe(meta):
+    key = meta.get('key', {})
+    fetched = time.strftime('%Y-%m-%d %H:%M', time.localtime(meta.get('fetchedAt', 0)))
+    if meta.get('expiresAt') is None:
+        expiry = 'never'
+    elif _is_expired(meta):
+        expiry = 'expired'
+    else:
+        expiry = time.strftime('%Y-%m-%d %H:%M', time.localtime(meta['expiresAt']))
+    kind = query_kind(key.get('call', ''))
+    return f"{key.get('host', ''):<40} {key.get('tournamentId', '') or '-':>10} {kind:<12} {meta.get('bytes', 0):>10,} {fetched:>17} {expiry:>17}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect and evict cached results_api responses.')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('list', 'list cached entries'), ('evict', 'delete cached entries')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--host', help='only entries for this host')
+        command.add_argument('--tournament', help='only entries for this tournamentId')
+        command.add_argument('--expired', action='store_true', help='only expired entries')
+
+    invalidate = commands.add_parser('invalidate', help='expire entries whose cachetags cover the given ids')
+    invalidate.add_argument('--id', dest='ids', action='append', default=[], help='tainted entity id (repeatable)')
+    invalidate.add_argument('--taint', dest='taints', action='append', help='only tags with this taint (repeatable)')
+    invalidate.add_argument('--cup', help='only payloads of this cupId')
+
+    args = parser.parse_args(argv)
+    cache = ResponseCache(args.cache_dir)
+
+    if args.command == 'invalidate':
+        if not args.ids and args.cup is None:
+            parser.error('invalidate needs --id and/or --cup')
+        invalidated = cache.invalidate(ids=args.ids, taints=args.taints, cup_id=args.cup)
+        for key in invalidated:
+            print(f"  - {key.get('host', '')} {key.get('tournamentId', '') or '-'} {query_kind(key.get('call', ''))}")
+        print(f"✓ Invalidated {len(invalidated)} entries")
+        return
+
+    if args.command == 'list':
+        total_bytes = 0
+        count = 0
+        print(f"{'host':<40} {'tournament':>10} {'call':<12} {'bytes':>10} {'fetched':>17} {'expires':>17}")
+        for _, meta in cache.entries():
+            key = meta.get('key', {})
+            if args.host and key.get('host') != args.host:
+                continue
+            if args.tournament and key.get('tournamentId') != args.tournament:
+                continue
+            if args.expired and not _is_expired(meta):
+                continue
+            print(_describe(meta))
+            total_bytes += meta.get('bytes', 0)
+            count += 1
+        print(f"\n{count} entries, {total_bytes:,} bytes")
+    else:
+        removed = cache.evict(host=args.host, tournament_id=args.tournament, expired_only=args.expired)
+        print(f"✓ Evicted {removed} entries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cupmanager import jsonio
+from cupmanager.cache import cache_key, is_cacheable, is_results_api
+from cupmanager.metrics import MetricsRegistry, entity_count, request_kind
+from cupmanager.ratelimit import THROTTLE_STATUSES, HostRateLimiter, parse_retry_after
+from cupmanager.stream import CHUNK_SIZE, load_payload
+
+# Connection pool sizing per host. cupmanager sites are small organiser
+# servers, so a handful of kept-alive connections per host is plenty.
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 8
+
+# Seconds. `connect` is kept short so dead organiser sites fail fast,
+# `read` is long enough for the 700 KB+ rankings/finals payloads.
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 30
+
+# Extra attempts after a 429/503 before handing the response back.
+DEFAULT_THROTTLE_RETRIES = 3
+
+
+class HttpClient:
+    """
+    Keep-alive HTTP client holding one `requests.Session` per host.
+
+    Repeated Me / rankings / finals calls to the same cupmanager host reuse
+    the pooled TCP+TLS connection instead of handshaking on every call.
+    Every request first takes a token from the per-host `rate_limiter`; a
+    429/503 backs off that host only and the request is retried. With a
+    `cache` (see `cupmanager.cache.ResponseCache`), `get_json` serves
+    results_api calls from disk when a fresh entry exists; with an
+    `archive` (see `cupmanager.archive.PayloadArchive`), every results_api
+    payload fetched from the network is archived. Every call is recorded
+    in `metrics` (see `cupmanager.metrics.MetricsRegistry`): its latency
+    is timed from when the rate limiter lets its last attempt go, and the
+    time spent waiting on the limiter is recorded separately.
+    Safe to share between threads.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 rate_limiter=None, throttle_retries=DEFAULT_THROTTLE_RETRIES, cache=None, archive=None,
+                 metrics=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.rate_limiter = rate_limiter if rate_limiter is not None else HostRateLimiter()
+        self.throttle_retries = throttle_retries
+        self.cache = cache
+        self.archive = archive
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """Return the pooled session for the host of `url`, creating it on first use."""
+        host = urlparse(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def _send(self, url, timing, params=None, timeout=None, **kwargs):
+        """
+        GET with per-host rate limiting and 429/503 retries.
+
+        Fills `timing` as it goes, so it is complete even if the request
+        raises: `waited` is the time spent in `rate_limiter.acquire` over
+        all attempts (token bucket and 429/503 pauses), `sent` the
+        `time.perf_counter()` at which the last attempt got its token, and
+        `retries` the attempts after the first.
+        """
+        read_timeout = self.read_timeout if timeout is None else timeout
+        connect_timeout = min(self.connect_timeout, read_timeout)
+        session = self.session_for(url)
+
+        for attempt in range(self.throttle_retries + 1):
+            timing['retries'] = attempt
+            waiting = time.perf_counter()
+            self.rate_limiter.acquire(url)
+            timing['sent'] = time.perf_counter()
+            timing['waited'] += timing['sent'] - waiting
+            response = session.get(url, params=params, timeout=(connect_timeout, read_timeout), **kwargs)
+            if response.status_code not in THROTTLE_STATUSES:
+                self.rate_limiter.reward(url)
+                return response
+            self.rate_limiter.penalize(url, parse_retry_after(response.headers.get('Retry-After')))
+            if attempt < self.throttle_retries:
+                response.close()
+
+        return response
+
+    def _record(self, host, kind, started, timing, **kwargs):
+        """Record a call's latency from its last attempt's token onwards, with the throttle wait apart."""
+        sent = timing['sent'] if timing['sent'] is not None else started
+        self.metrics.record(host, kind, time.perf_counter() - sent, retries=timing['retries'],
+                            throttle_wait=timing['waited'], **kwargs)
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        """GET `url` over the host's pooled session. `timeout` overrides the read timeout."""
+        started = time.perf_counter()
+        timing = _new_timing()
+        status, size = 'error', 0
+        try:
+            response = self._send(url, timing, params=params, timeout=timeout, **kwargs)
+            status = response.status_code
+            if not kwargs.get('stream'):
+                size = len(response.content)
+            return response
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            self._record(urlparse(url).netloc, request_kind(url, params), started, timing, size=size, status=status)
+
+    def get_json(self, url, params=None, timeout=None, on_entry=None):
+        """
+        GET `url` and decode JSON, going through the response cache for results_api calls.
+
+        results_api bodies are decoded incrementally while they download (see
+        `cupmanager.stream`); `on_entry(key, value)` is called for every
+        `responses` entry as it is decoded, e.g. `ResponseIndex.add`.
+        """
+        results_api = is_results_api(url)
+        host, kind = urlparse(url).netloc, request_kind(url, params)
+        started = time.perf_counter()
+        key = cache_key(url, params) if self.cache is not None and results_api else None
+        if key is not None:
+            payload = self.cache.get(key)
+            if payload is not None:
+                if on_entry:
+                    for entry_key, value in payload.get('responses', {}).items():
+                        on_entry(entry_key, value)
+                self.metrics.record(host, kind, time.perf_counter() - started, entities=entity_count(payload),
+                                    status='cache', cached=True)
+                return payload
+
+        received = [0]
+
+        def counted(chunks):
+            for chunk in chunks:
+                received[0] += len(chunk)
+                yield chunk
+
+        timing = _new_timing()
+        status, payload = 'error', None
+        try:
+            response = self._send(url, timing, params=params, timeout=timeout, stream=results_api)
+            status = response.status_code
+            with response:
+                response.raise_for_status()
+                if results_api:
+                    payload = load_payload(counted(response.iter_content(CHUNK_SIZE)), on_entry=on_entry)
+                else:
+                    received[0] = len(response.content)
+                    payload = jsonio.loads(response.content)
+        except Exception as e:
+            if not isinstance(e, requests.HTTPError):
+                status = type(e).__name__
+            raise
+        finally:
+            self._record(host, kind, started, timing, size=received[0], entities=entity_count(payload), status=status)
+
+        if key is not None and is_cacheable(payload):
+            self.cache.put(key, payload)
+        if self.archive is not None and results_api:
+            params = params or {}
+            self.archive.put(payload, host=urlparse(url).netloc, tournament_id=params.get('tournamentId'),
+                             call=params.get('call', ''))
+        return payload
+
+    def close(self):
+        """Close every pooled session."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def _new_timing():
+    return {'waited': 0.0, 'sent': None, 'retries': 0}
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide shared client used by the fetch scripts."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def configure(**kwargs):
+    """Replace the shared client, e.g. `configure(pool_maxsize=16, rate_limiter=HostRateLimiter(rate=5))`."""
+    global _default_client
+    with _default_lock:
+        if _default_client is not None:
+            _default_client.close()
+        _default_client = HttpClient(**kwargs)
+        return _default_client
+
+
+def get(url, params=None, timeout=None, **kwargs):
+    """Drop-in for `requests.get` that goes through the shared pooled client."""
+    return get_client().get(url, params=params, timeout=timeout, **kwargs)
+
+
+def get_json(url, params=None, timeout=None, on_entry=None):
+    """Decoded JSON for `url` via the shared client (and its cache, if configured)."""
+    return get_client().get_json(url, params=params, timeout=timeout, on_entry=on_entry)
+
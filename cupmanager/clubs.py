@@ -0,0 +1,241 @@
+import argparse
+import os
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+
+from cupmanager import jsonio
+
+DEFAULT_REGISTRY = '.cache/club-registry.json'
+REGISTRY_VERSION = 1
+
+# Trailing words that only say what kind of club it is: "Doreen United SC",
+# "Doreen United" and "Doreen United Soccer Club" are one club
+CLUB_SUFFIXES = ('soccer club', 'football club', 'sc', 'fc', 'inc')
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def club_slug(name):
+    """The frontend's clubId for a club name (URL path segment), e.g. `geelong_rangers`."""
+    return name.replace(' ', '_').lower()
+
+
+@lru_cache(maxsize=16384)
+def normalize_club_name(name):
+    """
+    Lookup form of a club name: accents and punctuation dropped (dots
+    without a space, so "S.C." is "sc"), lower case, `&` read as `and`,
+    and a trailing CLUB_SUFFIXES word removed.
+
+    >>> normalize_club_name('Gisborne Soccer Club')
+    'gisborne'
+    """
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    text = ' '.join(_NON_ALNUM.sub(' ', text.replace('.', '').replace('&', ' and ')).split())
+    for suffix in CLUB_SUFFIXES:
+        if text.endswith(' ' + suffix):
+            return text[:-len(suffix) - 1]
+    return text
+
+
+class ClubRegistry:
+    """
+    Persistent NameClub id -> club mapping shared by every tournament.
+
+    cupmanager issues a new NameClub id per tournament registration, and
+    Team `clubName`s carry team suffixes ("Gisborne SC Marco"), so the
+    same club used to get a different realData.json clubId per tournament
+    or per team. Here each NameClub id is resolved once: by id if it was
+    seen before, else through an index of normalized names (every spelling
+    seen plus the hand-edited `aliases` table), else as a new club whose
+    clubId is the slug of its first name. The registry file keeps:
+
+    - `clubs`: clubId -> {name, names seen, nameClubIds}
+    - `aliases`: extra spellings -> clubId, e.g. to merge two clubs whose
+      names don't normalize to the same text (see `alias` / `merge`)
+
+    Safe to share between threads; `save()` writes the file if anything changed.
+    """
+
+    def __init__(self, registry_file=DEFAULT_REGISTRY):
+        self.registry_file = registry_file
+        self.clubs = {}
+        self.aliases = {}
+        self.changed = False
+        self._by_name_club = {}
+        self._by_name = {}
+        self._lock = threading.Lock()
+
+        data = _load(registry_file)
+        if data.get('version') == REGISTRY_VERSION:
+            self.clubs = data.get('clubs', {})
+            self.aliases = data.get('aliases', {})
+        for club_id, club in self.clubs.items():
+            for name_club_id in club.get('nameClubIds', []):
+                self._by_name_club[name_club_id] = club_id
+            for name in [club['name']] + club.get('names', []):
+                self._by_name.setdefault(normalize_club_name(name), club_id)
+        for name, club_id in self.aliases.items():
+            self._by_name[normalize_club_name(name)] = club_id
+
+    def lookup(self, name):
+        """clubId for a club name (any known spelling or alias), or None."""
+        return self._by_name.get(normalize_club_name(name))
+
+    def resolve(self, name_club_id, name):
+        """
+        (clubId, canonical club name) for a NameClub entity, registering it
+        if new. `name_club_id` may be None (payload without the NameClub);
+        then only the name is matched.
+        """
+        name_club_id = str(name_club_id) if name_club_id is not None else None
+        club_id = self._by_name_club.get(name_club_id) if name_club_id else None
+        if club_id is not None:
+            return club_id, self.clubs[club_id]['name']
+
+        with self._lock:
+            normalized = normalize_club_name(name)
+            club_id = self._by_name.get(normalized)
+            if club_id is None:
+                club_id = self._new_club_id(name)
+                self.clubs[club_id] = {'name': name, 'names': [], 'nameClubIds': []}
+                self._by_name[normalized] = club_id
+                self.changed = True
+            club = self.clubs[club_id]
+            if name != club['name'] and name not in club['names']:
+                club['names'].append(name)
+                self.changed = True
+            if name_club_id and name_club_id not in club['nameClubIds']:
+                club['nameClubIds'].append(name_club_id)
+                self._by_name_club[name_club_id] = club_id
+                self.changed = True
+            return club_id, club['name']
+
+    def _new_club_id(self, name):
+        base = club_slug(name)
+        club_id = base
+        number = 2
+        while club_id in self.clubs:
+            club_id = f"{base}_{number}"
+            number += 1
+        return club_id
+
+    def alias(self, name, club_id):
+        """Make `name` (and everything normalizing like it) resolve to `club_id`."""
+        if club_id not in self.clubs:
+            raise KeyError(f"Unknown club {club_id!r}")
+        with self._lock:
+            self.aliases[name] = club_id
+            self._by_name[normalize_club_name(name)] = club_id
+            self.changed = True
+
+    def merge(self, from_club_id, into_club_id):
+        """Fold `from_club_id` into `into_club_id`; its names become aliases."""
+        if from_club_id not in self.clubs or into_club_id not in self.clubs or from_club_id == into_club_id:
+            raise KeyError(f"Cannot merge {from_club_id!r} into {into_club_id!r}")
+        with self._lock:
+            source = self.clubs.pop(from_club_id)
+            target = self.clubs[into_club_id]
+            for name in [source['name']] + source['names']:
+                self.aliases[name] = into_club_id
+                if name != target['name'] and name not in target['names']:
+                    target['names'].append(name)
+            for name_club_id in source['nameClubIds']:
+                target['nameClubIds'].append(name_club_id)
+                self._by_name_club[name_club_id] = into_club_id
+            for name, club_id in list(self.aliases.items()):
+                if club_id == from_club_id:
+                    self.aliases[name] = into_club_id
+            for normalized, club_id in list(self._by_name.items()):
+                if club_id == from_club_id:
+                    self._by_name[normalized] = into_club_id
+            self.changed = True
+
+    def save(self):
+        with self._lock:
+            if not self.changed:
+                return
+            directory = os.path.dirname(self.registry_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            jsonio.dump({'version': REGISTRY_VERSION, 'clubs': self.clubs, 'aliases': self.aliases},
+                        self.registry_file, pretty=True, sort_keys=True)
+            self.changed = False
+
+
+def add_club_arguments(parser):
+    """Add the --club-registry option for scripts that build realData.json from payloads."""
+    parser.add_argument('--club-registry', default=DEFAULT_REGISTRY, metavar='FILE',
+                        help=f'NameClub id -> club registry used for clubIds (default: {DEFAULT_REGISTRY}); '
+                             f'"none" derives clubIds from team club names')
+    return parser
+
+
+def clubs_from_args(args):
+    if not args.club_registry or args.club_registry == 'none':
+        return None
+    return ClubRegistry(args.club_registry)
+
+
+def _load(path):
+    try:
+        return jsonio.load(path)
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect and curate the club registry.')
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_command = commands.add_parser('list', help='list clubs with their spellings and NameClub ids')
+    list_command.add_argument('-k', '--filter', default='', help='only clubs whose id or a name contains this text')
+
+    alias = commands.add_parser('alias', help='map another spelling to an existing club')
+    alias.add_argument('name')
+    alias.add_argument('club_id')
+
+    merge = commands.add_parser('merge', help='fold one club into another')
+    merge.add_argument('from_club_id')
+    merge.add_argument('into_club_id')
+
+    lookup = commands.add_parser('lookup', help='show which club a name resolves to')
+    lookup.add_argument('name')
+
+    args = parser.parse_args(argv)
+    registry = ClubRegistry(args.registry)
+
+    if args.command == 'list':
+        text = args.filter.lower()
+        print(f"{'clubId':<40} {'ids':>4}  name (other spellings)")
+        for club_id, club in sorted(registry.clubs.items()):
+            names = [club['name']] + club['names']
+            if text and text not in club_id and not any(text in name.lower() for name in names):
+                continue
+            others = f" ({', '.join(club['names'])})" if club['names'] else ''
+            print(f"{club_id:<40} {len(club['nameClubIds']):>4}  {club['name']}{others}")
+        print(f"\n{len(registry.clubs)} clubs, {len(registry.aliases)} aliases")
+
+    elif args.command == 'lookup':
+        club_id = registry.lookup(args.name)
+        print(f"{args.name!r} -> {normalize_club_name(args.name)!r} -> {club_id or '✗ no club'}")
+
+    else:
+        try:
+            if args.command == 'alias':
+                registry.alias(args.name, args.club_id)
+                print(f"✓ {args.name!r} -> {args.club_id}")
+            else:
+                registry.merge(args.from_club_id, args.into_club_id)
+                print(f"✓ Merged {args.from_club_id} into {args.into_club_id}")
+        except KeyError as e:
+            parser.error(str(e.args[0]))
+        registry.save()
+        print("  Rebuild realData.json (--rebuild) to apply it to existing tournaments")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+
+from cupmanager import jsonio
+from cupmanager.archive import DEFAULT_ARCHIVE_DIR
+from cupmanager.cache import DEFAULT_CACHE_DIR
+from cupmanager.clubs import DEFAULT_REGISTRY
+from cupmanager.journal import DEFAULT_JOURNAL
+from cupmanager.resolver import DEFAULT_STORE
+
+REAL_DATA_FILE = 'tournament-rankings-poc/web/src/data/realData.json'
+
+# Crawl state, not frontend data: kept out of the web app's src tree so the
+# bundle never picks it up
+DEFAULT_MANIFEST_DIR = '.cache'
+
+# Crawl-state options --state-dir moves when left at their defaults:
+# (args attribute, default, name under the state directory)
+STATE_OPTIONS = (
+    ('cache_dir', DEFAULT_CACHE_DIR, 'results_api'),
+    ('archive', DEFAULT_ARCHIVE_DIR, 'archive'),
+    ('journal', DEFAULT_JOURNAL, 'crawl-journal.jsonl'),
+    ('resolver_store', DEFAULT_STORE, 'tournament-id-resolver.json'),
+    ('club_registry', DEFAULT_REGISTRY, 'club-registry.json'),
+)
+
+# Bump when parse_tournament_data / parse_match_scores change their output,
+# so every tournament is reparsed once even though its payloads did not change.
+DATASET_VERSION = 2
+
+
+def source_hash(*payloads):
+    """
+    Content hash of the results_api payloads a tournament was built from.
+
+    Only the `entity` of each response entry is hashed: per-fetch timings
+    (`totalTime`, `auditResolveTime`) would otherwise change the hash on
+    every download. Always encoded with the stdlib so the hash does not
+    change with the installed JSON backend.
+    """
+    digest = hashlib.sha256()
+    for payload in payloads:
+        responses = payload.get('responses', {}) if isinstance(payload, dict) else {}
+        entities = {key: value.get('entity') for key, value in responses.items() if isinstance(value, dict)}
+        digest.update(json.dumps(entities, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def manifest_path(output_file, directory=DEFAULT_MANIFEST_DIR):
+    """Default manifest for `output_file`, e.g. `.cache/realData.manifest.json`."""
+    name = os.path.splitext(os.path.basename(output_file))[0]
+    return os.path.join(directory, f"{name}.manifest.json")
+
+
+class IncrementalDataset:
+    """
+    realData.json plus a manifest of tournamentId -> source payload hash.
+
+    Tournaments whose payload hash is unchanged are kept as they are;
+    changed ones are replaced in place and new ones appended, so there is
+    never more than one entry per tournamentId and the existing order is
+    preserved. New entries merged with an `order` (e.g. their discovery
+    position) are saved in that order rather than the order they were
+    merged in, so a concurrent crawl writes the same file on every run.
+    realData.json is written compact unless `pretty=True`.
+    """
+
+    def __init__(self, output_file=REAL_DATA_FILE, manifest_file=None, rebuild=False, pretty=False):
+        self.output_file = output_file
+        self.pretty = pretty
+        self.manifest_file = manifest_file or manifest_path(output_file)
+        self.tournaments = []
+        self.manifest = {}
+        self.changed = False
+
+        if not rebuild:
+            self.tournaments = _load(self.output_file, [])
+            manifest = _load(self.manifest_file, {})
+            if manifest.get('version') == DATASET_VERSION:
+                self.manifest = manifest.get('tournaments', {})
+        else:
+            self.changed = True
+
+        self._positions = {str(t['tournamentId']): i for i, t in enumerate(self.tournaments)}
+        self._loaded = len(self.tournaments)
+        self._order = {}
+
+    def get(self, tournament_id):
+        position = self._positions.get(str(tournament_id))
+        return None if position is None else self.tournaments[position]
+
+    def unchanged(self, tournament_id, payload_hash):
+        """The stored entry if it was built from exactly these payloads, else None."""
+        entry = self.manifest.get(str(tournament_id))
+        if entry and entry.get('hash') == payload_hash:
+            return self.get(tournament_id)
+        return None
+
+    def merge(self, tournament_data, payload_hash=None, order=None):
+        """
+        Insert or replace a tournament. Returns 'added', 'updated' or 'unchanged'.
+
+        `order` sorts a new tournament among the others added in this run.
+        """
+        tournament_id = str(tournament_data['tournamentId'])
+        position = self._positions.get(tournament_id)
+
+        if payload_hash is not None:
+            self.manifest[tournament_id] = {'hash': payload_hash, 'name': tournament_data.get('tournamentName', '')}
+
+        if position is None:
+            self._positions[tournament_id] = len(self.tournaments)
+            self.tournaments.append(tournament_data)
+            if order is not None:
+                self._order[tournament_id] = order
+            self.changed = True
+            return 'added'
+
+        if self.tournaments[position] == tournament_data:
+            return 'unchanged'
+
+        self.tournaments[position] = tournament_data
+        self.changed = True
+        return 'updated'
+
+    def adopt(self, tournaments):
+        """Add entries that have no source payloads (e.g. all-real-tournaments.json) if missing."""
+        for tournament_data in tournaments:
+            if str(tournament_data['tournamentId']) not in self._positions:
+                self.merge(tournament_data)
+
+    def _sort_added(self):
+        """Put the tournaments added in this run in `order` (unordered ones keep merge order, last)."""
+        added = self.tournaments[self._loaded:]
+        if not self._order or len(added) < 2:
+            return
+        added.sort(key=lambda t: (self._order.get(str(t['tournamentId'])) is None,
+                                  self._order.get(str(t['tournamentId']), 0)))
+        self.tournaments[self._loaded:] = added
+        for position, tournament_data in enumerate(added, self._loaded):
+            self._positions[str(tournament_data['tournamentId'])] = position
+
+    def save(self):
+        """Write realData.json (only if something changed) and the manifest."""
+        if self.changed:
+            self._sort_added()
+            _makedirs_for(self.output_file)
+            jsonio.dump(self.tournaments, self.output_file, pretty=self.pretty)
+        _makedirs_for(self.manifest_file)
+        jsonio.dump({'version': DATASET_VERSION, 'tournaments': self.manifest}, self.manifest_file, pretty=True)
+        return self.changed
+
+
+def add_dataset_arguments(parser):
+    """Add the --output / --state-dir / --rebuild / --pretty options shared by the scripts that write realData.json."""
+    parser.add_argument('--output', default=REAL_DATA_FILE, metavar='FILE',
+                        help=f'realData.json to build (default: {REAL_DATA_FILE})')
+    parser.add_argument('--state-dir', metavar='DIR',
+                        help='keep the manifest, response cache, archive, crawl journal, resolver store and club '
+                             'registry under DIR instead of .cache/ and the repo root (e.g. for a stand-in crawl)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='ignore the existing realData.json and manifest and rebuild from scratch')
+    parser.add_argument('--pretty', action='store_true',
+                        help='write realData.json indented (for debugging) instead of compact')
+    return parser
+
+
+def apply_state_dir(args):
+    """
+    With --state-dir, point every STATE_OPTIONS option the script has and
+    that was left at its default into the state directory. Call after
+    parse_args and before the `*_from_args` helpers.
+    """
+    if not args.state_dir:
+        return args
+    for name, default, state_name in STATE_OPTIONS:
+        if getattr(args, name, None) == default:
+            setattr(args, name, os.path.join(args.state_dir, state_name))
+    return args
+
+
+def dataset_from_args(args):
+    manifest_file = manifest_path(args.output, args.state_dir) if args.state_dir else None
+    return IncrementalDataset(args.output, manifest_file=manifest_file, rebuild=args.rebuild, pretty=args.pretty)
+
+
+def _makedirs_for(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def _load(path, default):
+    try:
+        return jsonio.load(path)
+    except (OSError, ValueError):
+        return default
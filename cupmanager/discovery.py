@@ -0,0 +1,133 @@
+import calendar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from cupmanager import client
+
+SEARCH_URL = 'https://portal.cupmanager.net/rest/newportal/search'
+SEARCH_PARAMS = {
+    'coords': '[-38,145]',
+    'country': 'AU',
+    'loc': 'Victoria',
+    'regions': '[{"nationId":25}]',
+    'sport': 'football',
+}
+
+# Search windows in flight at once. They all hit portal.cupmanager.net, so
+# the per-host rate limiter still decides the actual request rate.
+DEFAULT_DISCOVERY_WORKERS = 4
+
+
+def month_windows(year, months=range(1, 13)):
+    """(key, from_date, to_date) for each calendar month of `year`."""
+    windows = []
+    for month in months:
+        last_day = calendar.monthrange(year, month)[1]
+        windows.append((f"{year}-{month:02d}", f"{year}-{month:02d}-01", f"{year}-{month:02d}-{last_day}"))
+    return windows
+
+
+def week_windows(year, months=range(1, 13)):
+    """(key, from_date, to_date) for 7-day windows covering the given months."""
+    windows = []
+    for month in months:
+        start = date(year, month, 1)
+        month_end = date(year, month, calendar.monthrange(year, month)[1])
+        while start <= month_end:
+            end = min(start + timedelta(days=6), month_end)
+            windows.append((start.isoformat(), start.isoformat(), end.isoformat()))
+            start = end + timedelta(days=1)
+    return windows
+
+
+def parse_search_results(data, **extra):
+    """Flatten a newportal/search response ({sport: {type: [tournament]}}) into tournament dicts."""
+    tournaments = []
+    for sport, categories in data.items():
+        for category_type, tournament_list in categories.items():
+            for tournament in tournament_list:
+                tournaments.append({
+                    'name': tournament.get('name', 'Unknown'),
+                    'websiteUrl': tournament.get('websiteUrl', ''),
+                    'organizer': tournament.get('organizerName', ''),
+                    'organizerId': tournament.get('organizerId', ''),
+                    **extra,
+                })
+    return tournaments
+
+
+def search_window(from_date, to_date, search_url=None, **extra):
+    """Tournaments the portal lists between `from_date` and `to_date`, or None on error."""
+    params = dict(SEARCH_PARAMS, date=to_date, fromDate=from_date)
+    try:
+        return parse_search_results(client.get_json(search_url or SEARCH_URL, params=params, timeout=30), **extra)
+    except Exception as e:
+        print(f"   ✗ {from_date}..{to_date}: {str(e)[:80]}")
+        return None
+
+
+def discover(windows, workers=DEFAULT_DISCOVERY_WORKERS, search=None, on_window=None):
+    """
+    Yield each unique tournament (by websiteUrl) as soon as its window returns.
+
+    Windows are searched concurrently on `workers` threads and handled in
+    the order they complete. Each yielded tournament gets a
+    `discoveryOrder` of (window index, position in that window), so
+    callers can put them back in listing order (e.g. `order=` of
+    `IncrementalDataset.merge`); a tournament listed in several windows
+    keeps the position of the first one to return.
+    `search(key, from_date, to_date)` defaults to `search_window` and may be
+    wrapped, e.g. to journal results. `on_window(key, tournaments,
+    new_count)` is called from the consuming thread once per window.
+    Tournaments without a websiteUrl are yielded too (they cannot be
+    deduped) so callers can report them.
+    """
+    if search is None:
+        search = lambda key, from_date, to_date: search_window(from_date, to_date)
+
+    seen = set()
+
+    def fresh(window_index, tournaments):
+        for position, tournament in enumerate(tournaments or []):
+            url = tournament['websiteUrl']
+            if url in seen:
+                continue
+            if url:
+                seen.add(url)
+            tournament['discoveryOrder'] = (window_index, position)
+            yield tournament
+
+    def handle(window_index, key, tournaments):
+        new = list(fresh(window_index, tournaments))
+        if on_window:
+            on_window(key, tournaments, len(new))
+        return new
+
+    if workers <= 1:
+        for window_index, (key, from_date, to_date) in enumerate(windows):
+            yield from handle(window_index, key, search(key, from_date, to_date))
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(search, *window): (window_index, window[0])
+            for window_index, window in enumerate(windows)
+        }
+        for future in as_completed(futures):
+            window_index, key = futures[future]
+            yield from handle(window_index, key, future.result())
+
+
+def add_discovery_arguments(parser):
+    """Add the --windows / --discovery-workers options for portal search."""
+    parser.add_argument('--windows', choices=('month', 'week'), default='month',
+                        help='size of the portal search date windows')
+    parser.add_argument('--discovery-workers', type=int, default=DEFAULT_DISCOVERY_WORKERS,
+                        help='portal search windows queried concurrently')
+    parser.add_argument('--portal', default=SEARCH_URL,
+                        help='newportal/search URL, e.g. a local stand-in (python -m cupmanager.standin)')
+    return parser
+
+
+def windows_from_args(args, year):
+    return week_windows(year) if args.windows == 'week' else month_windows(year)
@@ -0,0 +1,115 @@
+"""
+Parsing of results_api hrefs and response keys.
+
+Entities point at each other with hrefs such as ``Team({id:123})`` or
+``MatchActor({actor:"home",id:69313228})``, and `responses` keys have
+the same shape with an optional ``$field`` suffix, e.g.
+``Stage({categoryId:1,stageId:2,tournamentId:3})$rankings``.
+`parse_href` turns any of them into a typed `Href` (kind, params,
+field) from module-level compiled patterns and memoizes the result, so
+an href seen on many rows is parsed once. `team_id`, `club_id`,
+`category_id` and `stage_key` are the shortcuts the parsers call per
+row or stage.
+"""
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple
+
+# Distinct hrefs in one tournament payload number in the tens of thousands
+# at most; the memo keeps a whole crawl's worth of recent ones.
+HREF_CACHE_SIZE = 65536
+
+# `Kind({key:value,...})` optionally followed by `$field`, and the
+# single-id form `Team({id:123})` most hrefs take, parsed without
+# splitting the arguments
+_HREF = re.compile(r'(\w+)\(\{(.*)\}\)(?:\$(\w+))?')
+_ID_HREF = re.compile(r'(\w+)\(\{id:(\d+)\}\)(?:\$(\w+))?')
+_PARAM = re.compile(r'(\w+):("(?:[^"\\]|\\.)*"|[^,]*)')
+
+_NO_PARAMS = MappingProxyType({})
+
+
+class Href(NamedTuple):
+    """
+    A parsed href or response key.
+
+    ``params`` maps each argument to its value as a string (ids stay
+    strings, as realData.json keys them; quotes are removed, ``null``
+    becomes None). It is read-only because parses are shared via the memo.
+    """
+    kind: str
+    params: Mapping[str, Optional[str]]
+    field: Optional[str] = None
+
+
+def _value(raw: str) -> Optional[str]:
+    if len(raw) >= 2 and raw.startswith('"') and raw.endswith('"'):
+        return raw[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    if raw == 'null':
+        return None
+    return raw
+
+
+@lru_cache(maxsize=HREF_CACHE_SIZE)
+def parse_href(href: str) -> Optional[Href]:
+    """
+    Parse ``Kind({...})$field`` into an ``Href``, or None for anything else.
+
+    >>> parse_href('MatchActor({actor:"home",id:69313228})')
+    Href(kind='MatchActor', params=mappingproxy({'actor': 'home', 'id': '69313228'}), field=None)
+    """
+    if not href:
+        return None
+    match = _ID_HREF.fullmatch(href)
+    if match is not None:
+        kind, value, field = match.groups()
+        return Href(kind, MappingProxyType({'id': value}), field)
+    match = _HREF.fullmatch(href)
+    if match is None:
+        return None
+    kind, arguments, field = match.groups()
+    if not arguments:
+        return Href(kind, _NO_PARAMS, field)
+    params = dict(_PARAM.findall(arguments))
+    # ids and numbers, i.e. nearly every href, need no unquoting
+    if '"' in arguments or 'null' in arguments:
+        params = {key: _value(raw) for key, raw in params.items()}
+    return Href(kind, MappingProxyType(params), field)
+
+
+def id_href(href: str) -> Optional[Tuple[str, str]]:
+    """``(kind, id)`` for a single-id href such as ``Team({id:123})``, else None."""
+    parsed = parse_href(href)
+    if parsed is None or len(parsed.params) != 1:
+        return None
+    value = parsed.params.get('id')
+    return (parsed.kind, value) if value is not None and value.isdigit() else None
+
+
+def team_id(href: str) -> Optional[str]:
+    """``'123'`` for ``Team({id:123})``."""
+    parsed = id_href(href)
+    return parsed[1] if parsed is not None and parsed[0] == 'Team' else None
+
+
+def club_id(href: str) -> Optional[str]:
+    """``'123'`` for ``NameClub({id:123})``."""
+    parsed = id_href(href)
+    return parsed[1] if parsed is not None and parsed[0] == 'NameClub' else None
+
+
+def category_id(key: str) -> Optional[str]:
+    """categoryId of a ``Stage({categoryId:..,stageId:..})`` or ``Category(...)`` key."""
+    parsed = parse_href(key)
+    return parsed.params.get('categoryId') if parsed is not None else None
+
+
+def stage_key(key: str) -> Optional[Tuple[str, str]]:
+    """``(categoryId, stageId)`` of a ``Stage(...)`` key, or None."""
+    parsed = parse_href(key)
+    if parsed is None or parsed.kind != 'Stage':
+        return None
+    category, stage = parsed.params.get('categoryId'), parsed.params.get('stageId')
+    return (category, stage) if category is not None and stage is not None else None
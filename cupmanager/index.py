@@ -0,0 +1,76 @@
+from typing import Any, Dict, List, Optional
+
+
+class ResponseIndex:
+    """
+    Typed view over a results_api ``responses`` map, built in a single walk.
+
+    Dict-valued entities are grouped by ``__typename`` and keyed by their
+    response key, which is the same string other entities reference as
+    ``href`` (e.g. ``MatchActor({actor:"home",id:69313228})``). List-valued
+    entries such as ``Stage({...})$rankings`` are kept separately.
+    """
+
+    def __init__(self, payload: Dict[str, Any]):
+        responses = payload.get('responses', {}) if isinstance(payload, dict) else {}
+
+        self.responses: Dict[str, Any] = responses
+        self.entities: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.lists: Dict[str, List[Any]] = {}
+        self.stage_rankings: Dict[str, List[Any]] = {}
+        self._by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        for key, value in responses.items():
+            self._index(key, value)
+
+    def _index(self, key: str, value: Any) -> None:
+        if not isinstance(value, dict):
+            return
+        entity = value.get('entity')
+
+        if isinstance(entity, dict):
+            typename = entity.get('__typename')
+            if typename:
+                self.entities.setdefault(typename, {})[key] = entity
+                self._by_id.pop(typename, None)
+        elif isinstance(entity, list):
+            self.lists[key] = entity
+            if key.startswith('Stage({categoryId:') and key.endswith('$rankings'):
+                self.stage_rankings[key] = entity
+
+    def add(self, key: str, value: Any) -> None:
+        """Index one more response entry, e.g. as it is decoded from a stream."""
+        self.responses[key] = value
+        self._index(key, value)
+
+    @classmethod
+    def of(cls, data: Any) -> 'ResponseIndex':
+        """Return ``data`` if it is already an index, otherwise index it."""
+        if isinstance(data, cls):
+            return data
+        return cls(data)
+
+    def of_type(self, typename: str) -> Dict[str, Dict[str, Any]]:
+        """All entities of ``typename``, keyed by response key."""
+        return self.entities.get(typename, {})
+
+    def by_id(self, typename: str) -> Dict[str, Dict[str, Any]]:
+        """All entities of ``typename``, keyed by ``str(entity['id'])``."""
+        if typename not in self._by_id:
+            self._by_id[typename] = {
+                str(entity.get('id')): entity
+                for entity in self.of_type(typename).values()
+            }
+        return self._by_id[typename]
+
+    def get(self, href: str) -> Optional[Dict[str, Any]]:
+        """Resolve an ``href`` to its dict entity, if present."""
+        value = self.responses.get(href)
+        if isinstance(value, dict):
+            entity = value.get('entity')
+            if isinstance(entity, dict):
+                return entity
+        return None
+
+    def __len__(self) -> int:
+        return len(self.responses)
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+from cupmanager import jsonio
+
+DEFAULT_JOURNAL = '.cache/crawl-journal.jsonl'
+
+
+class CrawlJournal:
+    """
+    Append-only JSONL checkpoint of completed crawl steps.
+
+    Each line is `{"stage": ..., "key": ..., "at": ..., "data": ...}` for one
+    finished discovery window, ID resolution or results fetch. `data` is
+    meant to stay small: a fetched payload is journalled as its hash and
+    response cache key, not the payload itself. With `resume=True` the
+    existing journal is replayed so those steps are skipped; otherwise it
+    is started fresh. Only replayed steps keep their `data` in memory;
+    steps recorded during this run keep just their key. A half-written
+    last line (crash mid-append) is ignored.
+    """
+
+    def __init__(self, path=DEFAULT_JOURNAL, resume=False):
+        self.path = path
+        self._done = {}
+        self._recorded = set()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = jsonio.loads(line)
+                    except ValueError:
+                        continue
+                    self._done[(record['stage'], record['key'])] = record.get('data')
+
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self._file.tell() > 0 and not _ends_with_newline(path):
+            self._file.write('\n')
+
+    def __len__(self):
+        return len(self._done.keys() | self._recorded)
+
+    def get(self, stage, key):
+        """`data` of a step replayed from an earlier run, else None."""
+        return self._done.get((stage, str(key)))
+
+    def is_done(self, stage, key):
+        return (stage, str(key)) in self._done or (stage, str(key)) in self._recorded
+
+    def record(self, stage, key, data):
+        line = jsonio.dumps({'stage': stage, 'key': str(key), 'at': time.time(), 'data': data}).decode('utf-8')
+        with self._lock:
+            self._recorded.add((stage, str(key)))
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def remember(self, stage, key, fetch):
+        """
+        Return the result replayed for (stage, key), or call `fetch()` and
+        journal its result. `None` results are not journalled, so failed
+        steps are retried on the next resume.
+        """
+        if (stage, str(key)) in self._done:
+            return self.get(stage, key)
+        data = fetch()
+        if data is not None:
+            self.record(stage, key, data)
+        return data
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def add_journal_arguments(parser):
+    """Add the --resume / --journal options for restartable crawls."""
+    parser.add_argument('--resume', action='store_true',
+                        help='skip steps already completed in the crawl journal')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL,
+                        help='path of the append-only crawl journal')
+    return parser
@@ -0,0 +1,55 @@
+import json
+import os
+import threading
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+# Which encoder/decoder is in use, for log lines and benchmarks.
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def loads(data):
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, pretty=False, sort_keys=False):
+    """
+    Encode `obj` as UTF-8 bytes.
+
+    Compact (no whitespace) by default, for payloads and the realData.json
+    shipped to the browser; `pretty=True` gives 2-space indented output for
+    files meant to be read or diffed.
+    """
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # e.g. ints beyond 64 bits or non-str keys; the stdlib handles those
+            pass
+    if pretty:
+        text = json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys)
+    return text.encode('utf-8')
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump(obj, path, pretty=False, sort_keys=False):
+    """Atomically write `obj` to `path` (temp file + rename); returns the byte size."""
+    encoded = dumps(obj, pretty=pretty, sort_keys=sort_keys)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(encoded)
+    os.replace(tmp_path, path)
+    return len(encoded)
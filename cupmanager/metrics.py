@@ -0,0 +1,237 @@
+import json
+import threading
+from urllib.parse import urlparse
+
+from cupmanager.cache import is_results_api, query_kind
+
+# Latency quantiles reported in the summary, JSON and Prometheus output.
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def request_kind(url, params=None):
+    """Me / rankings / finals / combined for results_api calls, `search` for the portal, else `other`."""
+    if is_results_api(url):
+        return query_kind((params or {}).get('call', ''))
+    if urlparse(url).path.rstrip('/').endswith('/rest/newportal/search'):
+        return 'search'
+    return 'other'
+
+
+def entity_count(payload):
+    """Response entries in a results_api payload, or tournaments in a portal search response."""
+    if not isinstance(payload, dict):
+        return 0
+    if isinstance(payload.get('responses'), dict):
+        return len(payload['responses'])
+    return sum(len(items) for categories in payload.values() if isinstance(categories, dict)
+               for items in categories.values() if isinstance(items, list))
+
+
+def quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class _Series:
+    """Everything recorded for one (host, kind)."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.bytes = 0
+        self.entities = 0
+        self.retries = 0
+        self.throttle_wait = 0.0
+        self.throttle_wait_max = 0.0
+        self.cached = 0
+
+    def add(self, latency, size, entities, status, retries, throttle_wait, cached):
+        self.latencies.append(latency)
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        self.bytes += size
+        self.entities += entities
+        self.retries += retries
+        self.throttle_wait += throttle_wait
+        self.throttle_wait_max = max(self.throttle_wait_max, throttle_wait)
+        self.cached += int(cached)
+
+    @property
+    def calls(self):
+        return len(self.latencies)
+
+    @property
+    def errors(self):
+        return sum(count for status, count in self.statuses.items() if not status.startswith('2') and status != 'cache')
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            'calls': self.calls,
+            'cached': self.cached,
+            'errors': self.errors,
+            'statuses': dict(sorted(self.statuses.items())),
+            'retries': self.retries,
+            'throttleWaitSum': self.throttle_wait,
+            'throttleWaitMax': self.throttle_wait_max,
+            'bytes': self.bytes,
+            'entities': self.entities,
+            'latencySum': sum(latencies),
+            'latencyMax': latencies[-1] if latencies else 0.0,
+            'latencyQuantiles': {str(q): quantile(latencies, q) for q in QUANTILES},
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process record of every HTTP call the fetch layer makes.
+
+    `cupmanager.client.HttpClient` calls `record` once per request with
+    the host, query kind (see `request_kind`), latency (wall time of the
+    last attempt from when the rate limiter let it go, including download
+    and decode), body bytes, decoded entity count, final status (HTTP
+    code, "cache" or an exception name), throttle retries and throttle
+    wait (time spent in the rate limiter, 429/503 pauses included).
+    Aggregated per (host, kind); safe to share between threads.
+    """
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, host, kind, latency, size=0, entities=0, status=200, retries=0, throttle_wait=0.0,
+               cached=False):
+        with self._lock:
+            series = self._series.get((host, kind))
+            if series is None:
+                series = self._series[(host, kind)] = _Series()
+            series.add(latency, size, entities, status, retries, throttle_wait, cached)
+
+    def series(self):
+        """{(host, kind): stats} snapshot, sorted by host then kind."""
+        with self._lock:
+            return {key: series.stats() for key, series in sorted(self._series.items())}
+
+    def totals_by_kind(self):
+        """Stats merged across hosts, per query kind."""
+        merged = {}
+        with self._lock:
+            for (_, kind), series in self._series.items():
+                total = merged.setdefault(kind, _Series())
+                total.latencies.extend(series.latencies)
+                for status, count in series.statuses.items():
+                    total.statuses[status] = total.statuses.get(status, 0) + count
+                total.bytes += series.bytes
+                total.entities += series.entities
+                total.retries += series.retries
+                total.throttle_wait += series.throttle_wait
+                total.throttle_wait_max = max(total.throttle_wait_max, series.throttle_wait_max)
+                total.cached += series.cached
+        return {kind: total.stats() for kind, total in sorted(merged.items())}
+
+    def __len__(self):
+        with self._lock:
+            return sum(series.calls for series in self._series.values())
+
+    def summary(self, limit=None):
+        """
+        Text table: one row per host/kind, slowest p95 first, then totals
+        per kind. `limit` caps the number of host rows.
+        """
+        rows = sorted(self.series().items(), key=lambda item: item[1]['latencyQuantiles']['0.95'], reverse=True)
+        if limit:
+            rows = rows[:limit]
+        header = (f"{'host':<40} {'kind':<9} {'calls':>6} {'cache':>6} {'err':>4} {'retry':>5} {'wait s':>7} "
+                  f"{'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'KB':>10} {'entities':>9}")
+        lines = [header]
+
+        def line(host, kind, stats):
+            quantiles = stats['latencyQuantiles']
+            return (f"{host:<40} {kind:<9} {stats['calls']:>6} {stats['cached']:>6} {stats['errors']:>4} {stats['retries']:>5} "
+                    f"{stats['throttleWaitSum']:>7.1f} {quantiles['0.5'] * 1000:>8.0f} {quantiles['0.95'] * 1000:>8.0f} "
+                    f"{stats['latencyMax'] * 1000:>8.0f} {stats['bytes'] / 1024:>10,.0f} {stats['entities']:>9,}")
+
+        for (host, kind), stats in rows:
+            lines.append(line(host, kind, stats))
+        lines.append('')
+        for kind, stats in self.totals_by_kind().items():
+            lines.append(line('(all hosts)', kind, stats))
+        return '\n'.join(lines)
+
+    def to_json(self):
+        return {
+            'series': [dict(host=host, kind=kind, **stats) for (host, kind), stats in self.series().items()],
+            'totals': self.totals_by_kind(),
+        }
+
+    def to_prometheus(self, prefix='cupmanager_fetch'):
+        """Prometheus text exposition format (counters plus a latency summary)."""
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def labels(host, kind, **extra):
+            pairs = dict(host=host, kind=kind, **extra)
+            return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs.items()) + '}'
+
+        series = self.series()
+
+        metric('requests_total', 'counter', 'HTTP calls by host, query kind and final status.')
+        for (host, kind), stats in series.items():
+            for status, count in stats['statuses'].items():
+                lines.append(f"{prefix}_requests_total{labels(host, kind, status=status)} {count}")
+
+        metric('latency_seconds', 'summary',
+               'Wall time per call from its rate-limit token to the decoded body, throttle wait excluded.')
+        for (host, kind), stats in series.items():
+            for q, value in stats['latencyQuantiles'].items():
+                lines.append(f"{prefix}_latency_seconds{labels(host, kind, quantile=q)} {value:.6f}")
+            lines.append(f"{prefix}_latency_seconds_sum{labels(host, kind)} {stats['latencySum']:.6f}")
+            lines.append(f"{prefix}_latency_seconds_count{labels(host, kind)} {stats['calls']}")
+
+        for name, key, help_text in (
+            ('throttle_wait_seconds_total', 'throttleWaitSum', 'Time spent waiting on the rate limiter, 429/503 pauses included.'),
+            ('response_bytes_total', 'bytes', 'Response body bytes received.'),
+            ('entities_total', 'entities', 'results_api response entries (or search listings) decoded.'),
+            ('retries_total', 'retries', 'Retries after HTTP 429/503.'),
+            ('cache_hits_total', 'cached', 'Calls answered from the response cache.'),
+        ):
+            metric(name, 'counter', help_text)
+            for (host, kind), stats in series.items():
+                lines.append(f"{prefix}_{name}{labels(host, kind)} {stats[key]}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write `to_prometheus()` for *.prom / *.txt paths, `to_json()` otherwise."""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(('.prom', '.txt')):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_json(), f, indent=2)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def add_metrics_arguments(parser):
+    """Add the --metrics option shared by the fetch scripts."""
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='print a per-host fetch summary at the end and write the metrics to FILE '
+                             '(Prometheus text for .prom/.txt, JSON otherwise)')
+    return parser
+
+
+def report_metrics(registry, path):
+    """End-of-run output for `--metrics`: the summary table, then the file."""
+    if not path:
+        return
+    print("\n" + "="*80)
+    print("FETCH METRICS")
+    print("="*80 + "\n")
+    print(registry.summary())
+    registry.write(path)
+    print(f"\n✓ Metrics for {len(registry)} calls written to {path}")
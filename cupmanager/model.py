@@ -0,0 +1,197 @@
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cupmanager.parsers import parse_combined_results
+
+# Slotted, de-duplicated form of the realData.json tournament entries.
+# A parsed season as plain dicts repeats every team and club in a fresh
+# `team` dict per result row and copies names into every match; here each
+# Team, Club and Category exists once (see `ModelPool`), strings are
+# interned and `to_dict()` rebuilds the exact realData.json shape.
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True, eq=False)
+class Club:
+    id: str
+    name: str
+
+
+@dataclass(slots=True, eq=False)
+class Team:
+    id: str
+    name: str
+    club: Club
+
+
+@dataclass(slots=True, eq=False)
+class Category:
+    id: str
+    name: str
+
+
+@dataclass(slots=True, frozen=True)
+class MatchScore:
+    """One finals match from a team's side (a `matches` entry); hashable, so the pool can share it."""
+    opponent: str
+    opponent_id: Optional[str]
+    home_goals: int
+    away_goals: int
+    is_home: bool
+    result: str
+    round_name: str
+    penalties: bool
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MatchScore':
+        return cls(
+            _intern(data.get('opponent', '')), _intern(data.get('opponentId')),
+            data.get('homeGoals', 0), data.get('awayGoals', 0), data.get('isHome', False),
+            _intern(data.get('result', '')), _intern(data.get('roundName', '')), data.get('penalties', False),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'opponent': self.opponent,
+            'opponentId': self.opponent_id,
+            'homeGoals': self.home_goals,
+            'awayGoals': self.away_goals,
+            'isHome': self.is_home,
+            'result': self.result,
+            'roundName': self.round_name,
+            'penalties': self.penalties,
+        }
+
+
+@dataclass(slots=True)
+class ResultRow:
+    category: Category
+    stage_type: str
+    rank: Any
+    team: Team
+    matches: Optional[Tuple[MatchScore, ...]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        row = {
+            'categoryId': self.category.id,
+            'categoryName': self.category.name,
+            'stageType': self.stage_type,
+            'rank': self.rank,
+            'team': {
+                'teamId': self.team.id,
+                'teamName': self.team.name,
+                'clubId': self.team.club.id,
+                'clubName': self.team.club.name,
+            },
+        }
+        if self.matches is not None:
+            row['matches'] = [match.to_dict() for match in self.matches]
+        return row
+
+
+@dataclass(slots=True)
+class Tournament:
+    id: str
+    name: str
+    season: str
+    results: List[ResultRow]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The realData.json entry, as `parsers.parse_combined_results` builds it."""
+        return {
+            'tournamentId': self.id,
+            'tournamentName': self.name,
+            'season': self.season,
+            'results': [row.to_dict() for row in self.results],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], pool: Optional['ModelPool'] = None) -> 'Tournament':
+        """Load one realData.json entry."""
+        pool = pool or ModelPool()
+        results = []
+        for row in data.get('results', []):
+            team = row['team']
+            club = pool.club(team['clubId'], team['clubName'])
+            matches = row.get('matches')
+            results.append(ResultRow(
+                pool.category(data['tournamentId'], row['categoryId'], row['categoryName']),
+                _intern(row['stageType']),
+                row['rank'],
+                pool.team(team['teamId'], team['teamName'], club),
+                tuple(pool.match(match) for match in matches) if matches is not None else None,
+            ))
+        return cls(_intern(data['tournamentId']), _intern(data['tournamentName']), _intern(data['season']), results)
+
+
+class ModelPool:
+    """
+    The single instance of each Club, Team, Category and MatchScore in a
+    season. Clubs are keyed by clubId and teams by teamId, both shared
+    across tournaments; categories by (tournamentId, categoryId). A record
+    whose name differs from the pooled one gets its own instance, so
+    `to_dict()` always gives back what was loaded.
+    """
+
+    def __init__(self):
+        self.clubs: Dict[str, Club] = {}
+        self.teams: Dict[str, Team] = {}
+        self.categories: Dict[Tuple[str, str], Category] = {}
+        self._matches: Dict[MatchScore, MatchScore] = {}
+
+    def club(self, club_id: str, name: str) -> Club:
+        club = self.clubs.get(club_id)
+        if club is None or club.name != name:
+            club = Club(_intern(club_id), _intern(name))
+            self.clubs.setdefault(club.id, club)
+        return club
+
+    def team(self, team_id: str, name: str, club: Club) -> Team:
+        team = self.teams.get(team_id)
+        if team is None or team.name != name or team.club is not club:
+            team = Team(_intern(team_id), _intern(name), club)
+            self.teams.setdefault(team.id, team)
+        return team
+
+    def category(self, tournament_id: str, category_id: str, name: str) -> Category:
+        key = (tournament_id, category_id)
+        category = self.categories.get(key)
+        if category is None or category.name != name:
+            category = Category(_intern(category_id), _intern(name))
+            self.categories.setdefault(key, category)
+        return category
+
+    def match(self, data: Dict[str, Any]) -> MatchScore:
+        """A team lists the same match once per result row (e.g. group and cup stage); keep one."""
+        match = MatchScore.from_dict(data)
+        return self._matches.setdefault(match, match)
+
+
+def parse_tournament(payload, tournament_name, tournament_id, pool=None, season='2025', clubs=None):
+    """
+    Parse a combined rankings + finals payload into a `Tournament`.
+
+    The entry is built by `parsers.parse_combined_results` (with the same
+    `clubs` registry) and loaded into the model, so both always give the
+    same rows. Only this one tournament is held as dicts at a time; pass
+    one `pool` for a whole season to share teams and clubs between
+    tournaments.
+    """
+    tournament_data, _ = parse_combined_results(payload, tournament_name, tournament_id, clubs)
+    tournament_data['season'] = season
+    return Tournament.from_dict(tournament_data, pool)
+
+
+def load_season(tournaments: Iterable[Dict[str, Any]], pool: Optional[ModelPool] = None) -> List[Tournament]:
+    """realData.json entries (e.g. `jsonio.load(REAL_DATA_FILE)`) as one pooled season."""
+    pool = pool or ModelPool()
+    return [Tournament.from_dict(data, pool) for data in tournaments]
+
+
+def season_to_dicts(tournaments: Iterable[Tournament]) -> List[Dict[str, Any]]:
+    """The realData.json list for `tournaments`."""
+    return [tournament.to_dict() for tournament in tournaments]
@@ -0,0 +1,269 @@
+from cupmanager import hrefs
+from cupmanager.clubs import club_slug
+from cupmanager.index import ResponseIndex
+
+
+def parse_match_scores(finals_data):
+    """Parse match scores from finals data."""
+    match_scores = {}
+
+    index = ResponseIndex.of(finals_data)
+    if not index.responses:
+        return match_scores
+
+    # Collect MatchResult entities
+    match_results = {}
+    for entity in index.of_type('MatchResult').values():
+        match_id = str(entity.get('id'))
+        match_results[match_id] = {
+            'homeGoals': entity.get('homeGoals', 0),
+            'awayGoals': entity.get('awayGoals', 0),
+            'winner': entity.get('winner', ''),
+            'penalties': entity.get('penalties', False)
+        }
+
+    # Collect Match entities, remembering which match each actor/round href belongs to.
+    # In a combined rankings + finals payload only the listed finals are scored.
+    finals = finals_match_hrefs(index)
+    actor_hrefs = {}
+    round_name_hrefs = {}
+    for key, entity in index.of_type('Match').items():
+        if finals is not None and key not in finals:
+            continue
+        match_id = str(entity.get('id'))
+        match_info = {
+            'matchId': match_id,
+            'homeHref': entity.get('home', {}).get('href', ''),
+            'awayHref': entity.get('away', {}).get('href', ''),
+            'roundNameHref': entity.get('roundName', {}).get('href', '')
+        }
+
+        if match_id in match_results:
+            match_info.update(match_results[match_id])
+
+        match_scores[match_id] = match_info
+        actor_hrefs.setdefault(match_info['homeHref'], []).append(('home', match_info))
+        actor_hrefs.setdefault(match_info['awayHref'], []).append(('away', match_info))
+        round_name_hrefs.setdefault(match_info['roundNameHref'], []).append(match_info)
+
+    # Resolve team names
+    for key, entity in index.of_type('MatchActor').items():
+        linked = actor_hrefs.get(key)
+        if not linked:
+            continue
+
+        team_name = entity.get('name', {}).get('en', '')
+        team_href = entity.get('team', {}).get('href', '')
+        actual_team_id = hrefs.team_id(team_href)
+
+        for side, match_info in linked:
+            match_info[f'{side}Team'] = team_name
+            match_info[f'{side}TeamId'] = actual_team_id
+
+    # Resolve round names
+    for key, entity in index.of_type('Match$RoundName').items():
+        linked = round_name_hrefs.get(key)
+        if not linked:
+            continue
+
+        round_name = entity.get('name', {}).get('en', '')
+        for match_info in linked:
+            match_info['roundName'] = round_name
+
+    return match_scores
+
+
+def finals_match_hrefs(index):
+    """Hrefs listed under `Tournament({id:..})$finals`, or None if the payload has no finals list."""
+    listed = None
+    for key, entries in index.lists.items():
+        if key.startswith('Tournament(') and key.endswith('$finals'):
+            listed = listed or set()
+            listed.update(entry.get('href') for entry in entries if isinstance(entry, dict))
+    return listed
+
+
+def link_scores_to_teams(match_scores):
+    """Build team matches mapping."""
+    team_matches_map = {}
+
+    for match_id, match_info in match_scores.items():
+        if 'homeTeamId' not in match_info or 'awayTeamId' not in match_info:
+            continue
+
+        home_id = match_info['homeTeamId']
+        away_id = match_info['awayTeamId']
+
+        if home_id:
+            if home_id not in team_matches_map:
+                team_matches_map[home_id] = []
+            team_matches_map[home_id].append({
+                'opponent': match_info.get('awayTeam', ''),
+                'opponentId': away_id,
+                'homeGoals': match_info.get('homeGoals', 0),
+                'awayGoals': match_info.get('awayGoals', 0),
+                'isHome': True,
+                'result': 'won' if match_info.get('winner') == 'home' else 'lost',
+                'roundName': match_info.get('roundName', ''),
+                'penalties': match_info.get('penalties', False)
+            })
+
+        if away_id:
+            if away_id not in team_matches_map:
+                team_matches_map[away_id] = []
+            team_matches_map[away_id].append({
+                'opponent': match_info.get('homeTeam', ''),
+                'opponentId': home_id,
+                'homeGoals': match_info.get('homeGoals', 0),
+                'awayGoals': match_info.get('awayGoals', 0),
+                'isHome': False,
+                'result': 'won' if match_info.get('winner') == 'away' else 'lost',
+                'roundName': match_info.get('roundName', ''),
+                'penalties': match_info.get('penalties', False)
+            })
+
+    return team_matches_map
+
+
+def category_names(index):
+    """Map categoryId -> display name for every Category entity."""
+    categories = {}
+    for entity in index.of_type('Category').values():
+        name_field = entity.get('name', 'Unknown')
+        category_name = name_field.get('en', 'Unknown') if isinstance(name_field, dict) else name_field
+        categories[str(entity.get('id'))] = category_name
+    return categories
+
+
+def team_names(index, clubs=None):
+    """
+    Map teamId -> {'teamName', 'clubName'} for every Team entity.
+
+    With `clubs` (a `cupmanager.clubs.ClubRegistry`) each team's NameClub
+    is resolved through the registry and the entry also gets the
+    registry's 'clubId'; 'clubName' is then the club's canonical name
+    rather than the team's club name, which may carry a team suffix.
+    """
+    teams = {}
+    for entity in index.of_type('Team').values():
+        name_obj = entity.get('name', {})
+        if isinstance(name_obj, dict):
+            team_name = name_obj.get('fullName', name_obj.get('en', 'Unknown'))
+            club_name = name_obj.get('clubName', 'Unknown Club')
+        else:
+            team_name = str(name_obj)
+            club_name = 'Unknown Club'
+        team_info = {
+            'teamName': team_name,
+            'clubName': club_name
+        }
+        if clubs is not None:
+            name_club = index.get(entity.get('club', {}).get('href', ''))
+            if name_club and name_club.get('name'):
+                team_info['clubId'], team_info['clubName'] = clubs.resolve(name_club.get('id'), name_club['name'])
+            else:
+                team_info['clubId'], team_info['clubName'] = clubs.resolve(None, club_name)
+        teams[str(entity.get('id'))] = team_info
+    return teams
+
+
+def stage_rankings_by_category(index):
+    """Map categoryId -> the non-empty rankings list of its stage."""
+    stages_with_rankings = {}
+    for key, rankings in index.stage_rankings.items():
+        category_id = hrefs.category_id(key)
+        if category_id and rankings:
+            stages_with_rankings[category_id] = rankings
+    return stages_with_rankings
+
+
+def stage_types_by_category(index, cup_markers=('Cup',)):
+    """Map categoryId -> 'CUP_FINAL' / 'PLATE_FINAL' from Stage names."""
+    stage_types = {}
+    for key, entity in index.of_type('Stage').items():
+        if not key.startswith('Stage({categoryId:'):
+            continue
+        category_id = hrefs.category_id(key)
+        if category_id:
+            stage_name = entity.get('name', '')
+            if any(marker in stage_name for marker in cup_markers):
+                stage_types[category_id] = 'CUP_FINAL'
+            elif 'Plate' in stage_name:
+                stage_types[category_id] = 'PLATE_FINAL'
+            else:
+                stage_types[category_id] = 'CUP_FINAL'
+    return stage_types
+
+
+def build_result_entry(category_id, category_name, stage_type, rank, team_id, team_info, team_matches_map):
+    """Build one realData.json result row, attaching match scores if known."""
+    result_entry = {
+        "categoryId": category_id,
+        "categoryName": category_name,
+        "stageType": stage_type,
+        "rank": rank,
+        "team": {
+            "teamId": team_id,
+            "teamName": team_info['teamName'],
+            "clubId": team_info.get('clubId') or club_slug(team_info['clubName']),
+            "clubName": team_info['clubName']
+        }
+    }
+
+    # Add match scores if available
+    if team_matches_map and team_id in team_matches_map:
+        result_entry['matches'] = team_matches_map[team_id]
+
+    return result_entry
+
+
+def parse_tournament_data(rankings_data, team_matches_map, tournament_name, tournament_id, clubs=None):
+    """Parse tournament rankings and add match scores. See `team_names` for `clubs`."""
+    tournament_data = {
+        "tournamentId": tournament_id,
+        "tournamentName": tournament_name,
+        "season": "2025",
+        "results": []
+    }
+
+    index = ResponseIndex.of(rankings_data)
+    categories = category_names(index)
+    stages_with_rankings = stage_rankings_by_category(index)
+    stage_types = stage_types_by_category(index)
+    teams = team_names(index, clubs)
+
+    # Process rankings
+    for category_id, rankings in stages_with_rankings.items():
+        category_name = categories.get(category_id, f"Category {category_id}")
+        stage_type = stage_types.get(category_id, 'CUP_FINAL')
+
+        for ranking in rankings:
+            if '__typename' in ranking and 'StageRankingPlace' in ranking['__typename']:
+                rank = ranking.get('rank')
+                team_href = ranking.get('team', {}).get('href', '')
+
+                team_id = hrefs.team_id(team_href)
+                if team_id:
+                    team_info = teams.get(team_id, {
+                        'teamName': f'Team {team_id}',
+                        'clubName': 'Unknown Club'
+                    })
+
+                    tournament_data['results'].append(build_result_entry(
+                        category_id, category_name, stage_type, rank,
+                        team_id, team_info, team_matches_map
+                    ))
+
+    return tournament_data
+
+
+def parse_combined_results(payload, tournament_name, tournament_id, clubs=None):
+    """
+    Parse one combined rankings + finals payload (see `queries.combined_call`)
+    into a realData.json tournament entry. Returns (tournament_data, match_scores).
+    With a `clubs` registry, clubIds come from the registry (see `team_names`).
+    """
+    index = ResponseIndex.of(payload)
+    match_scores = parse_match_scores(index)
+    team_matches_map = link_scores_to_teams(match_scores)
+    return parse_tournament_data(index, team_matches_map, tournament_name, tournament_id, clubs), match_scores
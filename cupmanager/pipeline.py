@@ -0,0 +1,167 @@
+import queue
+import threading
+import time
+
+from cupmanager.pool import HostSlots
+
+DEFAULT_QUEUE_SIZE = 16
+
+_DONE = object()
+
+
+class Stage:
+    """
+    One pipeline step: `func(item)` runs on `workers` threads.
+
+    `func` returns the item for the next stage, or None to drop it (e.g. no
+    tournament ID). With `url_of`, each call holds that host's slot so at
+    most `per_host` calls hit one organiser site at a time.
+    """
+
+    def __init__(self, name, func, workers=1, url_of=None, per_host=1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.url_of = url_of
+        self.slots = HostSlots(per_host) if url_of else None
+        self.done = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy = 0
+        self._lock = threading.Lock()
+
+    def call(self, item):
+        with self._lock:
+            self.busy += 1
+        try:
+            if self.slots:
+                with self.slots.slot(self.url_of(item)):
+                    return self.func(item)
+            return self.func(item)
+        finally:
+            with self._lock:
+                self.busy -= 1
+
+    def count(self, result, failed=False):
+        with self._lock:
+            if failed:
+                self.errors += 1
+            elif result is None:
+                self.dropped += 1
+            else:
+                self.done += 1
+
+
+class Pipeline:
+    """
+    Run `source` items through `stages` with bounded queues in between.
+
+    A thread drains `source` (any iterable, e.g. `discovery.discover`) into
+    the first queue; every stage reads from its input queue and writes to
+    the next one, so discovery, resolution, fetching and parsing overlap and
+    at most `queue_size` items wait between two stages. `run(sink)` calls
+    `sink(item)` in the calling thread for each item leaving the last stage,
+    in completion order.
+    """
+
+    def __init__(self, source, stages, queue_size=DEFAULT_QUEUE_SIZE):
+        self.source = source
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+        self.produced = 0
+        self.written = 0
+        self.started = None
+        self.source_error = None
+
+    def _feed(self):
+        try:
+            for item in self.source:
+                self.produced += 1
+                self.queues[0].put(item)
+        except Exception as e:
+            self.source_error = e
+        finally:
+            for _ in range(self.stages[0].workers):
+                self.queues[0].put(_DONE)
+
+    def _work(self, stage, inbox, outbox, remaining, readers):
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            try:
+                result = stage.call(item)
+            except Exception as e:
+                print(f"   ✗ {stage.name}: {str(e)[:80]}")
+                stage.count(None, failed=True)
+                continue
+            stage.count(result)
+            if result is not None:
+                outbox.put(result)
+
+        # The last worker of a stage tells every reader of the next queue
+        # that no more items are coming
+        with remaining['lock']:
+            remaining['count'] -= 1
+            last = remaining['count'] == 0
+        if last:
+            for _ in range(readers):
+                outbox.put(_DONE)
+
+    def run(self, sink):
+        self.started = time.time()
+        threads = [threading.Thread(target=self._feed, name='pipeline-source', daemon=True)]
+        for position, stage in enumerate(self.stages):
+            remaining = {'count': stage.workers, 'lock': threading.Lock()}
+            readers = self.stages[position + 1].workers if position + 1 < len(self.stages) else 1
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, self.queues[position], self.queues[position + 1], remaining, readers),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                ))
+        for thread in threads:
+            thread.start()
+
+        output = self.queues[-1]
+        while True:
+            item = output.get()
+            if item is _DONE:
+                break
+            self.written += 1
+            sink(item)
+
+        for thread in threads:
+            thread.join()
+        if self.source_error is not None:
+            raise self.source_error
+
+    def progress(self):
+        """One-line per-stage status, e.g. `found 40 | resolve 31 (2 busy) | ...`."""
+        parts = [f"found {self.produced}"]
+        for position, stage in enumerate(self.stages):
+            status = f"{stage.name} {stage.done}"
+            if stage.dropped or stage.errors:
+                status += f"/-{stage.dropped + stage.errors}"
+            if stage.busy:
+                status += f" ({stage.busy} busy)"
+            waiting = self.queues[position].qsize()
+            if waiting:
+                status += f" [{waiting} queued]"
+            parts.append(status)
+        parts.append(f"written {self.written}")
+        if self.started:
+            parts.append(f"{time.time() - self.started:.0f}s")
+        return ' | '.join(parts)
+
+
+def add_pipeline_arguments(parser):
+    """Add per-stage worker counts and the queue bound for pipelined crawls."""
+    parser.add_argument('--resolve-workers', type=int, default=2,
+                        help='threads resolving website URLs to tournament IDs')
+    parser.add_argument('--parse-workers', type=int, default=1,
+                        help='threads parsing fetched payloads')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='max items waiting between two pipeline stages')
+    return parser
@@ -0,0 +1,90 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Global cap on tournaments processed at once, and how many of those may
+# target the same organiser host. One chain per host keeps us polite while
+# still overlapping work across different cupmanager sites.
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 1
+
+
+def host_of(url):
+    """Host (netloc) part of a tournament website URL."""
+    return urlparse(url).netloc
+
+
+class HostSlots:
+    """Per-host semaphores limiting concurrent work against one organiser site."""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST):
+        self.per_host = per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url):
+        host = host_of(url)
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host)
+                self._semaphores[host] = semaphore
+        with semaphore:
+            yield
+
+
+def add_pool_arguments(parser):
+    """Add the --workers / --per-host options shared by the fetch scripts."""
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f'tournaments processed concurrently (1 = serial, suggested {DEFAULT_WORKERS})')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST,
+                        help='max concurrent tournaments against the same organiser host')
+    return parser
+
+
+def run_ordered(func, items, url_of, workers=1, per_host=DEFAULT_PER_HOST, on_done=None):
+    """
+    Run `func(item)` for every item and return the results in input order.
+
+    With `workers > 1` items run on a bounded thread pool, each holding its
+    host's slot (see `HostSlots`) for the whole call. `items` may be a
+    generator (e.g. `discovery.discover`): each item is submitted as soon as
+    it is produced, so work starts before the input is exhausted.
+    `on_done(position, item, result)` is called from the calling thread as
+    each item finishes, in completion order, so progress can be printed
+    while the pool works.
+    """
+    if workers <= 1:
+        results = []
+        for position, item in enumerate(items):
+            results.append(func(item))
+            if on_done:
+                on_done(position, item, results[position])
+        return results
+
+    slots = HostSlots(per_host)
+    seen = []
+    results = {}
+    pending = {}
+
+    def call(item):
+        with slots.slot(url_of(item)):
+            return func(item)
+
+    def report(futures):
+        for future in futures:
+            position = pending.pop(future)
+            results[position] = future.result()
+            if on_done:
+                on_done(position, seen[position], results[position])
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in items:
+            pending[executor.submit(call, item)] = len(seen)
+            seen.append(item)
+            report([future for future in pending if future.done()])
+        report(as_completed(list(pending)))
+
+    return [results[position] for position in range(len(seen))]
@@ -0,0 +1,260 @@
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_PROFILE_DIR = 'profiles'
+MERGED_PROFILE = 'all.prof'
+MERGED_STACKS = 'stacks.collapsed'
+
+# 500 Hz: a typical tournament parses in 50-500 ms, so even small ones
+# collect enough samples to show where the time went
+DEFAULT_INTERVAL = 0.002
+
+MODES = ('both', 'cprofile', 'sample')
+
+_UNSAFE_LABEL = re.compile(r'[^\w.-]+')
+
+# Held while a cProfile.Profile is enabled. Python 3.12+ allows only one
+# active profiler per process ("Another profiling tool is already active")
+# and its events are not per thread, so concurrent stages take turns.
+_CPROFILE_LOCK = threading.Lock()
+
+
+def _file_label(label):
+    return _UNSAFE_LABEL.sub('_', str(label)).strip('_') or 'unknown'
+
+
+class StageProfiler:
+    """
+    Opt-in profiling of pipeline stages, per tournament.
+
+    `wrap(stage, func, label_of)` returns `func` instrumented so that every
+    call is attributed to (`label_of(*args)`, `stage`), e.g. a tournamentId
+    and `parse`. Two profilers can run on each call:
+
+    - cProfile (`mode` 'cprofile' or 'both'): deterministic call counts and
+      times, written per tournament and stage as `<label>.<stage>.prof` and
+      merged into `all.prof` (open with `python -m pstats` or snakeviz).
+    - a sampler (`mode` 'sample' or 'both'): one background thread reads
+      the stack of every thread inside a wrapped call every `interval`
+      seconds. Stacks are written in collapsed format (`stage;frame;frame N`)
+      per tournament as `<label>.collapsed` and merged across tournaments
+      into `stacks.collapsed`, ready for flamegraph.pl or speedscope.
+
+    Samples are wall-clock, so a fetch stage also shows time spent waiting
+    on the network; with 'both' they include cProfile's own overhead, use
+    'sample' alone for undistorted flamegraphs.
+
+    Only one call runs under cProfile at a time. With 'both', a call that
+    starts while another is being profiled is only sampled (counted in
+    `unprofiled`); with 'cprofile' it waits, which serializes the stages.
+    Safe to share between threads; call `close()` to write the files.
+    """
+
+    def __init__(self, directory=DEFAULT_PROFILE_DIR, mode='both', interval=DEFAULT_INTERVAL):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode!r} (expected one of {', '.join(MODES)})")
+        self.directory = directory
+        self.mode = mode
+        self.interval = interval
+        self.calls = Counter()
+        self.unprofiled = Counter()
+        self._stats = {}
+        self._samples = Counter()
+        self._active = {}
+        self._frame_names = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        if mode in ('both', 'sample'):
+            self._sampler = threading.Thread(target=self._sample_loop, name='stage-profiler', daemon=True)
+            self._sampler.start()
+
+    def wrap(self, stage, func, label_of):
+        """`func` profiled as `stage`; `label_of` gets the same arguments and names the tournament."""
+        def profiled(*args, **kwargs):
+            label = _file_label(label_of(*args, **kwargs))
+            profile = None
+            if self.mode == 'cprofile':
+                _CPROFILE_LOCK.acquire()
+                profile = cProfile.Profile()
+            elif self.mode == 'both' and _CPROFILE_LOCK.acquire(blocking=False):
+                profile = cProfile.Profile()
+            with self._lock:
+                self.calls[(label, stage)] += 1
+                if profile is None and self.mode == 'both':
+                    self.unprofiled[(label, stage)] += 1
+                self._active[threading.get_ident()] = (label, stage, sys._getframe())
+            try:
+                if profile is None:
+                    return func(*args, **kwargs)
+                try:
+                    profile.enable()
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        profile.disable()
+                finally:
+                    _CPROFILE_LOCK.release()
+            finally:
+                with self._lock:
+                    del self._active[threading.get_ident()]
+                    if profile is not None:
+                        stats = self._stats.get((label, stage))
+                        if stats is None:
+                            self._stats[(label, stage)] = pstats.Stats(profile)
+                        else:
+                            stats.add(profile)
+
+        profiled.__name__ = getattr(func, '__name__', stage)
+        profiled.__doc__ = func.__doc__
+        return profiled
+
+    def instrument(self, stages, label_of):
+        """Wrap every `cupmanager.pipeline.Stage` in place; `label_of(item)` names the tournament."""
+        for stage in stages:
+            stage.func = self.wrap(stage.name, stage.func, label_of)
+        return stages
+
+    def _frame_name(self, code):
+        name = self._frame_names.get(code)
+        if name is None:
+            path = code.co_filename
+            if path.startswith(os.getcwd() + os.sep):
+                path = os.path.relpath(path)
+            else:
+                path = '/'.join(path.replace(os.sep, '/').split('/')[-2:])
+            qualname = getattr(code, 'co_qualname', code.co_name)
+            name = self._frame_names[code] = f"{qualname} ({path}:{code.co_firstlineno})".replace(';', ':')
+        return name
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, (label, stage, root) in self._active.items():
+                    frame = frames.get(ident)
+                    stack = []
+                    while frame is not None and frame is not root:
+                        stack.append(self._frame_name(frame.f_code))
+                        frame = frame.f_back
+                    if frame is None:
+                        # sampled just before or after the wrapped call
+                        continue
+                    stack.append(stage)
+                    self._samples[(label, ';'.join(reversed(stack)))] += 1
+            del frames
+
+    def stage_samples(self):
+        """{stage: samples} across all tournaments."""
+        totals = Counter()
+        for (_, stack), count in self._samples.items():
+            totals[stack.split(';', 1)[0]] += count
+        return totals
+
+    def top_frames(self, limit=15):
+        """[(frame, self samples)] for the frames most often on top of the stack."""
+        leaves = Counter()
+        for (_, stack), count in self._samples.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        return leaves.most_common(limit)
+
+    def close(self):
+        """Stop sampling and write the per-tournament and merged files; returns the paths written."""
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+        os.makedirs(self.directory, exist_ok=True)
+        written = []
+
+        with self._lock:
+            merged = None
+            for (label, stage), stats in sorted(self._stats.items()):
+                path = os.path.join(self.directory, f"{label}.{stage}.prof")
+                stats.dump_stats(path)
+                written.append(path)
+                if merged is None:
+                    merged = pstats.Stats(path)
+                else:
+                    merged.add(path)
+            if merged is not None:
+                path = os.path.join(self.directory, MERGED_PROFILE)
+                merged.dump_stats(path)
+                written.append(path)
+
+            if self._sampler is not None:
+                per_label = {}
+                merged_stacks = Counter()
+                for (label, stack), count in self._samples.items():
+                    per_label.setdefault(label, Counter())[stack] += count
+                    merged_stacks[stack] += count
+                for label, stacks in sorted(per_label.items()):
+                    written.append(self._write_collapsed(f"{label}.collapsed", stacks))
+                written.append(self._write_collapsed(MERGED_STACKS, merged_stacks))
+        return written
+
+    def _write_collapsed(self, name, stacks):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+def add_profile_arguments(parser):
+    """Add the --profile options shared by the pipeline scripts."""
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_PROFILE_DIR, default=None, metavar='DIR',
+                        help=f'profile each stage per tournament and write the profiles to DIR (default: {DEFAULT_PROFILE_DIR})')
+    parser.add_argument('--profile-mode', choices=MODES, default='both',
+                        help='cProfile (.prof files), stack sampling (collapsed stacks for flamegraphs) or both')
+    parser.add_argument('--profile-interval', type=float, default=DEFAULT_INTERVAL * 1000, metavar='MS',
+                        help='sampling interval in milliseconds')
+    return parser
+
+
+def profiler_from_args(args):
+    if not args.profile:
+        return None
+    return StageProfiler(args.profile, mode=args.profile_mode, interval=args.profile_interval / 1000)
+
+
+def report_profile(profiler, limit=15):
+    """End-of-run output for `--profile`: write the files, then a short summary."""
+    if profiler is None:
+        return
+    started = time.perf_counter()
+    written = profiler.close()
+
+    print("\n" + "="*80)
+    print("PROFILE")
+    print("="*80 + "\n")
+
+    stage_samples = profiler.stage_samples()
+    total = sum(stage_samples.values())
+    if total:
+        print(f"Samples per stage ({profiler.interval * 1000:g} ms interval):")
+        for stage, count in stage_samples.most_common():
+            print(f"  {stage:<12} {count:>8,} {count / total:>7.1%}")
+        print(f"\nTop frames (self samples):")
+        for frame, count in profiler.top_frames(limit):
+            print(f"  {count:>8,} {count / total:>7.1%}  {frame}")
+
+    merged = os.path.join(profiler.directory, MERGED_PROFILE)
+    if merged in written:
+        print(f"\nTop functions by own time (cProfile, all tournaments):")
+        pstats.Stats(merged, stream=sys.stdout).sort_stats('tottime').print_stats(limit)
+    unprofiled = sum(profiler.unprofiled.values())
+    if unprofiled:
+        print(f"⚠ {unprofiled:,} of {sum(profiler.calls.values()):,} calls overlapped a profiled call and were "
+              f"only sampled (use --profile-mode cprofile to profile them all, one at a time)")
+
+    tournaments = len({label for label, _ in profiler.calls})
+    print(f"✓ {len(written)} profile files for {tournaments} tournaments written to {profiler.directory} "
+          f"({time.perf_counter() - started:.1f}s)")
+    if profiler.mode != 'cprofile':
+        print(f"  Flamegraph: flamegraph.pl {os.path.join(profiler.directory, MERGED_STACKS)} > flame.svg")
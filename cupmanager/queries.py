@@ -0,0 +1,233 @@
+from urllib.parse import urlparse
+
+from cupmanager import client
+from cupmanager.cache import cache_key
+
+# A selection is written as the set of paths the parsers read, one per
+# line of interest, relative to `Tournament({id:..})`:
+#   "finals[].(Match).home"   ->  finals:[{... on Match:{home:{}}}]
+# `name[]` selects a list, `(Type)` an inline fragment; every other segment
+# selects a linked entity. `selection()` merges the paths into the
+# results_api call syntax, keeping first-seen order.
+
+# What the fetch scripts have always requested.
+FULL_RANKINGS_PATHS = (
+    "lotCategories[].stages[].rankings[].(Stage$StageRankingPlace_ConferencePlace).conference.matches[]",
+    "lotCategories[].stages[].rankings[].(Stage$StageRankingPlace_MatchStatus).match.arena",
+    "lotCategories[].stages[].rankings[].(Stage$StageRankingPlace_MatchStatus).match.away.team.club.nation",
+    "lotCategories[].stages[].rankings[].(Stage$StageRankingPlace_MatchStatus).match.home.team.club.nation",
+    "lotCategories[].stages[].rankings[].(Stage$StageRankingPlace_MatchStatus).match.roundName",
+    "lotCategories[].stages[].rankings[].team.club.nation",
+)
+FULL_FINALS_PATHS = (
+    "finals[].(Match).arena",
+    "finals[].(Match).away.team.club.nation",
+    "finals[].(Match).division.category",
+    "finals[].(Match).division.stage",
+    "finals[].(Match).home.team.club.nation",
+    "finals[].(Match).protests[]",
+    "finals[].(Match).result",
+    "finals[].(Match).roundName",
+    "finals[].(Match).stage",
+    "finals[].(Match).video",
+)
+
+# Only what parsers.py, add-tss-tournament.py and parse-api-results.py read:
+# Category / Stage names, ranking places with their Team and its NameClub
+# (MatchStatus places via the match's home/away MatchActor; the club
+# registry resolves clubs by NameClub id), and for finals the MatchActor
+# names, MatchResult and round name. Arena, video, protests, division and
+# nation are never used.
+MINIMAL_RANKINGS_PATHS = (
+    "lotCategories[].stages[].rankings[].(Stage$StageRankingPlace_MatchStatus).match.away.team.club",
+    "lotCategories[].stages[].rankings[].(Stage$StageRankingPlace_MatchStatus).match.home.team.club",
+    "lotCategories[].stages[].rankings[].team.club",
+)
+MINIMAL_FINALS_PATHS = (
+    "finals[].(Match).away",
+    "finals[].(Match).home",
+    "finals[].(Match).result",
+    "finals[].(Match).roundName",
+)
+
+
+def selection_tree(paths):
+    """Merge dotted paths into nested {segment: subtree} dicts (insertion ordered)."""
+    tree = {}
+    for path in paths:
+        node = tree
+        for segment in path.split('.'):
+            node = node.setdefault(segment, {})
+    return tree
+
+
+def render(tree):
+    """results_api syntax for a selection tree, without the outer braces."""
+    fields = []
+    for segment, children in tree.items():
+        body = '{' + render(children) + '}'
+        if segment.startswith('('):
+            fields.append(f"... on {segment[1:-1]}:{body}")
+        elif segment.endswith('[]'):
+            fields.append(f"{segment[:-2]}:[{body}]")
+        else:
+            fields.append(f"{segment}:{body}")
+    return ','.join(fields)
+
+
+def selection(paths):
+    return render(selection_tree(paths))
+
+
+def parse_selection(call):
+    """
+    Selection tree of a `Tournament({id:..}){...}` call string (the inverse
+    of `render`), or None if `call` is not one.
+    """
+    head, _, body = call.partition('){')
+    if not head.startswith('Tournament({') or not body.endswith('}'):
+        return None
+    try:
+        tree, end = _parse_fields(body, 0)
+    except (ValueError, IndexError):
+        return None
+    return tree if end == len(body) - 1 else None
+
+
+def _parse_fields(text, pos):
+    """Parse `field:{...},...` from `pos` up to the closing brace; returns (tree, its position)."""
+    tree = {}
+    while text[pos] != '}':
+        colon = text.index(':', pos)
+        name = text[pos:colon]
+        pos = colon + 1
+        is_list = text[pos] == '['
+        if name.startswith('... on '):
+            segment = f"({name[len('... on '):]})"
+        else:
+            segment = name + '[]' if is_list else name
+        pos += is_list
+        if text[pos] != '{':
+            raise ValueError(f"expected '{{' at {pos}")
+        tree[segment], pos = _parse_fields(text, pos + 1)
+        pos += 1
+        if is_list:
+            if text[pos] != ']':
+                raise ValueError(f"expected ']' at {pos}")
+            pos += 1
+        if text[pos] == ',':
+            pos += 1
+    return tree, pos
+
+
+def project(payload, tree):
+    """
+    The part of a captured payload results_api returns for selection `tree`:
+    the response entries reachable from the Tournament entity along it.
+    """
+    responses = payload['responses']
+    kept = {}
+
+    def follow(value, tree):
+        if isinstance(value, dict) and 'href' in value and len(value) == 1:
+            entry = responses.get(value['href'])
+            if entry is None:
+                return
+            kept[value['href']] = entry
+            value = entry.get('entity')
+        if isinstance(value, list):
+            for item in value:
+                follow(item, tree)
+        elif isinstance(value, dict):
+            select(value, tree)
+
+    def select(entity, tree):
+        for segment, children in tree.items():
+            if segment.startswith('('):
+                if entity.get('__typename') == segment[1:-1]:
+                    select(entity, children)
+                continue
+            field = segment[:-2] if segment.endswith('[]') else segment
+            if field in entity:
+                follow(entity[field], children)
+
+    for key, entry in responses.items():
+        if key.startswith('Tournament({id:') and '$' not in key:
+            kept[key] = entry
+            select(entry['entity'], tree)
+
+    projected = dict(payload)
+    projected['responses'] = {key: value for key, value in responses.items() if key in kept}
+    return projected
+
+
+RANKINGS_SELECTION = selection(FULL_RANKINGS_PATHS)
+FINALS_SELECTION = selection(FULL_FINALS_PATHS)
+MINIMAL_RANKINGS_SELECTION = selection(MINIMAL_RANKINGS_PATHS)
+MINIMAL_FINALS_SELECTION = selection(MINIMAL_FINALS_PATHS)
+
+
+def tournament_call(tournament_id, *selections):
+    """`Tournament({id:..}){sel1,sel2,...}` call string."""
+    return f"Tournament({{id:{tournament_id}}}){{{','.join(selections)}}}"
+
+
+def rankings_call(tournament_id, minimal=True):
+    return tournament_call(tournament_id, MINIMAL_RANKINGS_SELECTION if minimal else RANKINGS_SELECTION)
+
+
+def finals_call(tournament_id, minimal=True):
+    return tournament_call(tournament_id, MINIMAL_FINALS_SELECTION if minimal else FINALS_SELECTION)
+
+
+def combined_call(tournament_id, minimal=True):
+    """
+    Rankings and finals (with results) in one results_api call.
+
+    lotCategories comes first so its entities are returned in the same
+    order as from `rankings_call`; `stage_types_by_category` depends on
+    the order of the Stage entities.
+    """
+    if minimal:
+        return tournament_call(tournament_id, MINIMAL_RANKINGS_SELECTION, MINIMAL_FINALS_SELECTION)
+    return tournament_call(tournament_id, RANKINGS_SELECTION, FINALS_SELECTION)
+
+
+def results_api_url(website_url):
+    parsed = urlparse(website_url)
+    return f"{parsed.scheme}://{parsed.netloc}/rest/results_api/call"
+
+
+def call_params(tournament_id, call):
+    return {
+        'call': call,
+        'lang': 'en',
+        'tournamentId': tournament_id
+    }
+
+
+def combined_cache_key(website_url, tournament_id):
+    """The response cache key `fetch_combined` stores its payload under."""
+    return cache_key(results_api_url(website_url), call_params(tournament_id, combined_call(tournament_id)))
+
+
+def fetch_call(website_url, tournament_id, call, timeout=30, on_entry=None):
+    """Run a Tournament call against the site's results_api; None on any error."""
+    try:
+        return client.get_json(results_api_url(website_url), params=call_params(tournament_id, call),
+                               timeout=timeout, on_entry=on_entry)
+    except Exception:
+        return None
+
+
+def fetch_rankings(website_url, tournament_id, timeout=30):
+    return fetch_call(website_url, tournament_id, rankings_call(tournament_id), timeout=timeout)
+
+
+def fetch_finals(website_url, tournament_id, timeout=30):
+    return fetch_call(website_url, tournament_id, finals_call(tournament_id), timeout=timeout)
+
+
+def fetch_combined(website_url, tournament_id, timeout=30, on_entry=None):
+    """Rankings + finals payload for one tournament in a single round-trip."""
+    return fetch_call(website_url, tournament_id, combined_call(tournament_id), timeout=timeout, on_entry=on_entry)
@@ -0,0 +1,149 @@
+import argparse
+import threading
+import time
+from urllib.parse import urlparse
+
+# Steady-state requests/sec and burst allowed against one organiser host.
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+
+# Adaptive backoff on HTTP 429/503: the host's rate is multiplied by
+# BACKOFF_FACTOR (never below MIN_RATE) and the host is paused for
+# Retry-After seconds, or DEFAULT_PAUSE if the server didn't say. Each
+# successful response then recovers RECOVERY_STEP of the configured rate.
+THROTTLE_STATUSES = (429, 503)
+BACKOFF_FACTOR = 0.5
+MIN_RATE = 0.1
+DEFAULT_PAUSE = 5.0
+RECOVERY_STEP = 0.1
+
+
+def check_limits(rate, burst):
+    """Raise ValueError unless `rate` > 0 requests/sec and `burst` >= 1."""
+    if not rate > 0:
+        raise ValueError(f"Rate must be above 0 requests/sec, got {rate!r}")
+    if not burst >= 1:
+        raise ValueError(f"Burst must be at least 1 request, got {burst!r}")
+
+
+class TokenBucket:
+    """Token bucket for a single host. Thread-safe."""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        check_limits(rate, burst)
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.paused_until - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, retry_after=None):
+        """Slow down after a 429/503 and pause until the server's Retry-After."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(MIN_RATE, self.rate * BACKOFF_FACTOR)
+            self.tokens = min(self.tokens, 0.0)
+            pause = DEFAULT_PAUSE if retry_after is None else retry_after
+            self.paused_until = max(self.paused_until, now + pause)
+
+    def reward(self):
+        """Creep back towards the configured rate after a successful response."""
+        with self._lock:
+            if self.rate < self.base_rate:
+                now = time.monotonic()
+                self._refill(now)
+                self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+
+
+class HostRateLimiter:
+    """
+    Token buckets keyed by `urlparse(url).netloc`.
+
+    Different organiser sites are limited independently, so
+    tssfootballtournament.cupmanager.net and pinescup.com.au can be hit at
+    the same time while each one only sees `rate` requests/sec. `overrides`
+    maps a host to its own `(rate, burst)`.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, overrides=None):
+        check_limits(rate, burst)
+        for host_rate, host_burst in (overrides or {}).values():
+            check_limits(host_rate, host_burst)
+        self.rate = rate
+        self.burst = burst
+        self.overrides = dict(overrides or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.overrides.get(host, (self.rate, self.burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url):
+        self.bucket(url).acquire()
+
+    def penalize(self, url, retry_after=None):
+        self.bucket(url).penalize(retry_after)
+
+    def reward(self, url):
+        self.bucket(url).reward()
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header, or None if absent / not in seconds form."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def _rate(value):
+    rate = float(value)
+    if not rate > 0:
+        raise argparse.ArgumentTypeError(f"must be above 0, got {value}")
+    return rate
+
+
+def _burst(value):
+    burst = int(value)
+    if burst < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return burst
+
+
+def add_rate_limit_arguments(parser):
+    """Add the --rate / --burst options shared by the fetch scripts."""
+    parser.add_argument('--rate', type=_rate, default=DEFAULT_RATE,
+                        help='requests per second allowed against each organiser host')
+    parser.add_argument('--burst', type=_burst, default=DEFAULT_BURST,
+                        help='requests allowed back-to-back against one host before throttling')
+    return parser
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from cupmanager import jsonio
+
+DEFAULT_STORE = '.cache/tournament-id-resolver.json'
+MAPPING_FILE = 'tournament-ids-mapping.json'
+
+# Seconds before a site that returned no tournament ID is asked again.
+NEGATIVE_TTL = 7 * 24 * 60 * 60
+
+
+def site_key(website_url):
+    """Resolution key for a website URL. The Me endpoint only depends on the host."""
+    return urlparse(website_url).netloc.lower()
+
+
+class TournamentIdResolver:
+    """
+    Persistent website URL -> tournament ID store in front of the Me API.
+
+    Known IDs come from `store_file` (seeded from tournament-ids-mapping.json)
+    and are used without any network call. The Me lookup only runs on a
+    miss, when `refresh=True`, or when a cached negative result has expired.
+    """
+
+    def __init__(self, store_file=DEFAULT_STORE, mapping_file=MAPPING_FILE,
+                 negative_ttl=NEGATIVE_TTL, refresh=False):
+        self.store_file = store_file
+        self.negative_ttl = negative_ttl
+        self.refresh = refresh
+        self.entries = {}
+        self.lookups = 0
+        self._lock = threading.Lock()
+
+        for name, info in _load(mapping_file).items():
+            if info.get('website_url') and info.get('tournament_id'):
+                self.entries[site_key(info['website_url'])] = {
+                    'tournamentId': str(info['tournament_id']),
+                    'name': name,
+                    'source': 'mapping',
+                }
+        self.entries.update(_load(store_file))
+
+    def cached(self, website_url):
+        """(hit, tournament_id) from the store, without calling the Me API."""
+        entry = self.entries.get(site_key(website_url))
+        if entry is None or self.refresh:
+            return False, None
+        if entry.get('tournamentId'):
+            return True, entry['tournamentId']
+        if entry.get('expiresAt', 0) > time.time():
+            return True, None
+        return False, None
+
+    def resolve(self, website_url, lookup):
+        """Tournament ID for `website_url`, calling `lookup(website_url)` only on a miss."""
+        hit, tournament_id = self.cached(website_url)
+        if hit:
+            return tournament_id
+
+        tournament_id = lookup(website_url)
+        now = time.time()
+        if tournament_id:
+            entry = {'tournamentId': str(tournament_id), 'resolvedAt': now, 'source': 'me'}
+        else:
+            entry = {'tournamentId': None, 'resolvedAt': now, 'expiresAt': now + self.negative_ttl, 'source': 'me'}
+
+        with self._lock:
+            self.lookups += 1
+            self.entries[site_key(website_url)] = entry
+            self._save()
+        return entry['tournamentId']
+
+    def _save(self):
+        directory = os.path.dirname(self.store_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        jsonio.dump(self.entries, self.store_file, pretty=True, sort_keys=True)
+
+
+def add_resolver_arguments(parser):
+    """Add the --refresh-ids / --resolver-store options for scripts that resolve tournament IDs."""
+    parser.add_argument('--refresh-ids', action='store_true',
+                        help='ignore stored website -> tournament ID resolutions and ask the Me API again')
+    parser.add_argument('--resolver-store', default=DEFAULT_STORE, metavar='FILE',
+                        help='website -> tournament ID store')
+    return parser
+
+
+def _load(path):
+    try:
+        return jsonio.load(path)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,459 @@
+import argparse
+import copy
+import json
+import random
+import signal
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cupmanager import jsonio
+from cupmanager.archive import PayloadArchive, payload_kind, payload_tournament_id
+from cupmanager.cache import query_kind
+from cupmanager.queries import parse_selection, project
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Captured payloads served by default, relative to the repo root.
+DEFAULT_PAYLOADS = (
+    'sample-results-reponse.json',
+    'finals-endpoint-response.json',
+    'debug-tss-tournament.json',
+    'tournament-with-scores.json',
+)
+DEFAULT_SEARCH_FILE = 'sample-tournament-list-reponse.json'
+DEFAULT_ME_FILE = 'tournament-reponse.json'
+
+# Where the printed crawl command keeps its output and crawl state.
+STANDIN_STATE_DIR = '.cache/standin'
+
+# Bytes written per step when a bandwidth limit is set.
+WRITE_CHUNK = 16 * 1024
+
+
+def load_payloads(paths):
+    """Yield every results_api payload in the given captured files (see `archive._iter_captured`)."""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get('responses'), dict):
+            yield data
+        elif isinstance(data, dict):
+            for value in data.values():
+                if isinstance(value, dict) and isinstance(value.get('responses'), dict):
+                    yield value
+
+
+def merge_payloads(first, second):
+    """One payload with the entries of `first` followed by those of `second` (a combined call)."""
+    merged = dict(first)
+    merged['responses'] = dict(first['responses'])
+    for key, value in second['responses'].items():
+        merged['responses'].setdefault(key, value)
+    return merged
+
+
+def _epoch_ms(day):
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class StandInAPI:
+    """
+    What the stand-in serves and how badly it behaves.
+
+    `payloads` maps tournamentId -> {query kind: payload}. Portal search
+    returns `tournaments` synthetic listings spread evenly over `year`,
+    each with its own websiteUrl on the stand-in; the Me call for a
+    listing's host answers with one of the known tournamentIds, so a crawl
+    of the stand-in resolves and fetches real captured payloads.
+
+    The crawler only keeps the host of a websiteUrl, so listings map to
+    different tournaments only with `spread_hosts`: each listing gets its
+    own 127.x.y.z host (Linux routes all of 127.0.0.0/8 to loopback, and
+    that is the default there). Without it every listing shares one host
+    and resolves to the first tournament.
+
+    Tournament calls are answered with the part of the captured payload
+    their selection reaches, as results_api would, so a crawl sees what a
+    trimmed query (`queries.MINIMAL_*_PATHS`) really returns.
+
+    Failure knobs: `latency` / `jitter` (seconds before responding),
+    `error_rate` (HTTP 500), `throttle_rate` (HTTP 429 with Retry-After),
+    `reset_rate` (connection dropped half way through the body),
+    `bandwidth` (bytes/sec per response) and `rate` (requests/sec across
+    all clients; requests beyond it get a 429).
+    """
+
+    def __init__(self, payloads, search=None, me_template=None, tournaments=None, year=2025,
+                 spread_hosts=None, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0,
+                 reset_rate=0.0, bandwidth=None, rate=None, seed=None):
+        self.payloads = payloads
+        self.tournament_ids = sorted(payloads)
+        self.search = search or {}
+        self.me_template = me_template
+        self.year = year
+        self.spread_hosts = sys.platform.startswith('linux') if spread_hosts is None else spread_hosts
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.reset_rate = reset_rate
+        self.bandwidth = bandwidth
+        self.rate = rate
+        self.base_url = None
+
+        listings = [t for categories in self.search.values() for items in categories.values() for t in items]
+        self.templates = listings or [{'name': 'Stand-in Cup', 'organizerName': 'Stand-in', 'organizerId': 0}]
+        self.tournaments = tournaments if tournaments is not None else len(listings) or len(self.tournament_ids)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._allowance = float(rate or 0)
+        self._allowance_at = time.monotonic()
+        self.counts = {}
+        self.bytes_sent = 0
+        self._merged = {}
+        self._projections = {}
+
+    # Behaviour
+
+    def roll(self, probability):
+        if probability <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < probability
+
+    def delay(self):
+        if self.latency <= 0 and self.jitter <= 0:
+            return 0.0
+        with self._lock:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def over_rate(self):
+        """True if this request exceeds `rate` (token bucket with a one-second burst)."""
+        if not self.rate:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.rate, self._allowance + (now - self._allowance_at) * self.rate)
+            self._allowance_at = now
+            if self._allowance < 1:
+                return True
+            self._allowance -= 1
+            return False
+
+    def count(self, endpoint, status, size=0):
+        with self._lock:
+            key = f"{endpoint} {status}"
+            self.counts[key] = self.counts.get(key, 0) + 1
+            self.bytes_sent += size
+
+    # Listings
+
+    def website_url(self, number):
+        parsed = urlparse(self.base_url)
+        if self.spread_hosts:
+            # its own host, and so its own tournament and per-host limits in the crawler
+            return f"{parsed.scheme}://127.0.{1 + number // 250}.{2 + number % 250}:{parsed.port}"
+        return f"{self.base_url}/t/{number}"
+
+    def listing(self, number):
+        template = self.templates[number % len(self.templates)]
+        start = date(self.year, 1, 1) + timedelta(days=number * 365 // max(1, self.tournaments))
+        name = template.get('name', 'Unknown')
+        if number >= len(self.templates):
+            name = f"{name} #{number // len(self.templates) + 1}"
+        return dict(template, name=name, websiteUrl=self.website_url(number),
+                    startDate=_epoch_ms(start), endDate=_epoch_ms(start + timedelta(days=2)))
+
+    def search_response(self, params):
+        """newportal/search body: every listing overlapping [fromDate, date]."""
+        from_ms = _epoch_ms(date.fromisoformat(params['fromDate'])) if params.get('fromDate') else None
+        to_ms = _epoch_ms(date.fromisoformat(params['date'])) if params.get('date') else None
+        sport = params.get('sport', 'football')
+        found = []
+        for number in range(self.tournaments):
+            item = self.listing(number)
+            if from_ms is not None and item['endDate'] < from_ms:
+                continue
+            if to_ms is not None and item['startDate'] > to_ms:
+                continue
+            found.append(item)
+        return {sport: {'local': found}} if found else {}
+
+    # results_api
+
+    def tournament_for_host(self, host):
+        """tournamentId the Me call on `host` resolves to."""
+        if not self.tournament_ids:
+            return None
+        number = 0
+        hostname = host.split(':', 1)[0]
+        if self.spread_hosts and hostname.startswith('127.'):
+            octets = [int(part) for part in hostname.split('.')]
+            number = (octets[2] - 1) * 250 + octets[3] - 2
+        return self.tournament_ids[max(0, number) % len(self.tournament_ids)]
+
+    def me_response(self, host):
+        tournament_id = int(self.tournament_for_host(host) or 0)
+        if self.me_template is None:
+            return {'responses': {'Me({optionalCupId:null})$cups': {'entity': [{'__typename': 'Me$MeCup', 'cupId': tournament_id}]}},
+                    'status': 200, 'totalTime': 0.0}
+        payload = copy.deepcopy(self.me_template)
+        for value in payload['responses'].values():
+            if isinstance(value.get('entity'), list):
+                for cup in value['entity'][:1]:
+                    if 'cupId' in cup:
+                        cup['cupId'] = tournament_id
+        return payload
+
+    def results_response(self, params):
+        """
+        Payload for a Tournament call, or None if the tournament or query is
+        unknown. Like results_api, only the entries the call selects are
+        returned (see `queries.project`).
+        """
+        call = params.get('call', '')
+        payload = self.captured_payload(str(params.get('tournamentId', '')), query_kind(call))
+        if payload is None:
+            return None
+        key = (id(payload), call)
+        projected = self._projections.get(key)
+        if projected is None:
+            tree = parse_selection(call)
+            projected = payload if tree is None else project(payload, tree)
+            with self._lock:
+                projected = self._projections.setdefault(key, projected)
+        return projected
+
+    def captured_payload(self, tournament_id, kind):
+        payloads = self.payloads.get(tournament_id)
+        if not payloads:
+            return None
+        if kind in payloads:
+            return payloads[kind]
+        if kind == 'combined':
+            parts = [payloads[part] for part in ('rankings', 'finals') if part in payloads]
+            if len(parts) == 2:
+                with self._lock:
+                    return self._merged.setdefault(tournament_id, merge_payloads(*parts))
+            if parts:
+                return parts[0]
+        # a combined capture answers a rankings-only or finals-only call too
+        return payloads.get('combined')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    api = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        api = self.api
+        parsed = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        endpoint = parsed.path.rstrip('/').rsplit('/rest/', 1)[-1]
+
+        if endpoint == '_stats':
+            return self.send_json(endpoint, 200, {'counts': api.counts, 'bytesSent': api.bytes_sent}, faults=False)
+
+        time.sleep(api.delay())
+        if api.over_rate() or api.roll(api.throttle_rate):
+            return self.send_json(endpoint, 429, {'error': 'rate limited'}, headers={'Retry-After': '1'})
+        if api.roll(api.error_rate):
+            return self.send_json(endpoint, 500, {'error': 'injected error'})
+
+        if endpoint == 'newportal/search':
+            return self.send_json(endpoint, 200, api.search_response(params))
+        if endpoint == 'results_api/call':
+            if params.get('call', '').startswith('Me('):
+                return self.send_json(endpoint, 200, api.me_response(self.headers.get('Host', '')))
+            payload = api.results_response(params)
+            if payload is None:
+                return self.send_json(endpoint, 404, {'error': f"no captured payload for {params.get('tournamentId')}"})
+            return self.send_json(endpoint, 200, payload)
+        return self.send_json(endpoint, 404, {'error': f"unknown endpoint {parsed.path}"})
+
+    def send_json(self, endpoint, status, payload, headers=None, faults=True):
+        body = jsonio.dumps(payload)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        api = self.api
+        if faults and status == 200 and api.roll(api.reset_rate):
+            # send part of the body, then drop the connection
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            api.count(endpoint, 'reset', len(body) // 2)
+            return
+
+        if api.bandwidth:
+            for start in range(0, len(body), WRITE_CHUNK):
+                chunk = body[start:start + WRITE_CHUNK]
+                self.wfile.write(chunk)
+                time.sleep(len(chunk) / api.bandwidth)
+        else:
+            self.wfile.write(body)
+        api.count(endpoint, status, len(body))
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def verify_request(self, request, client_address):
+        # bound to 0.0.0.0 for the 127.x.y.z listings; still only serve this machine
+        return client_address[0].startswith('127.')
+
+    def handle_error(self, request, client_address):
+        # clients hanging up mid-body (timeouts, Ctrl-C) are expected here
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class StandInServer:
+    """
+    Threaded HTTP server for a `StandInAPI`, for scripts and benchmarks.
+
+        with StandInServer(api) as server:
+            client.get_json(server.base_url + '/rest/results_api/call', params=...)
+    """
+
+    def __init__(self, api, host=DEFAULT_HOST, port=0):
+        handler = type('StandInHandler', (_Handler,), {'api': api})
+        # 127.x.y.z listings only connect if the socket isn't bound to 127.0.0.1 alone
+        bind_host = '0.0.0.0' if api.spread_hosts and host == DEFAULT_HOST else host
+        self.httpd = _Server((bind_host, port), handler)
+        self.api = api
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        api.base_url = self.base_url
+        self._thread = None
+
+    @property
+    def search_url(self):
+        return f"{self.base_url}/rest/newportal/search"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def collect_payloads(paths=DEFAULT_PAYLOADS, archive_dir=None):
+    """tournamentId -> {query kind: payload} from captured files and, optionally, a payload archive."""
+    payloads = {}
+    for payload in load_payloads(paths):
+        payloads.setdefault(payload_tournament_id(payload), {})[payload_kind(payload)] = payload
+    if archive_dir:
+        archive = PayloadArchive(archive_dir)
+        latest = {}
+        for record in archive.records():
+            latest[(record['tournamentId'], record['kind'])] = record['hash']
+        for (tournament_id, kind), digest in latest.items():
+            if kind != 'Me':
+                payloads.setdefault(tournament_id, {})[kind] = archive.get(digest)
+    payloads.pop('', None)
+    return payloads
+
+
+def _load_optional(path):
+    try:
+        return jsonio.load(path)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve captured cupmanager payloads locally for offline crawls and load tests.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--payload', dest='payloads', action='append',
+                        help=f"captured results_api file to serve (repeatable; default: {', '.join(DEFAULT_PAYLOADS)})")
+    parser.add_argument('--archive', help='also serve the latest payloads from this payload archive')
+    parser.add_argument('--search-file', default=DEFAULT_SEARCH_FILE, help='captured newportal/search response used as listing templates')
+    parser.add_argument('--me-file', default=DEFAULT_ME_FILE, help='captured Me response used as a template')
+    parser.add_argument('--tournaments', type=int, help='number of synthetic listings (default: one per template listing)')
+    parser.add_argument('--year', type=int, default=2025, help='year the listings are spread over')
+    parser.add_argument('--single-host', dest='spread_hosts', action='store_false', default=None,
+                        help='serve every listing from one host, so all of them resolve to the first tournament '
+                             '(default off Linux, where listings cannot get their own 127.x.y.z host)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds before each response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='+/- seconds of random latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with HTTP 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered with HTTP 429')
+    parser.add_argument('--reset-rate', type=float, default=0.0, help='fraction of responses cut off half way')
+    parser.add_argument('--bandwidth', type=float, help='KB/s per response')
+    parser.add_argument('--rate', type=float, help='requests/sec across all clients before answering 429')
+    parser.add_argument('--seed', type=int, help='random seed for reproducible failures')
+    args = parser.parse_args(argv)
+
+    payloads = collect_payloads(args.payloads or DEFAULT_PAYLOADS, archive_dir=args.archive)
+    api = StandInAPI(
+        payloads,
+        search=_load_optional(args.search_file),
+        me_template=_load_optional(args.me_file),
+        tournaments=args.tournaments,
+        year=args.year,
+        spread_hosts=args.spread_hosts,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        reset_rate=args.reset_rate,
+        bandwidth=args.bandwidth * 1024 if args.bandwidth else None,
+        rate=args.rate,
+        seed=args.seed,
+    )
+    server = StandInServer(api, host=args.host, port=args.port)
+
+    print("\n" + "="*80)
+    print("CUPMANAGER STAND-IN API")
+    print("="*80 + "\n")
+    print(f"Serving {server.base_url}")
+    print(f"  search:      {server.search_url} ({api.tournaments} listings over {args.year})")
+    print(f"  results_api: {server.base_url}/rest/results_api/call")
+    for tournament_id in api.tournament_ids:
+        print(f"    - {tournament_id}: {', '.join(sorted(payloads[tournament_id]))}")
+    print(f"  stats:       {server.base_url}/rest/_stats")
+    if not api.spread_hosts and len(api.tournament_ids) > 1:
+        print(f"\n⚠ All listings share {server.base_url}, so they all resolve to {api.tournament_ids[0]}")
+    # keep stand-in output and crawl state away from the real realData.json, manifest and registries
+    print(f"\nCrawl it with: python fetch-all-2025-monthly.py --portal {server.search_url} --no-cache "
+          f"--state-dir {STANDIN_STATE_DIR} --output {STANDIN_STATE_DIR}/realData.json")
+
+    # print the request summary on `kill` as well as on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print("\n" + "="*80)
+        for key, count in sorted(api.counts.items()):
+            print(f"  {key:<30} {count:>8}")
+        print(f"  {'bytes sent':<30} {api.bytes_sent:>8,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+import codecs
+import json
+
+from cupmanager.index import ResponseIndex
+
+# Bytes read per step from a socket or file.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = ',:}]' + _WHITESPACE
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Text buffer over an iterable of byte (or str) chunks, refilled on demand."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, at_least=1):
+        """
+        Append chunks until at least `at_least` new characters arrived,
+        dropping consumed text. False if the input ended first.
+        """
+        if self.eof:
+            return False
+        parts = [self.buffer[self.pos:]]
+        added = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            parts.append(text)
+            added += len(text)
+            if added >= at_least:
+                break
+        else:
+            parts.append(self._utf8.decode(b'', final=True))
+            self.eof = True
+        self.buffer = ''.join(parts)
+        self.pos = 0
+        return not self.eof
+
+    def peek(self):
+        """Next non-whitespace character without consuming it ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input until it is."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # A number cut by a chunk boundary ("1" of "1.5") also decodes,
+                # so it only counts once a delimiter follows it
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow the pending text geometrically so a value split over many
+            # small chunks is not re-decoded once per chunk
+            self.fill(at_least=max(1, len(self.buffer) - self.pos))
+
+
+def load_payload(chunks, on_entry=None):
+    """
+    Decode a results_api payload from an iterable of chunks.
+
+    Each entry of the top-level `responses` object is decoded on its own as
+    soon as its bytes have arrived and passed to `on_entry(key, value)`, so
+    indexing overlaps the download and the full response text is never held
+    in memory. Returns the same dict `json.loads` would.
+    """
+    reader = _Reader(chunks)
+    payload = {}
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        return payload
+
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'responses' and reader.peek() == '{':
+            payload[key] = _load_object(reader, on_entry)
+        else:
+            payload[key] = reader.value()
+
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == '}':
+            return payload
+        if separator != ',':
+            raise ValueError(f"Expected ',' or '}}' at offset {reader.pos - 1}, found {separator!r}")
+
+
+def _load_object(reader, on_entry):
+    entries = {}
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        return entries
+
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        value = reader.value()
+        entries[key] = value
+        if on_entry:
+            on_entry(key, value)
+
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == '}':
+            return entries
+        if separator != ',':
+            raise ValueError(f"Expected ',' or '}}' at offset {reader.pos - 1}, found {separator!r}")
+
+
+def iter_file(path, chunk_size=CHUNK_SIZE):
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def load_file(path, on_entry=None):
+    """`load_payload` over a file on disk (e.g. a captured fixture or cache entry)."""
+    return load_payload(iter_file(path), on_entry=on_entry)
+
+
+def load_index(chunks):
+    """Decode a payload while filling a `ResponseIndex`; returns (payload, index)."""
+    index = ResponseIndex({})
+    payload = load_payload(chunks, on_entry=index.add)
+    return payload, index
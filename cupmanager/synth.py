@@ -0,0 +1,372 @@
+import argparse
+import json
+import os
+import random
+import time
+
+# Ids start in the 8-digit range the real API uses, so id-matching regexes
+# (see `bench.ID_PATTERN`) treat them like captured ones.
+FIRST_ID = 80_000_000
+FIRST_CUP_ID = 20_000_000
+
+# 2025-01-01 09:00 UTC, in ms like Match.start
+FIRST_KICKOFF = 1_735_722_000_000
+
+AGE_GROUPS = ('U8', 'U9', 'U10', 'U11', 'U12', 'U13', 'U14', 'U15', 'U16', 'U17', 'U18', 'Open', 'Over 35', 'Over 45')
+DIVISIONS = ('BOYS', 'GIRLS', 'MIXED', 'COPA', 'LIGA', 'PREMIER')
+FORMATS = ('(7v7)', '(9v9)', '(11v11)', '(Futsal)')
+CLUB_PLACES = ('Ballarat', 'Bendigo', 'Brunswick', 'Dandenong', 'Frankston', 'Geelong', 'Heidelberg', 'Knox',
+               'Melton', 'Mornington', 'Northcote', 'Oakleigh', 'Preston', 'Richmond', 'Shepparton', 'Sunbury',
+               'Traralgon', 'Wangaratta', 'Werribee', 'Yarraville')
+CLUB_SUFFIXES = ('FC', 'City', 'United', 'SC', 'Rangers', 'Juniors', 'Strikers', 'Wanderers', 'Lions', 'Eagles')
+
+# Stage names in the order a category plays them; parsers.stage_types_by_category
+# reads "Cup" / "Plate" from these.
+STAGE_NAMES = ('Group Stage', 'Plate Finals', 'Cup Finals')
+ROUND_NAMES = {1: 'Final', 2: 'Semi-final', 4: 'Quarter-final'}
+
+
+class _Ids:
+    def __init__(self, start):
+        self.next = start
+
+    def __call__(self):
+        self.next += 1
+        return self.next
+
+
+def _entry(entity, cup_id, taints=('general',), ids=()):
+    """One `responses` value with a cachetag, as results_api returns it."""
+    return {
+        'cachetags': [{'taint': list(taints), 'cupId': cup_id, 'ids': list(ids), 'queryId': 0}],
+        'entity': entity,
+    }
+
+
+def _href(key):
+    return {'href': key}
+
+
+def club_names(count, seed=0):
+    """`count` distinct club names, e.g. "Geelong Rangers", "Knox FC 3"."""
+    rng = random.Random(seed)
+    combos = [f"{place} {suffix}" for place in CLUB_PLACES for suffix in CLUB_SUFFIXES]
+    rng.shuffle(combos)
+    return [combos[n % len(combos)] + (f" {n // len(combos) + 1}" if n >= len(combos) else '') for n in range(count)]
+
+
+def category_names(count, seed=0):
+    rng = random.Random(seed + 1)
+    combos = [f"{age} {division} {fmt}" for age in AGE_GROUPS for division in DIVISIONS for fmt in FORMATS]
+    rng.shuffle(combos)
+    return [combos[n % len(combos)] + (f" {n // len(combos) + 1}" if n >= len(combos) else '') for n in range(count)]
+
+
+class PayloadGenerator:
+    """
+    Synthetic combined rankings + finals payloads (see `queries.combined_call`).
+
+    Each tournament has `categories` categories. Every category plays the
+    stages in STAGE_NAMES with `teams` teams drawn from a pool of `clubs`
+    clubs shared across tournaments. Each finals stage is a knockout
+    bracket, so every team gets a ranking place and real match scores.
+    The entries use the same keys and href conventions as captured
+    payloads: `Stage({categoryId:..,stageId:..,tournamentId:..})$rankings`,
+    `MatchActor({actor:"home",id:..})`, `Match({id:..})$roundName`, and so
+    on. The output parses with `parsers.parse_combined_results`.
+
+    Deterministic for a given `seed`.
+    """
+
+    def __init__(self, categories=20, teams=8, clubs=None, seed=0, start_id=FIRST_ID):
+        self.categories = categories
+        self.teams = max(2, teams)
+        self.seed = seed
+        self._ids = _Ids(start_id)
+        self._cup_ids = _Ids(FIRST_CUP_ID + seed)
+        self._random = random.Random(seed)
+        self.category_names = category_names(categories, seed)
+        club_count = clubs if clubs is not None else max(8, categories * self.teams // 3)
+        self.clubs = [(self._ids(), name) for name in club_names(club_count, seed)]
+
+    def next_id(self):
+        """A fresh entity id from the generator's sequence, e.g. for a tournamentId."""
+        return self._ids()
+
+    def tournament_responses(self, tournament_id=None, name=None):
+        """Yield (key, value) entries of one tournament's combined payload."""
+        rng = self._random
+        tournament_id = tournament_id or self._ids()
+        cup_id = self._cup_ids()
+        tournament_key = f"Tournament({{id:{tournament_id}}})"
+        category_keys = []
+        finals_keys = []
+        clubs_used = {}
+        deferred = []
+
+        yield tournament_key, _entry({
+            '__typename': 'Tournament',
+            'id': tournament_id,
+            'fullname': name or f"Synthetic Cup {tournament_id}",
+            'lotCategories': _href(f"{tournament_key}$lotCategories"),
+            'finals': _href(f"{tournament_key}$finals"),
+        }, cup_id)
+
+        for category_name in self.category_names:
+            category_id = self._ids()
+            category_key = f"Category({{categoryId:{category_id},tournamentId:{tournament_id}}})"
+            category_keys.append(category_key)
+
+            yield category_key, _entry({
+                '__typename': 'Category',
+                'name': category_name,
+                'id': category_id,
+                'stages': _href(f"{category_key}$stages"),
+            }, cup_id)
+
+            # Teams of this category, each from a club in the shared pool
+            team_keys = []
+            for club_id, club_name in rng.sample(self.clubs, min(self.teams, len(self.clubs))):
+                team_id = self._ids()
+                team_key = f"Team({{id:{team_id}}})"
+                team_keys.append((team_key, team_id, f"{club_name} {category_name}"))
+                clubs_used[club_id] = club_name
+                deferred.append((team_key, _entry({
+                    '__typename': 'Team',
+                    'category': _href(category_key),
+                    'name': {
+                        '__typename': 'Team$TeamName',
+                        'fullName': f"{club_name} {category_name}",
+                        'suffix': '',
+                        'clubName': club_name,
+                        'categoryName': category_name,
+                    },
+                    'id': team_id,
+                    'club': _href(f"NameClub({{id:{club_id}}})"),
+                }, cup_id, taints=('general', 'nameClub'))))
+
+            stage_keys = []
+            # Group stage first (no ranking places), then Plate for the
+            # bottom half and Cup for the top half of the group
+            half = len(team_keys) // 2
+            brackets = {'Group Stage': [], 'Plate Finals': team_keys[half:], 'Cup Finals': team_keys[:half]}
+            for rank, stage_name in enumerate(STAGE_NAMES):
+                stage_id = self._ids()
+                stage_key = f"Stage({{categoryId:{category_id},stageId:{stage_id},tournamentId:{tournament_id}}})"
+                stage_keys.append(stage_key)
+
+                places = []
+                for entry in self._bracket(brackets[stage_name], stage_key, tournament_id, cup_id, places, finals_keys):
+                    deferred.append(entry)
+
+                yield stage_key, _entry({
+                    '__typename': 'Stage',
+                    'category': _href(category_key),
+                    'name': stage_name,
+                    'type': 'group' if stage_name == 'Group Stage' else 'playoff',
+                    'id': stage_id,
+                    'rankings': _href(f"{stage_key}$rankings"),
+                    'categoryId': category_id,
+                    'rank': rank,
+                }, cup_id)
+                match_ids = sorted({place['match']['href'][10:-2] for place in places})
+                yield f"{stage_key}$rankings", _entry(places, cup_id, taints=('cachedmatch', 'cachedmatch_state_id'),
+                                                      ids=[int(match_id) for match_id in match_ids])
+
+            yield f"{category_key}$stages", _entry([_href(key) for key in stage_keys], cup_id)
+
+        yield f"{tournament_key}$lotCategories", _entry([_href(key) for key in category_keys], cup_id)
+        yield from deferred
+        for club_id, club_name in clubs_used.items():
+            yield f"NameClub({{id:{club_id}}})", _entry({
+                '__typename': 'NameClub',
+                'name': club_name,
+                'id': club_id,
+            }, cup_id, taints=('nameClub',))
+        yield f"{tournament_key}$finals", _entry([_href(key) for key in finals_keys], cup_id, taints=('match', 'match_plan'))
+
+    def _bracket(self, teams, stage_key, tournament_id, cup_id, places, finals_keys):
+        """
+        Play a knockout between `teams`, yielding its Match / MatchActor /
+        MatchResult / RoundName entries. Appends the ranking places
+        (winner 1, runner-up 2, ...) and the finals' Match keys.
+        """
+        rng = self._random
+        alive = list(teams)
+        eliminated = []
+        while len(alive) > 1:
+            is_final = len(alive) == 2
+            next_round = []
+            round_name = ROUND_NAMES.get(len(alive) // 2, f"Round of {len(alive)}")
+            if len(alive) % 2:
+                next_round.append(alive.pop())
+            for home, away in zip(alive[0::2], alive[1::2]):
+                match_id = self._ids()
+                match_key = f"Match({{id:{match_id}}})"
+                home_goals, away_goals = rng.randint(0, 5), rng.randint(0, 5)
+                penalties = home_goals == away_goals
+                winner = ('home' if rng.random() < 0.5 else 'away') if penalties else ('home' if home_goals > away_goals else 'away')
+                winner_team, loser_team = (home, away) if winner == 'home' else (away, home)
+                next_round.append(winner_team)
+                eliminated.append((loser_team, match_key, 'loss'))
+                if is_final:
+                    eliminated.append((winner_team, match_key, 'win'))
+                finals_keys.append(match_key)
+
+                start = FIRST_KICKOFF + match_id % 1000 * 3_600_000
+                yield match_key, _entry({
+                    '__typename': 'Match',
+                    'home': _href(f'MatchActor({{actor:"home",id:{match_id}}})'),
+                    'away': _href(f'MatchActor({{actor:"away",id:{match_id}}})'),
+                    'result': _href(f"MatchResult({{id:{match_id}}})"),
+                    'roundName': _href(f"{match_key}$roundName"),
+                    'stage': _href(stage_key),
+                    'finished': True,
+                    'id': match_id,
+                    'start': start,
+                    'end': start + 1_800_000,
+                }, cup_id, taints=('match', 'match_id'), ids=[match_id])
+                for side, (team_key, team_id, team_name) in (('home', home), ('away', away)):
+                    yield f'MatchActor({{actor:"{side}",id:{match_id}}})', _entry({
+                        '__typename': 'MatchActor',
+                        'name': {'en': team_name},
+                        'id': team_id,
+                        'match': _href(match_key),
+                        'team': _href(team_key),
+                    }, cup_id, taints=('cachedmatch', 'cachedmatch_actor_id'), ids=[match_id])
+                yield f"MatchResult({{id:{match_id}}})", _entry({
+                    '__typename': 'MatchResult',
+                    'finished': True,
+                    'id': match_id,
+                    'match': _href(match_key),
+                    'homeGoals': home_goals,
+                    'awayGoals': away_goals,
+                    'winner': winner,
+                    'penalties': penalties,
+                    'homeState': 'win' if winner == 'home' else 'loss',
+                    'awayState': 'win' if winner == 'away' else 'loss',
+                }, cup_id, taints=('cachedmatch', 'cachedmatch_result_id'), ids=[match_id])
+                yield f"{match_key}$roundName", _entry({
+                    '__typename': 'Match$RoundName',
+                    'name': {'en': round_name},
+                }, cup_id, taints=('match', 'match_id'), ids=[match_id])
+            alive = next_round
+
+        for rank, (team, match_key, status) in enumerate(reversed(eliminated), start=1):
+            places.append({
+                '__typename': 'Stage$StageRankingPlace_MatchStatus',
+                'rank': rank,
+                'team': _href(team[0]),
+                'match': _href(match_key),
+                'status': status,
+            })
+
+    def tournament_payload(self, tournament_id=None, name=None):
+        """One tournament as a complete results_api payload dict."""
+        return {
+            'responses': dict(self.tournament_responses(tournament_id, name)),
+            'status': 200,
+            'totalTime': 0.0,
+        }
+
+
+def write_payload(path, entries):
+    """
+    Stream (key, value) entries to `path` as a results_api payload, one
+    entry at a time, so 100k-team payloads never sit in memory whole.
+    Returns the number of entries written.
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"responses":{')
+        for key, value in entries:
+            if count:
+                f.write(',')
+            f.write(json.dumps(key))
+            f.write(':')
+            f.write(json.dumps(value, ensure_ascii=False, separators=(',', ':')))
+            count += 1
+        f.write('},"status":200,"totalTime":0.0}')
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic results_api payloads for scale testing.')
+    parser.add_argument('--tournaments', type=int, default=1)
+    parser.add_argument('--categories', type=int, default=20, help='categories per tournament')
+    parser.add_argument('--teams', type=int, default=8, help='teams per category')
+    parser.add_argument('--clubs', type=int, help='size of the shared club pool (default: a third of the teams per tournament)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', default='synthetic', help='one <tournamentId>.json per tournament is written here')
+    parser.add_argument('--single', metavar='FILE',
+                        help='write every tournament into one payload file instead (e.g. a 100k-team stress payload)')
+    parser.add_argument('--real-data', metavar='FILE',
+                        help='also parse the payloads and write a realData.json-shaped file for the frontend')
+    args = parser.parse_args(argv)
+
+    generator = PayloadGenerator(categories=args.categories, teams=args.teams, clubs=args.clubs, seed=args.seed)
+    teams = args.tournaments * args.categories * min(args.teams, len(generator.clubs))
+
+    print("\n" + "="*80)
+    print("SYNTHETIC PAYLOADS")
+    print("="*80 + "\n")
+    print(f"{args.tournaments} tournaments x {args.categories} categories x {args.teams} teams "
+          f"= {teams:,} teams from {len(generator.clubs):,} clubs\n")
+
+    started = time.time()
+    tournaments = []
+    if args.real_data:
+        from cupmanager.model import ModelPool, parse_tournament
+
+        # Held as the slotted model while parsing: a large synthetic season
+        # shares one Team / Club instance per id instead of a dict per row
+        pool = ModelPool()
+
+    def tournament_entries(tournament_id):
+        """One tournament's entries; with --real-data also parsed once all are written."""
+        responses = {} if args.real_data else None
+        for key, value in generator.tournament_responses(tournament_id):
+            if responses is not None:
+                responses[key] = value
+            yield key, value
+        if responses is not None:
+            tournaments.append(parse_tournament({'responses': responses}, f"Synthetic Cup {tournament_id}",
+                                                str(tournament_id), pool))
+
+    if args.single:
+        def all_entries():
+            # clubs are shared between tournaments; write each NameClub once
+            clubs_written = set()
+            for _ in range(args.tournaments):
+                for key, value in tournament_entries(generator.next_id()):
+                    if key.startswith('NameClub('):
+                        if key in clubs_written:
+                            continue
+                        clubs_written.add(key)
+                    yield key, value
+        count = write_payload(args.single, all_entries())
+        print(f"✓ {args.single}: {count:,} entries, {os.path.getsize(args.single):,} bytes")
+    else:
+        os.makedirs(args.out_dir, exist_ok=True)
+        for number in range(args.tournaments):
+            tournament_id = generator.next_id()
+            path = os.path.join(args.out_dir, f"{tournament_id}.json")
+            count = write_payload(path, tournament_entries(tournament_id))
+            if number < 5 or number == args.tournaments - 1:
+                print(f"✓ {path}: {count:,} entries, {os.path.getsize(path):,} bytes")
+            elif number == 5:
+                print("  ...")
+
+    if args.real_data:
+        from cupmanager import jsonio
+        from cupmanager.model import season_to_dicts
+
+        jsonio.dump(season_to_dicts(tournaments), args.real_data)
+        results = sum(len(t.results) for t in tournaments)
+        print(f"✓ {args.real_data}: {len(tournaments)} tournaments, {results:,} results")
+
+    print(f"\nDone in {time.time() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
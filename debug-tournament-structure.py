@@ -1,7 +1,8 @@
 import json
-import requests
 from urllib.parse import urlparse
 
+from cupmanager import client
+
 def get_tournament_id(website_url):
     """Fetch tournament ID."""
     try:
@@ -11,7 +12,7 @@ def get_tournament_id(website_url):
         query = "Me({optionalCupId:null}){cups:[{cup:{}}],teams:[{team:{shirt:{}}}]}"
         params = {'call': query}
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = client.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -57,7 +58,7 @@ for name, url, known_id in test_tournaments:
             'tournamentId': tournament_id
         }
         
-        response = requests.get(base_url, params=params, timeout=30)
+        response = client.get(base_url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -1,50 +1,22 @@
-import json
-import requests
+import argparse
 from urllib.parse import urlparse
-import time
-import re
-from datetime import datetime, timedelta
 
-def fetch_tournaments_for_month(year, month):
-    """Fetch tournaments for a specific month."""
-    # Calculate date range for the month
-    from_date = f"{year}-{month:02d}-01"
-    
-    # Calculate last day of month
-    if month == 12:
-        next_month = datetime(year + 1, 1, 1)
-    else:
-        next_month = datetime(year, month + 1, 1)
-    
-    last_day = (next_month - timedelta(days=1)).day
-    to_date = f"{year}-{month:02d}-{last_day}"
-    
-    api_url = f'https://portal.cupmanager.net/rest/newportal/search?coords=[-38,145]&country=AU&date={to_date}&fromDate={from_date}&loc=Victoria&regions=[{{"nationId":25}}]&sport=football'
-    
-    print(f"   Fetching tournaments from {from_date} to {to_date}...")
-    
-    try:
-        response = requests.get(api_url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
-        tournaments = []
-        for sport, categories in data.items():
-            for category_type, tournament_list in categories.items():
-                for tournament in tournament_list:
-                    tournaments.append({
-                        'name': tournament.get('name', 'Unknown'),
-                        'websiteUrl': tournament.get('websiteUrl', ''),
-                        'organizer': tournament.get('organizerName', ''),
-                        'organizerId': tournament.get('organizerId', ''),
-                        'month': month
-                    })
-        
-        print(f"   ✓ Found {len(tournaments)} tournaments")
-        return tournaments
-    except Exception as e:
-        print(f"   ✗ Error: {str(e)[:80]}")
-        return []
+from cupmanager import client
+from cupmanager.archive import add_archive_arguments, archive_from_args
+from cupmanager.cache import add_cache_arguments, cache_from_args
+from cupmanager.clubs import add_club_arguments, clubs_from_args
+from cupmanager.dataset import add_dataset_arguments, apply_state_dir, dataset_from_args, source_hash
+from cupmanager.discovery import add_discovery_arguments, discover, search_window, windows_from_args
+from cupmanager.index import ResponseIndex
+from cupmanager.journal import CrawlJournal, add_journal_arguments
+from cupmanager.metrics import add_metrics_arguments, report_metrics
+from cupmanager.parsers import parse_combined_results
+from cupmanager.pipeline import Pipeline, Stage, add_pipeline_arguments
+from cupmanager.pool import add_pool_arguments, host_of
+from cupmanager.profiling import add_profile_arguments, profiler_from_args, report_profile
+from cupmanager.queries import combined_cache_key, fetch_combined
+from cupmanager.ratelimit import HostRateLimiter, add_rate_limit_arguments
+from cupmanager.resolver import TournamentIdResolver, add_resolver_arguments
 
 def get_tournament_id_from_me_api(website_url):
     """Fetch tournament ID using the Me API endpoint."""
@@ -55,9 +27,7 @@ def get_tournament_id_from_me_api(website_url):
         query = "Me({optionalCupId:null}){cups:[{cup:{}}],teams:[{team:{shirt:{}}}]}"
         params = {'call': query}
         
-        response = requests.get(base_url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = client.get_json(base_url, params=params, timeout=10)
         
         cups = data.get('responses', {}).get('Me({optionalCupId:null})$cups', {}).get('entity', [])
         if cups and len(cups) > 0:
@@ -68,384 +38,207 @@ def get_tournament_id_from_me_api(website_url):
     except Exception as e:
         return None
 
-def fetch_tournament_rankings(website_url, tournament_id):
-    """Fetch tournament rankings."""
-    try:
-        parsed = urlparse(website_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}/rest/results_api/call"
-        
-        query = f"Tournament({{id:{tournament_id}}}){{lotCategories:[{{stages:[{{rankings:[{{... on Stage$StageRankingPlace_ConferencePlace:{{conference:{{matches:[{{}}]}}}},... on Stage$StageRankingPlace_MatchStatus:{{match:{{arena:{{}},away:{{team:{{club:{{nation:{{}}}}}}}},home:{{team:{{club:{{nation:{{}}}}}}}},roundName:{{}}}}}},team:{{club:{{nation:{{}}}}}}}}]}}]}}]}}"
-        
-        params = {
-            'call': query,
-            'lang': 'en',
-            'tournamentId': tournament_id
-        }
-        
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        return None
-
-def fetch_tournament_finals(website_url, tournament_id):
-    """Fetch tournament finals with match scores."""
-    try:
-        parsed = urlparse(website_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}/rest/results_api/call"
-        
-        query = f"Tournament({{id:{tournament_id}}}){{finals:[{{... on Match:{{arena:{{}},away:{{team:{{club:{{nation:{{}}}}}}}},division:{{category:{{}},stage:{{}}}},home:{{team:{{club:{{nation:{{}}}}}}}},protests:[{{}}],result:{{}},roundName:{{}},stage:{{}},video:{{}}}}}}]}}"
-        
-        params = {
-            'call': query,
-            'lang': 'en',
-            'tournamentId': tournament_id
-        }
-        
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        return None
+def report(item):
+    """Print one tournament's progress lines as a single block."""
+    print('\n'.join([f"\n{item['number']}. {item['info']['name']}"] + item['log']))
 
-def parse_match_scores(finals_data):
-    """Parse match scores from finals data."""
-    match_scores = {}
-    
-    if 'responses' not in finals_data:
-        return match_scores
-    
-    responses = finals_data['responses']
+def resolve_stage(item):
+    """Pipeline stage: website URL -> tournament ID (resolver store, then Me API)."""
+    website_url = item['info']['websiteUrl']
+    tournament_id = journal.remember('resolve', website_url, lambda: resolver.resolve(website_url, get_tournament_id_from_me_api))
     
-    # Collect MatchResult entities
-    match_results = {}
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'MatchResult':
-            match_id = str(entity.get('id'))
-            match_results[match_id] = {
-                'homeGoals': entity.get('homeGoals', 0),
-                'awayGoals': entity.get('awayGoals', 0),
-                'winner': entity.get('winner', ''),
-                'penalties': entity.get('penalties', False)
-            }
-    
-    # Collect Match entities
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'Match':
-            match_id = str(entity.get('id'))
-            match_info = {
-                'matchId': match_id,
-                'homeHref': entity.get('home', {}).get('href', ''),
-                'awayHref': entity.get('away', {}).get('href', ''),
-                'roundNameHref': entity.get('roundName', {}).get('href', '')
-            }
-            
-            if match_id in match_results:
-                match_info.update(match_results[match_id])
-            
-            match_scores[match_id] = match_info
-    
-    # Resolve team names
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'MatchActor':
-            team_name = entity.get('name', {}).get('en', '')
-            team_href = entity.get('team', {}).get('href', '')
-            team_id_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-            actual_team_id = team_id_match.group(1) if team_id_match else None
-            
-            for match_id, match_info in match_scores.items():
-                if key == match_info.get('homeHref'):
-                    match_info['homeTeam'] = team_name
-                    match_info['homeTeamId'] = actual_team_id
-                elif key == match_info.get('awayHref'):
-                    match_info['awayTeam'] = team_name
-                    match_info['awayTeamId'] = actual_team_id
-    
-    # Resolve round names
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'Match$RoundName':
-            round_name = entity.get('name', {}).get('en', '')
-            for match_id, match_info in match_scores.items():
-                if key == match_info.get('roundNameHref'):
-                    match_info['roundName'] = round_name
-    
-    return match_scores
-
-def link_scores_to_teams(match_scores):
-    """Build team matches mapping."""
-    team_matches_map = {}
-    
-    for match_id, match_info in match_scores.items():
-        if 'homeTeamId' not in match_info or 'awayTeamId' not in match_info:
-            continue
-        
-        home_id = match_info['homeTeamId']
-        away_id = match_info['awayTeamId']
-        
-        if home_id:
-            if home_id not in team_matches_map:
-                team_matches_map[home_id] = []
-            team_matches_map[home_id].append({
-                'opponent': match_info.get('awayTeam', ''),
-                'opponentId': away_id,
-                'homeGoals': match_info.get('homeGoals', 0),
-                'awayGoals': match_info.get('awayGoals', 0),
-                'isHome': True,
-                'result': 'won' if match_info.get('winner') == 'home' else 'lost',
-                'roundName': match_info.get('roundName', ''),
-                'penalties': match_info.get('penalties', False)
-            })
-        
-        if away_id:
-            if away_id not in team_matches_map:
-                team_matches_map[away_id] = []
-            team_matches_map[away_id].append({
-                'opponent': match_info.get('homeTeam', ''),
-                'opponentId': home_id,
-                'homeGoals': match_info.get('homeGoals', 0),
-                'awayGoals': match_info.get('awayGoals', 0),
-                'isHome': False,
-                'result': 'won' if match_info.get('winner') == 'away' else 'lost',
-                'roundName': match_info.get('roundName', ''),
-                'penalties': match_info.get('penalties', False)
-            })
-    
-    return team_matches_map
-
-def parse_tournament_data(rankings_data, team_matches_map, tournament_name, tournament_id):
-    """Parse tournament rankings and add match scores."""
-    tournament_data = {
-        "tournamentId": tournament_id,
-        "tournamentName": tournament_name,
-        "season": "2025",
-        "results": []
-    }
-    
-    responses = rankings_data.get('responses', {})
-    
-    # Find categories
-    categories = {}
-    for key, value in responses.items():
-        if 'Category({categoryId:' in key and 'entity' in value:
-            entity = value['entity']
-            if entity.get('__typename') == 'Category':
-                category_id = entity.get('id')
-                name_field = entity.get('name', 'Unknown')
-                category_name = name_field.get('en', 'Unknown') if isinstance(name_field, dict) else name_field
-                categories[str(category_id)] = category_name
-    
-    # Find stages with rankings
-    stages_with_rankings = {}
-    for key, value in responses.items():
-        if 'Stage({categoryId:' in key and '$rankings' in key:
-            match = re.search(r'categoryId:(\d+)', key)
-            if match:
-                category_id = match.group(1)
-                rankings = value.get('entity', [])
-                if rankings:
-                    stages_with_rankings[category_id] = rankings
+    if not tournament_id:
+        item['log'].append(f"   ✗ Could not find tournament ID")
+        report(item)
+        return None
     
-    # Get stage types
-    stage_types = {}
-    for key, value in responses.items():
-        if 'Stage({categoryId:' in key and '$rankings' not in key and 'entity' in value:
-            entity = value['entity']
-            if entity.get('__typename') == 'Stage':
-                match = re.search(r'categoryId:(\d+)', key)
-                if match:
-                    category_id = match.group(1)
-                    stage_name = entity.get('name', '')
-                    if 'Cup' in stage_name:
-                        stage_types[category_id] = 'CUP_FINAL'
-                    elif 'Plate' in stage_name:
-                        stage_types[category_id] = 'PLATE_FINAL'
-                    else:
-                        stage_types[category_id] = 'CUP_FINAL'
+    item['tournament_id'] = tournament_id
+    item['log'].append(f"   ✓ Tournament ID: {tournament_id}")
+    return item
+
+def fetch_stage(item):
+    """Pipeline stage: one combined rankings + finals payload per tournament.
+
+    Tournaments whose payload matches the dataset manifest skip parsing.
+    The journal records each fetch as its payload hash and cache key; on
+    --resume a journalled fetch is not repeated, and its payload is read
+    back from the response cache only if the dataset doesn't have it yet.
+    """
+    website_url = item['info']['websiteUrl']
+    tournament_id = item['tournament_id']
+    
+    index = ResponseIndex({})
+    results_data = None
+    journalled = journal.get('results', tournament_id)
+    if journalled:
+        existing = dataset.unchanged(tournament_id, journalled['hash'])
+        if existing and existing['tournamentName'] == item['info']['name']:
+            item['log'].append(f"   ✓ Fetched before resuming, unchanged since last build ({len(existing['results'])} results)")
+            item['payload_hash'] = journalled['hash']
+            item['tournament_data'] = existing
+            return item
+        cache = client.get_client().cache
+        if cache is not None:
+            results_data = cache.get(journalled['cacheKey'], expired=True)
+        if results_data is None:
+            item['log'].append(f"   ⚠ Journalled payload is no longer cached, fetching again")
+    
+    fetched = results_data is None
+    if fetched:
+        # Fetch rankings and finals in one call, indexing entities as they download
+        results_data = fetch_combined(website_url, tournament_id, on_entry=index.add)
+    
+    if not results_data:
+        item['log'].append(f"   ✗ Failed to fetch rankings")
+        report(item)
+        return None
     
-    # Get team information
-    teams = {}
-    for key, value in responses.items():
-        if 'Team({id:' in key and 'entity' in value:
-            entity = value['entity']
-            if entity.get('__typename') == 'Team':
-                team_id = entity.get('id')
-                name_obj = entity.get('name', {})
-                team_name = name_obj.get('fullName', name_obj.get('en', 'Unknown'))
-                club_name = name_obj.get('clubName', 'Unknown Club')
-                teams[str(team_id)] = {
-                    'teamName': team_name,
-                    'clubName': club_name
-                }
+    item['log'].append(f"   ✓ Rankings + finals fetched")
+    item['payload_hash'] = source_hash(results_data)
+    if fetched:
+        journal.record('results', tournament_id, {
+            'hash': item['payload_hash'],
+            'cacheKey': combined_cache_key(website_url, tournament_id),
+        })
+    
+    existing = dataset.unchanged(tournament_id, item['payload_hash'])
+    if existing and existing['tournamentName'] == item['info']['name']:
+        item['log'].append(f"   ✓ Unchanged since last build ({len(existing['results'])} results)")
+        item['tournament_data'] = existing
+        return item
+    
+    # A payload replayed from the cache was not streamed, so it still needs indexing
+    item['results_data'] = index if len(index) else results_data
+    return item
+
+def parse_stage(item):
+    """Pipeline stage: parse the combined payload into a realData.json entry."""
+    if 'tournament_data' in item:
+        return item
+    
+    tournament_data, match_scores = parse_combined_results(item.pop('results_data'), item['info']['name'], item['tournament_id'], clubs)
+    if match_scores:
+        item['log'].append(f"   ✓ Match scores: {len(match_scores)} matches")
+    else:
+        item['log'].append(f"   ⚠ No match scores")
     
-    # Process rankings
-    for category_id, rankings in stages_with_rankings.items():
-        category_name = categories.get(category_id, f"Category {category_id}")
-        stage_type = stage_types.get(category_id, 'CUP_FINAL')
-        
-        for ranking in rankings:
-            if '__typename' in ranking and 'StageRankingPlace' in ranking['__typename']:
-                rank = ranking.get('rank')
-                team_href = ranking.get('team', {}).get('href', '')
-                
-                team_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-                if team_match:
-                    team_id = team_match.group(1)
-                    team_info = teams.get(team_id, {
-                        'teamName': f'Team {team_id}',
-                        'clubName': 'Unknown Club'
-                    })
-                    
-                    result_entry = {
-                        "categoryId": category_id,
-                        "categoryName": category_name,
-                        "stageType": stage_type,
-                        "rank": rank,
-                        "team": {
-                            "teamId": team_id,
-                            "teamName": team_info['teamName'],
-                            "clubId": team_info['clubName'].replace(' ', '_').lower(),
-                            "clubName": team_info['clubName']
-                        }
-                    }
-                    
-                    # Add match scores if available
-                    if team_id in team_matches_map:
-                        result_entry['matches'] = team_matches_map[team_id]
-                    
-                    tournament_data['results'].append(result_entry)
+    if not tournament_data['results']:
+        item['log'].append(f"   ✗ No results found")
+        report(item)
+        return None
     
-    return tournament_data
+    results_with_matches = sum(1 for r in tournament_data['results'] if 'matches' in r)
+    item['log'].append(f"   ✓ {len(tournament_data['results'])} results ({results_with_matches} with match scores)")
+    item['tournament_data'] = tournament_data
+    return item
 
 # Main execution
+parser = argparse.ArgumentParser(description='Fetch all 2025 tournaments month by month.')
+add_discovery_arguments(parser)
+add_pipeline_arguments(parser)
+add_pool_arguments(parser)
+add_rate_limit_arguments(parser)
+add_cache_arguments(parser)
+add_archive_arguments(parser)
+add_dataset_arguments(parser)
+add_journal_arguments(parser)
+add_resolver_arguments(parser)
+add_club_arguments(parser)
+add_metrics_arguments(parser)
+add_profile_arguments(parser)
+args = apply_state_dir(parser.parse_args())
+client.configure(rate_limiter=HostRateLimiter(rate=args.rate, burst=args.burst), cache=cache_from_args(args),
+                 archive=archive_from_args(args))
+dataset = dataset_from_args(args)
+journal = CrawlJournal(args.journal, resume=args.resume)
+resolver = TournamentIdResolver(args.resolver_store, refresh=args.refresh_ids)
+clubs = clubs_from_args(args)
+profiler = profiler_from_args(args)
+
 print("\n" + "="*80)
 print("FETCHING ALL 2025 TOURNAMENTS (MONTH BY MONTH)")
 print("="*80 + "\n")
 
-# Fetch tournaments for each month
-all_tournaments_raw = []
-months = ['January', 'February', 'March', 'April', 'May', 'June', 
-          'July', 'August', 'September', 'October', 'November', 'December']
-
-for month_num in range(1, 13):
-    print(f"\n{months[month_num-1]} 2025:")
-    tournaments = fetch_tournaments_for_month(2025, month_num)
-    all_tournaments_raw.extend(tournaments)
-    time.sleep(0.5)
+if args.resume:
+    print(f"Resuming: {len(journal)} completed steps in {args.journal}")
 
-# Deduplicate by website URL
-unique_tournaments = {}
-for t in all_tournaments_raw:
-    url = t['websiteUrl']
-    if url and url not in unique_tournaments:
-        unique_tournaments[url] = t
-
-print(f"\n" + "="*80)
-print(f"Found {len(all_tournaments_raw)} total tournament entries")
-print(f"Unique tournaments: {len(unique_tournaments)}")
-print("="*80 + "\n")
+# Discover tournaments concurrently; each new websiteUrl enters the
+# discover -> resolve -> fetch -> parse -> write pipeline as soon as its
+# window returns, carrying its place in the listing (discoveryOrder)
+def search(key, from_date, to_date):
+    return journal.remember('discovery', key, lambda: search_window(from_date, to_date, search_url=args.portal, month=int(from_date[5:7])))
 
-# Process each unique tournament
-processed_tournaments = []
-success_count = 0
-fail_count = 0
-
-for i, (url, tournament_info) in enumerate(unique_tournaments.items(), 1):
-    name = tournament_info['name']
-    website_url = tournament_info['websiteUrl']
-    
-    if not website_url:
-        print(f"{i}. {name}: No website URL")
-        fail_count += 1
-        continue
-    
-    print(f"\n{i}/{len(unique_tournaments)}. {name}")
-    
-    # Get tournament ID
-    tournament_id = get_tournament_id_from_me_api(website_url)
-    
-    if not tournament_id:
-        print(f"   ✗ Could not find tournament ID")
-        fail_count += 1
-        continue
-    
-    print(f"   ✓ Tournament ID: {tournament_id}")
-    
-    # Fetch rankings
-    rankings_data = fetch_tournament_rankings(website_url, tournament_id)
-    
-    if not rankings_data:
-        print(f"   ✗ Failed to fetch rankings")
-        fail_count += 1
-        continue
-    
-    print(f"   ✓ Rankings fetched")
-    
-    # Fetch finals
-    finals_data = fetch_tournament_finals(website_url, tournament_id)
-    
-    if finals_data:
-        match_scores = parse_match_scores(finals_data)
-        team_matches_map = link_scores_to_teams(match_scores)
-        print(f"   ✓ Match scores: {len(match_scores)} matches")
+def print_window(key, tournaments, new_count):
+    if tournaments is None:
+        print(f"\n{key}: ✗ search failed")
     else:
-        team_matches_map = {}
-        print(f"   ⚠ No match scores")
-    
-    # Parse tournament data
-    tournament_data = parse_tournament_data(rankings_data, team_matches_map, name, tournament_id)
-    
-    if tournament_data['results']:
-        processed_tournaments.append(tournament_data)
-        results_with_matches = sum(1 for r in tournament_data['results'] if 'matches' in r)
-        print(f"   ✓ {len(tournament_data['results'])} results ({results_with_matches} with match scores)")
-        success_count += 1
-    else:
-        print(f"   ✗ No results found")
-        fail_count += 1
-    
-    # Rate limiting
-    time.sleep(1)
-
-# Save all tournaments
-output_file = 'tournament-rankings-poc/web/src/data/realData.json'
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(processed_tournaments, f, indent=2, ensure_ascii=False)
+        print(f"\n{key}: ✓ {len(tournaments)} tournaments ({new_count} new)")
+
+discovered = []
+
+def with_website(tournaments):
+    for tournament_info in tournaments:
+        if tournament_info['websiteUrl']:
+            discovered.append(tournament_info)
+            yield {'number': len(discovered), 'info': tournament_info, 'log': []}
+
+pipeline = Pipeline(
+    with_website(discover(windows_from_args(args, 2025), workers=args.discovery_workers,
+                          search=search, on_window=print_window)),
+    [
+        Stage('resolve', resolve_stage, workers=args.resolve_workers),
+        Stage('fetch', fetch_stage, workers=args.workers,
+              url_of=lambda item: item['info']['websiteUrl'], per_host=args.per_host),
+        Stage('parse', parse_stage, workers=args.parse_workers),
+    ],
+    queue_size=args.queue_size,
+)
+if profiler:
+    # Profiles are named by tournament ID once it is known (the resolve
+    # stage only has the website host)
+    profiler.instrument(pipeline.stages, lambda item: item.get('tournament_id') or host_of(item['info']['websiteUrl']))
+
+# Write each tournament as soon as it is parsed, so an interrupted crawl
+# still leaves every finished tournament in realData.json; new tournaments
+# are saved in listing order, not the order they were found or finished
+merge_counts = {'added': 0, 'updated': 0, 'unchanged': 0}
+
+def write(item):
+    report(item)
+    merge_counts[dataset.merge(item['tournament_data'], item['payload_hash'], order=item['info']['discoveryOrder'])] += 1
+    dataset.save()
+    if clubs:
+        clubs.save()
+    print(f"   [{pipeline.progress()}]")
+
+pipeline.run(write)
+
+output_file = dataset.output_file
+dataset.save()
+if clubs:
+    clubs.save()
+journal.close()
+
+success_count = pipeline.written
+fail_count = sum(stage.dropped + stage.errors for stage in pipeline.stages)
 
 print("\n" + "="*80)
 print("FINAL SUMMARY")
 print("="*80)
-print(f"Unique tournaments found: {len(unique_tournaments)}")
+print(f"Unique tournaments found: {len(discovered)}")
 print(f"Successfully processed: {success_count}")
 print(f"Failed: {fail_count}")
+print(f"Me API lookups: {resolver.lookups}")
+print(f"Added: {merge_counts['added']}, updated: {merge_counts['updated']}, unchanged: {merge_counts['unchanged']}")
+print(f"Pipeline: {pipeline.progress()}")
 print(f"\n✓ Saved to: {output_file}")
 
 print(f"\nAll Tournaments:")
-for t in processed_tournaments:
+for t in dataset.tournaments:
     results_with_matches = sum(1 for r in t['results'] if 'matches' in r)
     print(f"  - {t['tournamentName']}: {len(t['results'])} results ({results_with_matches} with match scores)")
 
+report_metrics(client.get_client().metrics, args.metrics)
+report_profile(profiler)
+
 print("\n" + "="*80)
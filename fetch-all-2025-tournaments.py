@@ -1,8 +1,17 @@
-import json
-import requests
+import argparse
 from urllib.parse import urlparse
-import time
-import re
+
+from cupmanager import client, jsonio
+from cupmanager.archive import add_archive_arguments, archive_from_args
+from cupmanager.cache import add_cache_arguments, cache_from_args
+from cupmanager.clubs import add_club_arguments, clubs_from_args
+from cupmanager.metrics import add_metrics_arguments, report_metrics
+from cupmanager.parsers import parse_combined_results
+from cupmanager.pool import DEFAULT_PER_HOST, add_pool_arguments, run_ordered
+from cupmanager.profiling import add_profile_arguments, profiler_from_args, report_profile
+from cupmanager.queries import fetch_combined
+from cupmanager.ratelimit import HostRateLimiter, add_rate_limit_arguments
+from cupmanager.resolver import TournamentIdResolver, add_resolver_arguments
 
 def get_tournament_id_from_me_api(website_url):
     """Fetch tournament ID using the Me API endpoint."""
@@ -13,9 +22,7 @@ def get_tournament_id_from_me_api(website_url):
         query = "Me({optionalCupId:null}){cups:[{cup:{}}],teams:[{team:{shirt:{}}}]}"
         params = {'call': query}
         
-        response = requests.get(base_url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = client.get_json(base_url, params=params, timeout=10)
         
         cups = data.get('responses', {}).get('Me({optionalCupId:null})$cups', {}).get('entity', [])
         if cups and len(cups) > 0:
@@ -27,288 +34,51 @@ def get_tournament_id_from_me_api(website_url):
         print(f"      Error getting tournament ID: {str(e)[:80]}")
         return None
 
-def fetch_tournament_rankings(website_url, tournament_id):
-    """Fetch tournament rankings (placements)."""
-    try:
-        parsed = urlparse(website_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}/rest/results_api/call"
-        
-        query = f"Tournament({{id:{tournament_id}}}){{lotCategories:[{{stages:[{{rankings:[{{... on Stage$StageRankingPlace_ConferencePlace:{{conference:{{matches:[{{}}]}}}},... on Stage$StageRankingPlace_MatchStatus:{{match:{{arena:{{}},away:{{team:{{club:{{nation:{{}}}}}}}},home:{{team:{{club:{{nation:{{}}}}}}}},roundName:{{}}}}}},team:{{club:{{nation:{{}}}}}}}}]}}]}}]}}"
-        
-        params = {
-            'call': query,
-            'lang': 'en',
-            'tournamentId': tournament_id
-        }
-        
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"      Error fetching rankings: {str(e)[:80]}")
-        return None
-
-def fetch_tournament_finals(website_url, tournament_id):
-    """Fetch tournament finals with match scores."""
-    try:
-        parsed = urlparse(website_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}/rest/results_api/call"
-        
-        query = f"Tournament({{id:{tournament_id}}}){{finals:[{{... on Match:{{arena:{{}},away:{{team:{{club:{{nation:{{}}}}}}}},division:{{category:{{}},stage:{{}}}},home:{{team:{{club:{{nation:{{}}}}}}}},protests:[{{}}],result:{{}},roundName:{{}},stage:{{}},video:{{}}}}}}]}}"
-        
-        params = {
-            'call': query,
-            'lang': 'en',
-            'tournamentId': tournament_id
-        }
-        
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"      Error fetching finals: {str(e)[:80]}")
-        return None
+def process_tournament(name, website_url):
+    """Run the Me -> combined rankings + finals chain for one tournament.
 
-def parse_match_scores(finals_data):
-    """Parse match scores from finals data."""
-    match_scores = {}
+    Returns (tournament_data or None, progress lines).
+    """
+    log = []
     
-    if 'responses' not in finals_data:
-        return match_scores
+    # Get tournament ID
+    tournament_id = resolver.resolve(website_url, get_tournament_id_from_me_api)
     
-    responses = finals_data['responses']
+    if not tournament_id:
+        log.append(f"   ✗ Could not find tournament ID")
+        return None, log
     
-    # Collect MatchResult entities
-    match_results = {}
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'MatchResult':
-            match_id = str(entity.get('id'))
-            match_results[match_id] = {
-                'homeGoals': entity.get('homeGoals', 0),
-                'awayGoals': entity.get('awayGoals', 0),
-                'winner': entity.get('winner', ''),
-                'penalties': entity.get('penalties', False)
-            }
+    log.append(f"   ✓ Tournament ID: {tournament_id}")
     
-    # Collect Match entities
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'Match':
-            match_id = str(entity.get('id'))
-            match_info = {
-                'matchId': match_id,
-                'homeHref': entity.get('home', {}).get('href', ''),
-                'awayHref': entity.get('away', {}).get('href', ''),
-                'roundNameHref': entity.get('roundName', {}).get('href', '')
-            }
-            
-            if match_id in match_results:
-                match_info.update(match_results[match_id])
-            
-            match_scores[match_id] = match_info
+    # Fetch rankings and finals with match scores in one call
+    log.append(f"   Fetching rankings + match scores...")
+    results_data = fetch_combined(website_url, tournament_id)
     
-    # Resolve team names from MatchActor
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'MatchActor':
-            team_name = entity.get('name', {}).get('en', '')
-            team_href = entity.get('team', {}).get('href', '')
-            team_id_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-            actual_team_id = team_id_match.group(1) if team_id_match else None
-            
-            for match_id, match_info in match_scores.items():
-                if key == match_info.get('homeHref'):
-                    match_info['homeTeam'] = team_name
-                    match_info['homeTeamId'] = actual_team_id
-                elif key == match_info.get('awayHref'):
-                    match_info['awayTeam'] = team_name
-                    match_info['awayTeamId'] = actual_team_id
+    if not results_data:
+        log.append(f"   ✗ Failed to fetch rankings")
+        return None, log
     
-    # Resolve round names
-    for key, value in responses.items():
-        if not isinstance(value, dict) or 'entity' not in value:
-            continue
-        entity = value['entity']
-        if not isinstance(entity, dict):
-            continue
-        
-        if entity.get('__typename') == 'Match$RoundName':
-            round_name = entity.get('name', {}).get('en', '')
-            for match_id, match_info in match_scores.items():
-                if key == match_info.get('roundNameHref'):
-                    match_info['roundName'] = round_name
+    log.append(f"   ✓ Rankings + match scores fetched")
     
-    return match_scores
-
-def link_scores_to_teams(match_scores):
-    """Build team matches mapping."""
-    team_matches_map = {}
+    # Parse tournament data
+    tournament_data, match_scores = parse_combined_results(results_data, name, tournament_id, clubs)
+    log.append(f"   ✓ Parsed {len(match_scores)} matches")
     
-    for match_id, match_info in match_scores.items():
-        if 'homeTeamId' not in match_info or 'awayTeamId' not in match_info:
-            continue
-        
-        home_id = match_info['homeTeamId']
-        away_id = match_info['awayTeamId']
-        
-        if home_id:
-            if home_id not in team_matches_map:
-                team_matches_map[home_id] = []
-            team_matches_map[home_id].append({
-                'opponent': match_info.get('awayTeam', ''),
-                'opponentId': away_id,
-                'homeGoals': match_info.get('homeGoals', 0),
-                'awayGoals': match_info.get('awayGoals', 0),
-                'isHome': True,
-                'result': 'won' if match_info.get('winner') == 'home' else 'lost',
-                'roundName': match_info.get('roundName', ''),
-                'penalties': match_info.get('penalties', False)
-            })
-        
-        if away_id:
-            if away_id not in team_matches_map:
-                team_matches_map[away_id] = []
-            team_matches_map[away_id].append({
-                'opponent': match_info.get('homeTeam', ''),
-                'opponentId': home_id,
-                'homeGoals': match_info.get('homeGoals', 0),
-                'awayGoals': match_info.get('awayGoals', 0),
-                'isHome': False,
-                'result': 'won' if match_info.get('winner') == 'away' else 'lost',
-                'roundName': match_info.get('roundName', ''),
-                'penalties': match_info.get('penalties', False)
-            })
-    
-    return team_matches_map
-
-def parse_tournament_data(rankings_data, team_matches_map, tournament_name, tournament_id):
-    """Parse tournament rankings and add match scores."""
-    tournament_data = {
-        "tournamentId": tournament_id,
-        "tournamentName": tournament_name,
-        "season": "2025",
-        "results": []
-    }
-    
-    responses = rankings_data.get('responses', {})
-    
-    # Find categories
-    categories = {}
-    for key, value in responses.items():
-        if 'Category({categoryId:' in key and 'entity' in value:
-            entity = value['entity']
-            if entity.get('__typename') == 'Category':
-                category_id = entity.get('id')
-                name_field = entity.get('name', 'Unknown')
-                category_name = name_field.get('en', 'Unknown') if isinstance(name_field, dict) else name_field
-                categories[str(category_id)] = category_name
-    
-    # Find stages with rankings
-    stages_with_rankings = {}
-    for key, value in responses.items():
-        if 'Stage({categoryId:' in key and '$rankings' in key:
-            match = re.search(r'categoryId:(\d+)', key)
-            if match:
-                category_id = match.group(1)
-                rankings = value.get('entity', [])
-                if rankings:
-                    stages_with_rankings[category_id] = rankings
+    if not tournament_data['results']:
+        log.append(f"   ✗ No results found")
+        return None, log
     
-    # Get stage types
-    stage_types = {}
-    for key, value in responses.items():
-        if 'Stage({categoryId:' in key and '$rankings' not in key and 'entity' in value:
-            entity = value['entity']
-            if entity.get('__typename') == 'Stage':
-                match = re.search(r'categoryId:(\d+)', key)
-                if match:
-                    category_id = match.group(1)
-                    stage_name = entity.get('name', '')
-                    if 'Cup' in stage_name:
-                        stage_types[category_id] = 'CUP_FINAL'
-                    elif 'Plate' in stage_name:
-                        stage_types[category_id] = 'PLATE_FINAL'
-                    else:
-                        stage_types[category_id] = 'CUP_FINAL'
-    
-    # Get team information
-    teams = {}
-    for key, value in responses.items():
-        if 'Team({id:' in key and 'entity' in value:
-            entity = value['entity']
-            if entity.get('__typename') == 'Team':
-                team_id = entity.get('id')
-                name_obj = entity.get('name', {})
-                team_name = name_obj.get('fullName', name_obj.get('en', 'Unknown'))
-                club_name = name_obj.get('clubName', 'Unknown Club')
-                teams[str(team_id)] = {
-                    'teamName': team_name,
-                    'clubName': club_name
-                }
-    
-    # Process rankings
-    for category_id, rankings in stages_with_rankings.items():
-        category_name = categories.get(category_id, f"Category {category_id}")
-        stage_type = stage_types.get(category_id, 'CUP_FINAL')
-        
-        for ranking in rankings:
-            if '__typename' in ranking and 'StageRankingPlace' in ranking['__typename']:
-                rank = ranking.get('rank')
-                team_href = ranking.get('team', {}).get('href', '')
-                
-                team_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-                if team_match:
-                    team_id = team_match.group(1)
-                    team_info = teams.get(team_id, {
-                        'teamName': f'Team {team_id}',
-                        'clubName': 'Unknown Club'
-                    })
-                    
-                    result_entry = {
-                        "categoryId": category_id,
-                        "categoryName": category_name,
-                        "stageType": stage_type,
-                        "rank": rank,
-                        "team": {
-                            "teamId": team_id,
-                            "teamName": team_info['teamName'],
-                            "clubId": team_info['clubName'].replace(' ', '_').lower(),
-                            "clubName": team_info['clubName']
-                        }
-                    }
-                    
-                    # Add match scores if available
-                    if team_id in team_matches_map:
-                        result_entry['matches'] = team_matches_map[team_id]
-                    
-                    tournament_data['results'].append(result_entry)
-    
-    return tournament_data
+    log.append(f"   ✓ Added {len(tournament_data['results'])} results")
+    return tournament_data, log
 
-def fetch_2025_tournaments():
+def fetch_2025_tournaments(workers=1, per_host=DEFAULT_PER_HOST):
     """Fetch all tournaments from 2025."""
     # API URL for 2025 tournaments
     api_url = "https://portal.cupmanager.net/rest/newportal/search?coords=[-38,145]&country=AU&date=2025-12-31&fromDate=2025-01-01&loc=Victoria&regions=[{%22nationId%22:25}]&sport=football"
     
     print("Fetching 2025 tournament list from API...")
     try:
-        response = requests.get(api_url, timeout=30)
+        response = client.get(api_url, timeout=30)
         response.raise_for_status()
         data = response.json()
         print(f"✓ Found tournament data\n")
@@ -316,7 +86,7 @@ def fetch_2025_tournaments():
         print(f"✗ Error: {e}")
         return []
     
-    all_tournaments = []
+    to_process = []
     tournament_count = 0
     
     # Process all tournament types
@@ -332,67 +102,48 @@ def fetch_2025_tournaments():
                     print(f"  {tournament_count}. {name}: No website URL")
                     continue
                 
-                print(f"\n{tournament_count}. {name}")
-                print(f"   Organizer: {organizer}")
-                
-                # Get tournament ID
-                tournament_id = get_tournament_id_from_me_api(website_url)
-                
-                if not tournament_id:
-                    print(f"   ✗ Could not find tournament ID")
-                    continue
-                
-                print(f"   ✓ Tournament ID: {tournament_id}")
-                
-                # Fetch rankings
-                print(f"   Fetching rankings...")
-                rankings_data = fetch_tournament_rankings(website_url, tournament_id)
-                
-                if not rankings_data:
-                    print(f"   ✗ Failed to fetch rankings")
-                    continue
-                
-                print(f"   ✓ Rankings fetched")
-                
-                # Fetch finals with match scores
-                print(f"   Fetching match scores...")
-                finals_data = fetch_tournament_finals(website_url, tournament_id)
-                
-                if not finals_data:
-                    print(f"   ✗ Failed to fetch match scores")
-                    # Continue anyway with rankings only
-                    team_matches_map = {}
-                else:
-                    print(f"   ✓ Match scores fetched")
-                    match_scores = parse_match_scores(finals_data)
-                    team_matches_map = link_scores_to_teams(match_scores)
-                    print(f"   ✓ Parsed {len(match_scores)} matches")
-                
-                # Parse tournament data
-                tournament_data = parse_tournament_data(rankings_data, team_matches_map, name, tournament_id)
-                
-                if tournament_data['results']:
-                    all_tournaments.append(tournament_data)
-                    print(f"   ✓ Added {len(tournament_data['results'])} results")
-                else:
-                    print(f"   ✗ No results found")
-                
-                # Rate limiting
-                time.sleep(1)
-    
-    return all_tournaments
+                to_process.append((tournament_count, name, website_url, organizer))
+    
+    def print_progress(position, item, outcome):
+        count, name, website_url, organizer = item
+        print(f"\n{count}. {name}")
+        print(f"   Organizer: {organizer}")
+        for line in outcome[1]:
+            print(line)
+    
+    outcomes = run_ordered(
+        lambda item: process_tournament(item[1], item[2]),
+        to_process,
+        url_of=lambda item: item[2],
+        workers=workers,
+        per_host=per_host,
+        on_done=print_progress,
+    )
+    
+    return [tournament_data for tournament_data, _ in outcomes if tournament_data]
 
 if __name__ == "__main__":
     print("\n" + "="*80)
     print("FETCHING ALL 2025 TOURNAMENTS")
     print("="*80 + "\n")
     
-    tournaments = fetch_2025_tournaments()
+    parser = argparse.ArgumentParser(description='Fetch all 2025 tournaments.')
+    args = add_club_arguments(add_profile_arguments(add_metrics_arguments(add_resolver_arguments(add_archive_arguments(add_cache_arguments(add_rate_limit_arguments(add_pool_arguments(parser)))))))).parse_args()
+    client.configure(rate_limiter=HostRateLimiter(rate=args.rate, burst=args.burst), cache=cache_from_args(args),
+                     archive=archive_from_args(args))
+    resolver = TournamentIdResolver(args.resolver_store, refresh=args.refresh_ids)
+    clubs = clubs_from_args(args)
+    profiler = profiler_from_args(args)
+    if profiler:
+        fetch_combined = profiler.wrap('fetch', fetch_combined, lambda website_url, tournament_id, **kwargs: tournament_id)
+        parse_combined_results = profiler.wrap('parse', parse_combined_results, lambda payload, name, tournament_id, clubs=None: tournament_id)
+    tournaments = fetch_2025_tournaments(workers=args.workers, per_host=args.per_host)
     
     if tournaments:
         output_file = 'tournament-rankings-poc/web/src/data/realData.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(tournaments, f, indent=2, ensure_ascii=False)
+        jsonio.dump(tournaments, output_file)
+        if clubs:
+            clubs.save()
         
         print("\n" + "="*80)
         print("SUMMARY")
@@ -408,4 +159,7 @@ if __name__ == "__main__":
     else:
         print("\n✗ No tournaments fetched")
     
+    report_metrics(client.get_client().metrics, args.metrics)
+    report_profile(profiler)
+    
     print("\n" + "="*80)
@@ -1,7 +1,8 @@
 import json
-import requests
 from urllib.parse import urlparse
-import time
+
+from cupmanager import client
+from cupmanager.resolver import TournamentIdResolver
 
 def load_tournament_list(api_url=None, file_path=None):
     """
@@ -12,7 +13,7 @@ def load_tournament_list(api_url=None, file_path=None):
         try:
             print(f"Fetching tournament list from API...")
             print(f"URL: {api_url}")
-            response = requests.get(api_url, timeout=30)
+            response = client.get(api_url, timeout=30)
             response.raise_for_status()
             print(f"✓ Tournament list fetched successfully\n")
             return response.json()
@@ -44,7 +45,7 @@ def get_tournament_id_from_me_api(website_url):
             'call': query
         }
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = client.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -81,7 +82,7 @@ def fetch_tournament_results(website_url, tournament_id):
         }
         
         print(f"      Fetching results...")
-        response = requests.get(base_url, params=params, timeout=30)
+        response = client.get(base_url, params=params, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -105,6 +106,7 @@ def process_tournaments(output_file, api_url=None, tournament_list_file=None):
     Process all tournaments from the list and fetch their results.
     """
     data = load_tournament_list(api_url=api_url, file_path=tournament_list_file)
+    resolver = TournamentIdResolver()
     
     results = {}
     tournament_ids_mapping = {}
@@ -138,7 +140,7 @@ def process_tournaments(output_file, api_url=None, tournament_list_file=None):
                 print(f"       URL: {website_url}")
                 
                 # Get tournament ID
-                tournament_id = get_tournament_id_from_me_api(website_url)
+                tournament_id = resolver.resolve(website_url, get_tournament_id_from_me_api)
                 
                 if tournament_id:
                     print(f"       ✓ Tournament ID: {tournament_id}")
@@ -168,9 +170,6 @@ def process_tournaments(output_file, api_url=None, tournament_list_file=None):
                         print(f"       ✗ Failed to fetch results")
                 else:
                     print(f"       ✗ Could not find tournament ID")
-                
-                # Rate limiting - be respectful
-                time.sleep(1)
     
     # Save tournament IDs mapping
     ids_file = 'tournament-ids-mapping.json'
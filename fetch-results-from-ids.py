@@ -2,6 +2,8 @@ import json
 import requests
 from urllib.parse import urlparse, urlencode
 
+from cupmanager import client
+
 def load_tournament_ids(file_path):
     """Load tournament IDs from JSON file"""
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -26,7 +28,7 @@ def fetch_tournament_results(website_url, tournament_id):
         }
         
         print(f"  Fetching from: {base_url}")
-        response = requests.get(base_url, params=params, timeout=30)
+        response = client.get(base_url, params=params, timeout=30)
         response.raise_for_status()
         
         return response.json()
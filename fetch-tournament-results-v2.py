@@ -1,8 +1,8 @@
 import json
-import requests
 import re
 from urllib.parse import urlparse
-import time
+
+from cupmanager import client
 
 def load_tournament_list(file_path):
     """Load the tournament list from JSON file"""
@@ -27,7 +27,7 @@ def extract_tournament_id_from_page(website_url):
         for url in urls_to_try:
             try:
                 print(f"        Checking: {url}")
-                response = requests.get(url, timeout=10, allow_redirects=True)
+                response = client.get(url, timeout=10, allow_redirects=True)
                 response.raise_for_status()
                 
                 # Look for REST API calls in the page that include tournamentId
@@ -86,7 +86,7 @@ def fetch_tournament_results_simple(website_url, tournament_id):
             'tournamentId': tournament_id
         }
         
-        response = requests.get(base_url, params=params, timeout=30)
+        response = client.get(base_url, params=params, timeout=30)
         response.raise_for_status()
         
         return response.json()
@@ -151,9 +151,6 @@ def process_tournaments(tournament_list_file, output_file):
                         print(f"      ✗ Could not fetch results")
                 else:
                     print(f"      ✗ Could not find tournament ID")
-                
-                # Rate limiting
-                time.sleep(2)
     
     # Save tournament IDs mapping
     with open('tournament-ids-mapping.json', 'w', encoding='utf-8') as f:
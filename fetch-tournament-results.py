@@ -1,8 +1,8 @@
 import json
-import requests
 import re
 from urllib.parse import urlparse
-import time
+
+from cupmanager import client
 
 def load_tournament_list(file_path):
     """Load the tournament list from JSON file"""
@@ -29,7 +29,7 @@ def extract_tournament_id_from_url(website_url):
         
         for url in urls_to_try:
             try:
-                response = requests.get(url, timeout=10)
+                response = client.get(url, timeout=10)
                 response.raise_for_status()
                 
                 # Look for tournament ID patterns in the HTML
@@ -81,7 +81,7 @@ def fetch_tournament_results(website_url, tournament_id):
             'tournamentId': tournament_id
         }
         
-        response = requests.get(base_url, params=params, timeout=30)
+        response = client.get(base_url, params=params, timeout=30)
         response.raise_for_status()
         
         return response.json()
@@ -138,9 +138,6 @@ def process_tournaments(tournament_list_file, output_file):
                         print(f"      ✗ Failed to fetch results")
                 else:
                     print(f"      ✗ Could not find tournament ID")
-                
-                # Be respectful with rate limiting
-                time.sleep(1)
     
     # Save results to file
     with open(output_file, 'w', encoding='utf-8') as f:
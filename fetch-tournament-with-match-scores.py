@@ -1,8 +1,9 @@
 import json
-import requests
 from urllib.parse import urlparse
 import time
 
+from cupmanager import client, hrefs
+
 def fetch_tournament_finals(website_url, tournament_id):
     """
     Fetch tournament finals with match scores using the finals endpoint.
@@ -21,7 +22,7 @@ def fetch_tournament_finals(website_url, tournament_id):
         }
         
         print(f"      Fetching finals with match scores...")
-        response = requests.get(base_url, params=params, timeout=30)
+        response = client.get(base_url, params=params, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -57,7 +58,7 @@ def fetch_tournament_rankings(website_url, tournament_id):
         }
         
         print(f"      Fetching rankings...")
-        response = requests.get(base_url, params=params, timeout=30)
+        response = client.get(base_url, params=params, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -201,9 +202,7 @@ def parse_match_scores(finals_data):
 
 def extract_team_id_from_href(href):
     """Extract team ID from Team href."""
-    import re
-    match = re.search(r'Team\(\{id:(\d+)\}\)', href)
-    return match.group(1) if match else None
+    return hrefs.team_id(href)
 
 def link_scores_to_teams(match_scores, rankings_data):
     """
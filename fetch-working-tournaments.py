@@ -1,8 +1,7 @@
 import json
-import requests
-import re
 from urllib.parse import urlparse
-import time
+
+from cupmanager import client, hrefs
 
 def parse_tournament_results(api_response, tournament_id, tournament_name, season="2025"):
     """Parse API response into POC format."""
@@ -59,10 +58,10 @@ def parse_tournament_results(api_response, tournament_id, tournament_name, seaso
                 
                 # Get club name from club reference
                 club_href = entity.get('club', {}).get('href', '')
-                club_match = re.search(r'NameClub\(\{id:(\d+)\}\)', club_href)
+                club_id = hrefs.club_id(club_href)
                 
-                if club_match and club_match.group(1) in clubs:
-                    club_name = clubs[club_match.group(1)]
+                if club_id and club_id in clubs:
+                    club_name = clubs[club_id]
                 elif isinstance(name_obj, dict) and 'clubName' in name_obj:
                     club_name = name_obj.get('clubName', 'Unknown Club')
                 else:
@@ -76,10 +75,9 @@ def parse_tournament_results(api_response, tournament_id, tournament_name, seaso
         if 'Stage({categoryId:' in key and '$rankings' not in key and 'entity' in value:
             entity = value['entity']
             if isinstance(entity, dict) and entity.get('__typename') == 'Stage':
-                match = re.search(r'categoryId:(\d+),stageId:(\d+)', key)
-                if match:
-                    category_id = match.group(1)
-                    stage_id = match.group(2)
+                ids = hrefs.stage_key(key)
+                if ids:
+                    category_id, stage_id = ids
                     stage_name = entity.get('name', '')
                     stage_key = f"{category_id}_{stage_id}"
                     
@@ -94,12 +92,11 @@ def parse_tournament_results(api_response, tournament_id, tournament_name, seaso
     # Extract rankings
     for key, value in responses.items():
         if 'Stage({categoryId:' in key and '$rankings' in key:
-            match = re.search(r'categoryId:(\d+),stageId:(\d+)', key)
-            if not match:
+            ids = hrefs.stage_key(key)
+            if not ids:
                 continue
             
-            category_id = match.group(1)
-            stage_id = match.group(2)
+            category_id, stage_id = ids
             stage_key = f"{category_id}_{stage_id}"
             category_name = categories.get(category_id, f'Category {category_id}')
             stage_type = stage_types.get(stage_key, 'CUP_FINAL')
@@ -120,11 +117,10 @@ def parse_tournament_results(api_response, tournament_id, tournament_name, seaso
                     continue
                 
                 team_href = ranking.get('team', {}).get('href', '')
-                team_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-                if not team_match:
+                team_id = hrefs.team_id(team_href)
+                if not team_id:
                     continue
                 
-                team_id = team_match.group(1)
                 team_info = teams.get(team_id, {'teamName': f'Team {team_id}', 'clubName': 'Unknown Club'})
                 
                 tournament_data['results'].append({
@@ -146,7 +142,7 @@ def fetch_tournament(url, tournament_id, tournament_name):
     """Fetch tournament results from API."""
     try:
         print(f"\nFetching {tournament_name} (ID: {tournament_id})...")
-        response = requests.get(url, timeout=30)
+        response = client.get(url, timeout=30)
         
         if response.status_code != 200:
             print(f"  ✗ HTTP {response.status_code}")
@@ -194,7 +190,6 @@ for tournament in tournaments:
     result = fetch_tournament(tournament['url'], tournament['id'], tournament['name'])
     if result:
         all_tournaments.append(result)
-    time.sleep(2)  # Rate limiting
 
 # Save combined results
 output_file = "all-real-tournaments.json"
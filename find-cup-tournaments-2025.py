@@ -1,9 +1,11 @@
 import json
-import requests
 from urllib.parse import urlparse
-import time
 import re
 
+from cupmanager import client
+from cupmanager.discovery import discover, month_windows
+from cupmanager.resolver import TournamentIdResolver
+
 def get_tournament_id_from_me_api(website_url):
     """Fetch tournament ID using the Me API endpoint."""
     try:
@@ -13,7 +15,7 @@ def get_tournament_id_from_me_api(website_url):
         query = "Me({optionalCupId:null}){cups:[{cup:{}}],teams:[{team:{shirt:{}}}]}"
         params = {'call': query}
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = client.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -40,7 +42,7 @@ def check_tournament_has_finals(website_url, tournament_id):
             'tournamentId': tournament_id
         }
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = client.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -70,7 +72,7 @@ def check_tournament_has_rankings(website_url, tournament_id):
             'tournamentId': tournament_id
         }
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = client.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -91,74 +93,30 @@ print("\n" + "="*80)
 print("FINDING CUP TOURNAMENTS WITH COMPLETED FINALS")
 print("="*80 + "\n")
 
-# Search for tournaments month by month
-from datetime import datetime, timedelta
-
-all_tournaments = []
-months = ['January', 'February', 'March', 'April', 'May', 'June', 
-          'July', 'August', 'September', 'October', 'November', 'December']
-
-for month_num in range(1, 13):
-    from_date = f"2025-{month_num:02d}-01"
-    
-    if month_num == 12:
-        next_month = datetime(2026, 1, 1)
-    else:
-        next_month = datetime(2025, month_num + 1, 1)
-    
-    last_day = (next_month - timedelta(days=1)).day
-    to_date = f"2025-{month_num:02d}-{last_day}"
-    
-    api_url = f'https://portal.cupmanager.net/rest/newportal/search?coords=[-38,145]&country=AU&date={to_date}&fromDate={from_date}&loc=Victoria&regions=[{{"nationId":25}}]&sport=football'
-    
-    print(f"{months[month_num-1]}: ", end='', flush=True)
-    
-    try:
-        response = requests.get(api_url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
-        for sport, categories in data.items():
-            for category_type, tournament_list in categories.items():
-                for tournament in tournament_list:
-                    all_tournaments.append({
-                        'name': tournament.get('name', 'Unknown'),
-                        'websiteUrl': tournament.get('websiteUrl', ''),
-                        'organizer': tournament.get('organizerName', ''),
-                    })
-        
-        print(f"✓")
-    except Exception as e:
-        print(f"✗")
-    
-    time.sleep(0.3)
-
-# Deduplicate
-unique_tournaments = {}
-for t in all_tournaments:
-    url = t['websiteUrl']
-    if url and url not in unique_tournaments:
-        unique_tournaments[url] = t
+# Search all month windows concurrently; tournaments are checked as soon as
+# their window returns
+def print_window(key, tournaments, new_count):
+    print(f"{key}: {'✗' if tournaments is None else f'✓ {new_count} new'}")
 
-print(f"\nFound {len(unique_tournaments)} unique tournaments")
-print("\nChecking which tournaments have completed finals...\n")
+resolver = TournamentIdResolver()
+print("Checking which tournaments have completed finals...\n")
 
 # Check each tournament
 cup_tournaments = []
 checked = 0
 
-for url, tournament_info in unique_tournaments.items():
-    checked += 1
+for tournament_info in discover(month_windows(2025), on_window=print_window):
     name = tournament_info['name']
     website_url = tournament_info['websiteUrl']
     
     if not website_url:
         continue
     
-    print(f"{checked}/{len(unique_tournaments)}. {name[:50]:<50} ", end='', flush=True)
+    checked += 1
+    print(f"{checked}. {name[:50]:<50} ", end='', flush=True)
     
     # Get tournament ID
-    tournament_id = get_tournament_id_from_me_api(website_url)
+    tournament_id = resolver.resolve(website_url, get_tournament_id_from_me_api)
     
     if not tournament_id:
         print("✗ No ID")
@@ -176,18 +134,18 @@ for url, tournament_info in unique_tournaments.items():
     
     if has_finals:
         print("✓ CUP TOURNAMENT!")
-        cup_tournaments.append({
+        cup_tournaments.append((tournament_info['discoveryOrder'], {
             'name': name,
             'tournament_id': tournament_id,
             'website_url': website_url,
             'organizer': tournament_info['organizer']
-        })
+        }))
     else:
         print("✗ No finals")
-    
-    time.sleep(0.5)
 
-# Save the list of cup tournaments
+# Save the list of cup tournaments, in listing order rather than the
+# order the search windows returned
+cup_tournaments = [t for _, t in sorted(cup_tournaments, key=lambda found: found[0])]
 output_file = 'cup-tournaments-2025.json'
 with open(output_file, 'w', encoding='utf-8') as f:
     json.dump(cup_tournaments, f, indent=2, ensure_ascii=False)
@@ -195,7 +153,7 @@ with open(output_file, 'w', encoding='utf-8') as f:
 print("\n" + "="*80)
 print("SUMMARY")
 print("="*80)
-print(f"Total tournaments checked: {len(unique_tournaments)}")
+print(f"Total tournaments checked: {checked}")
 print(f"Cup tournaments with completed finals: {len(cup_tournaments)}")
 print(f"\n✓ Saved to: {output_file}")
 
@@ -1,10 +1,17 @@
+import argparse
 import json
-import re
 from typing import Dict, List, Any
 
-def parse_tournament_results(api_response: Dict[str, Any], tournament_id: str, tournament_name: str, season: str = "2025") -> Dict[str, Any]:
+from cupmanager import hrefs
+from cupmanager.clubs import add_club_arguments, clubs_from_args
+from cupmanager.index import ResponseIndex
+from cupmanager.parsers import build_result_entry, category_names, team_names, stage_types_by_category
+
+def parse_tournament_results(api_response: Dict[str, Any], tournament_id: str, tournament_name: str, season: str = "2025",
+                             clubs=None) -> Dict[str, Any]:
     """
     Parse the API response and extract tournament data in POC format.
+    With a `clubs` registry, clubIds come from the registry (see `team_names`).
     """
     tournament_data = {
         "tournamentId": tournament_id,
@@ -13,115 +20,48 @@ def parse_tournament_results(api_response: Dict[str, Any], tournament_id: str, t
         "results": []
     }
     
-    responses = api_response.get('responses', {})
-    
-    # Extract categories
-    categories = {}
-    for key, value in responses.items():
-        if 'Category({categoryId:' in key and 'entity' in value:
-            entity = value['entity']
-            if isinstance(entity, dict) and entity.get('__typename') == 'Category':
-                category_id = str(entity.get('id', ''))
-                name_field = entity.get('name', 'Unknown')
-                if isinstance(name_field, dict):
-                    category_name = name_field.get('en', 'Unknown')
-                else:
-                    category_name = name_field
-                categories[category_id] = category_name
-    
-    # Extract teams
-    teams = {}
-    for key, value in responses.items():
-        if 'Team({id:' in key and 'entity' in value:
-            entity = value['entity']
-            if isinstance(entity, dict) and entity.get('__typename') == 'Team':
-                team_id = str(entity.get('id', ''))
-                name_obj = entity.get('name', {})
-                if isinstance(name_obj, dict):
-                    team_name = name_obj.get('fullName', name_obj.get('en', f'Team {team_id}'))
-                    club_name = name_obj.get('clubName', 'Unknown Club')
-                else:
-                    team_name = str(name_obj)
-                    club_name = 'Unknown Club'
-                
-                teams[team_id] = {
-                    'teamName': team_name,
-                    'clubName': club_name
-                }
+    index = ResponseIndex.of(api_response)
+    categories = category_names(index)
+    teams = team_names(index, clubs)
     
     # Extract stage types (Cup Final vs Plate Final)
-    stage_types = {}
-    for key, value in responses.items():
-        if 'Stage({categoryId:' in key and '$rankings' not in key and 'entity' in value:
-            entity = value['entity']
-            if isinstance(entity, dict) and entity.get('__typename') == 'Stage':
-                match = re.search(r'categoryId:(\d+)', key)
-                if match:
-                    category_id = match.group(1)
-                    stage_name = entity.get('name', '')
-                    stage_type = entity.get('type', '')
-                    
-                    # Determine stage type
-                    if 'Cup' in stage_name or 'Final' in stage_name:
-                        stage_types[category_id] = 'CUP_FINAL'
-                    elif 'Plate' in stage_name:
-                        stage_types[category_id] = 'PLATE_FINAL'
-                    else:
-                        stage_types[category_id] = 'CUP_FINAL'
+    stage_types = stage_types_by_category(index, cup_markers=('Cup', 'Final'))
     
     # Extract rankings
-    for key, value in responses.items():
-        if 'Stage({categoryId:' in key and '$rankings' in key:
-            match = re.search(r'categoryId:(\d+)', key)
-            if not match:
+    for key, rankings in index.stage_rankings.items():
+        category_id = hrefs.category_id(key)
+        if not category_id:
+            continue
+        
+        category_name = categories.get(category_id, f'Category {category_id}')
+        stage_type = stage_types.get(category_id, 'CUP_FINAL')
+        
+        for ranking in rankings:
+            if not isinstance(ranking, dict):
                 continue
             
-            category_id = match.group(1)
-            category_name = categories.get(category_id, f'Category {category_id}')
-            stage_type = stage_types.get(category_id, 'CUP_FINAL')
+            typename = ranking.get('__typename', '')
+            if 'StageRankingPlace' not in typename:
+                continue
             
-            rankings = value.get('entity', [])
-            if not isinstance(rankings, list):
+            rank = ranking.get('rank')
+            if rank is None:
                 continue
             
-            for ranking in rankings:
-                if not isinstance(ranking, dict):
-                    continue
-                
-                typename = ranking.get('__typename', '')
-                if 'StageRankingPlace' not in typename:
-                    continue
-                
-                rank = ranking.get('rank')
-                if rank is None:
-                    continue
-                
-                # Extract team ID from href
-                team_href = ranking.get('team', {}).get('href', '')
-                team_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-                if not team_match:
-                    continue
-                
-                team_id = team_match.group(1)
-                team_info = teams.get(team_id, {
-                    'teamName': f'Team {team_id}',
-                    'clubName': 'Unknown Club'
-                })
-                
-                result_entry = {
-                    "categoryId": category_id,
-                    "categoryName": category_name,
-                    "stageType": stage_type,
-                    "rank": rank,
-                    "team": {
-                        "teamId": team_id,
-                        "teamName": team_info['teamName'],
-                        "clubId": team_info['clubName'].replace(' ', '_').lower(),
-                        "clubName": team_info['clubName']
-                    }
-                }
-                
-                tournament_data['results'].append(result_entry)
+            # Extract team ID from href
+            team_href = ranking.get('team', {}).get('href', '')
+            team_id = hrefs.team_id(team_href)
+            if not team_id:
+                continue
+            
+            team_info = teams.get(team_id, {
+                'teamName': f'Team {team_id}',
+                'clubName': 'Unknown Club'
+            })
+            
+            tournament_data['results'].append(build_result_entry(
+                category_id, category_name, stage_type, rank, team_id, team_info, None
+            ))
     
     return tournament_data
 
@@ -147,6 +87,10 @@ def combine_tournaments(tournament_files: List[str], output_file: str):
     return all_tournaments
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Parse the captured WU Cup results_api response.')
+    args = add_club_arguments(parser).parse_args()
+    clubs = clubs_from_args(args)
+    
     # Parse the test results we just fetched
     print("Parsing WU Cup results...")
     
@@ -154,6 +98,11 @@ if __name__ == "__main__":
     with open('test-result-Tournament.json', 'r', encoding='utf-8') as f:
         wu_cup_data = json.load(f)
     
+    wu_cup = parse_tournament_results(wu_cup_data, "60652114", "WU Cup", clubs=clubs)
+    print(f"✓ WU Cup: {len(wu_cup['results'])} results")
+    if clubs:
+        clubs.save()
+    
     # We need the full response, let me check what files were created
     import os
     test_files = [f for f in os.listdir('.') if f.startswith('test-result-')]
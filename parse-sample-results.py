@@ -1,5 +1,7 @@
 import json
 
+from cupmanager import hrefs
+
 def parse_shepparton_cup_results(results_file):
     """
     Parse the sample-results-reponse.json file and extract tournament data
@@ -41,10 +43,8 @@ def parse_shepparton_cup_results(results_file):
     for key, value in responses.items():
         if 'Stage({categoryId:' in key and '$rankings' in key:
             # Extract categoryId from key
-            import re
-            match = re.search(r'categoryId:(\d+)', key)
-            if match:
-                category_id = match.group(1)
+            category_id = hrefs.category_id(key)
+            if category_id:
                 rankings = value.get('entity', [])
                 if rankings:
                     stages_with_rankings[category_id] = {
@@ -60,10 +60,8 @@ def parse_shepparton_cup_results(results_file):
         if 'Stage({categoryId:' in key and '$rankings' not in key and 'entity' in value:
             entity = value['entity']
             if '__typename' in entity and entity['__typename'] == 'Stage':
-                import re
-                match = re.search(r'categoryId:(\d+)', key)
-                if match:
-                    category_id = match.group(1)
+                category_id = hrefs.category_id(key)
+                if category_id:
                     stage_name = entity.get('name', '')
                     stage_type = entity.get('type', '')
                     
@@ -107,10 +105,8 @@ def parse_shepparton_cup_results(results_file):
                 team_href = ranking.get('team', {}).get('href', '')
                 
                 # Extract team ID from href
-                import re
-                team_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-                if team_match:
-                    team_id = team_match.group(1)
+                team_id = hrefs.team_id(team_href)
+                if team_id:
                     team_info = teams.get(team_id, {
                         'teamName': f'Team {team_id}',
                         'clubName': 'Unknown Club'
@@ -1,5 +1,6 @@
 import json
-import re
+
+from cupmanager import hrefs
 
 def parse_tournament_with_scores(rankings_file, finals_file):
     """
@@ -40,9 +41,8 @@ def parse_tournament_with_scores(rankings_file, finals_file):
     stages_with_rankings = {}
     for key, value in responses.items():
         if 'Stage({categoryId:' in key and '$rankings' in key:
-            match = re.search(r'categoryId:(\d+)', key)
-            if match:
-                category_id = match.group(1)
+            category_id = hrefs.category_id(key)
+            if category_id:
                 rankings = value.get('entity', [])
                 if rankings:
                     stages_with_rankings[category_id] = rankings
@@ -53,9 +53,8 @@ def parse_tournament_with_scores(rankings_file, finals_file):
         if 'Stage({categoryId:' in key and '$rankings' not in key and 'entity' in value:
             entity = value['entity']
             if '__typename' in entity and entity['__typename'] == 'Stage':
-                match = re.search(r'categoryId:(\d+)', key)
-                if match:
-                    category_id = match.group(1)
+                category_id = hrefs.category_id(key)
+                if category_id:
                     stage_name = entity.get('name', '')
                     
                     if 'Cup' in stage_name:
@@ -152,8 +151,7 @@ def parse_tournament_with_scores(rankings_file, finals_file):
             team_href = entity.get('team', {}).get('href', '')
             
             # Extract actual team ID from href
-            team_id_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-            actual_team_id = team_id_match.group(1) if team_id_match else team_id
+            actual_team_id = hrefs.team_id(team_href) or team_id
             
             # Find matches that reference this actor
             for match_id, match_info in matches_by_team.items():
@@ -229,9 +227,8 @@ def parse_tournament_with_scores(rankings_file, finals_file):
                 rank = ranking.get('rank')
                 team_href = ranking.get('team', {}).get('href', '')
                 
-                team_match = re.search(r'Team\(\{id:(\d+)\}\)', team_href)
-                if team_match:
-                    team_id = team_match.group(1)
+                team_id = hrefs.team_id(team_href)
+                if team_id:
                     team_info = teams.get(team_id, {
                         'teamName': f'Team {team_id}',
                         'clubName': 'Unknown Club'
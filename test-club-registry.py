@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+
+from cupmanager.clubs import ClubRegistry
+from cupmanager.parsers import parse_combined_results
+from cupmanager.queries import combined_call, fetch_call, fetch_combined
+from cupmanager.standin import StandInAPI, StandInServer, collect_payloads
+
+# Crawl the captured tournaments through the local stand-in, which answers
+# each call with only what its selection reaches, once with the default
+# (minimal) combined query the fetch scripts send and once with the full
+# one. The club registry must come out the same: every club resolved by
+# its NameClub id, not by name alone.
+
+
+def crawl(base_url, tournament_ids, directory, minimal):
+    """Club registry and the result rows' `team` (with its clubId) from one query over every tournament."""
+    clubs = ClubRegistry(os.path.join(directory, f"club-registry-{'minimal' if minimal else 'full'}.json"))
+    teams = []
+    for tournament_id in tournament_ids:
+        if minimal:
+            payload = fetch_combined(base_url, tournament_id)
+        else:
+            payload = fetch_call(base_url, tournament_id, combined_call(tournament_id, minimal=False))
+        if payload is None:
+            print(f"✗ {tournament_id}: no response from the stand-in")
+            sys.exit(1)
+        tournament_data, _ = parse_combined_results(payload, f"Tournament {tournament_id}", tournament_id, clubs)
+        teams.extend((tournament_id, row['categoryId'], row['rank'], row['team']) for row in tournament_data['results'])
+    return clubs, teams
+
+
+print("\n" + "="*80)
+print("CLUB REGISTRY WITH THE DEFAULT QUERY")
+print("="*80 + "\n")
+
+payloads = collect_payloads()
+api = StandInAPI(payloads, spread_hosts=False)
+failures = []
+
+with StandInServer(api) as server, tempfile.TemporaryDirectory() as directory:
+    minimal_clubs, minimal_teams = crawl(server.base_url, api.tournament_ids, directory, minimal=True)
+    full_clubs, full_teams = crawl(server.base_url, api.tournament_ids, directory, minimal=False)
+
+name_club_ids = sum(len(club['nameClubIds']) for club in minimal_clubs.clubs.values())
+print(f"Tournaments: {len(api.tournament_ids)}")
+print(f"Default query: {len(minimal_clubs.clubs)} clubs from {name_club_ids} NameClub ids")
+print(f"Full query:    {len(full_clubs.clubs)} clubs\n")
+
+by_name_only = sorted(club_id for club_id, club in minimal_clubs.clubs.items() if not club['nameClubIds'])
+if by_name_only:
+    failures.append(f"{len(by_name_only)} clubs resolved by name only, e.g. {', '.join(by_name_only[:5])}")
+if minimal_clubs.clubs != full_clubs.clubs:
+    failures.append("registry differs from the one built with the full query")
+if minimal_teams != full_teams:
+    failures.append("result rows get other teams or clubs than with the full query")
+
+print("="*80)
+if failures:
+    for failure in failures:
+        print(f"✗ {failure}")
+    sys.exit(1)
+print("✓ Every club resolved by NameClub id, same as with the full query")
@@ -1,6 +1,7 @@
-import requests
 import json
 
+from cupmanager import client
+
 # Test the exact URLs provided by the user
 test_urls = [
     "https://sheppartoncup.com/rest/results_api/call?call=Tournament({id:61805002}){finals:[],lotCategories:[{stages:[{rankings:[{...%20on%20Stage$StageRankingPlace_ConferencePlace:{conference:{matches:[{}]}},...%20on%20Stage$StageRankingPlace_MatchStatus:{match:{arena:{},away:{team:{club:{nation:{}}}},home:{team:{club:{nation:{}}}},roundName:{}}},team:{club:{nation:{}}}}]}]}]}&lang=en&tournamentId=61805002",
@@ -10,7 +11,7 @@ test_urls = [
 for url in test_urls:
     print(f"\nTesting: {url[:80]}...")
     try:
-        response = requests.get(url, timeout=30)
+        response = client.get(url, timeout=30)
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
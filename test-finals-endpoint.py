@@ -2,6 +2,8 @@ import requests
 import json
 import re
 
+from cupmanager import client
+
 # Test the finals endpoint suggested by user
 TOURNAMENT_ID = "61805002"  # Shepparton Cup
 API_URL = f"https://wucup.com.au/rest/results_api/call?call=Tournament({{id:{TOURNAMENT_ID}}}){{finals:[{{...%20on%20Match:{{arena:{{}},away:{{team:{{club:{{nation:{{}}}}}}}},division:{{category:{{}},stage:{{}}}},home:{{team:{{club:{{nation:{{}}}}}}}},protests:[{{}}],result:{{}},roundName:{{}},stage:{{}},video:{{}}}}}}]}}&lang=en&tournamentId={TOURNAMENT_ID}"
@@ -13,7 +15,7 @@ print(f"\nTournament ID: {TOURNAMENT_ID}")
 print(f"\nFetching from: {API_URL[:100]}...")
 
 try:
-    response = requests.get(API_URL, timeout=10)
+    response = client.get(API_URL, timeout=10)
     response.raise_for_status()
     data = response.json()
     
@@ -1,7 +1,8 @@
-import requests
 import json
 import re
 
+from cupmanager import client
+
 # Test fetching match result data to see if we can get scores
 TOURNAMENT_ID = "61805002"  # Shepparton Cup
 API_URL = f"https://api.profixio.com/api/v1/query?cupId=13913907&query=Tournament(%7Bid%3A{TOURNAMENT_ID}%7D)%24results"
@@ -9,7 +10,7 @@ API_URL = f"https://api.profixio.com/api/v1/query?cupId=13913907&query=Tournamen
 def fetch_api_data(url):
     """Fetch data from the API"""
     try:
-        response = requests.get(url)
+        response = client.get(url)
         response.raise_for_status()
         return response.json()
     except Exception as e: